@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Benchmark and profiling harness for model_usage hot paths.
+
+Suites:
+    functions  time load_payload, parse_daily_entries, filter_by_days,
+               aggregate_costs, pick_current_model, latest_day_cost and
+               end-to-end main() on a synthetic payload, with tracemalloc
+               peak memory per step.
+    load       full json.loads vs incremental streaming; each path runs in a
+               fresh interpreter so peak RSS reflects only that path.
+    store      dict-row queries vs the columnar UsageStore.
+
+Usage:
+    python bench_model_usage.py [--suite functions|load|store|all]
+                                [--days N] [--models N] [--providers N]
+                                [--json] [--profile out.prof]
+                                [--compare baseline.json --max-regression 1.25]
+
+Save a baseline with `--json > baseline.json`; a later run with
+`--compare baseline.json` exits 1 when any step is slower than the allowed
+ratio.
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+import model_usage  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+PROVIDERS = ["codex", "claude"]
+
+
+def provider_names(count: int) -> List[str]:
+    """Synthetic filler providers first, then real ones, so the last name is always real."""
+    real = PROVIDERS[:count]
+    return [f"provider-{i}" for i in range(count - len(real))] + real
+
+
+def synthetic_daily(
+    provider: str, days: int, models: int, seed: int = 0
+) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(f"{seed}:{provider}")
+    start = date.today() - timedelta(days=days - 1)
+    for offset in range(days):
+        breakdowns = [
+            {"modelName": f"{provider}-model-{m}", "cost": round(rng.uniform(0, 5), 4)}
+            for m in range(models)
+        ]
+        yield {
+            "date": (start + timedelta(days=offset)).isoformat(),
+            "totalTokens": rng.randint(1_000, 1_000_000),
+            "totalCost": sum(item["cost"] for item in breakdowns),
+            "modelsUsed": [item["modelName"] for item in breakdowns],
+            "modelBreakdowns": breakdowns,
+        }
+
+
+def write_synthetic_payload(handle: IO[str], days: int, models: int, providers: int) -> None:
+    """Write a codexbar-shaped payload row by row so the writer stays small in memory."""
+    handle.write("[")
+    for index, provider in enumerate(provider_names(providers)):
+        if index:
+            handle.write(",")
+        handle.write(f'{{"provider": {json.dumps(provider)}, "daily": [')
+        for offset, row in enumerate(synthetic_daily(provider, days, models)):
+            if offset:
+                handle.write(",")
+            handle.write(json.dumps(row))
+        handle.write("]}")
+    handle.write("]")
+
+
+def peak_rss_mib() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def traced_peak_kib(func: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def step(suite: str, name: str, func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    return {
+        "suite": suite,
+        "name": name,
+        "seconds": best_of(repeat, func),
+        "peakKiB": traced_peak_kib(func),
+    }
+
+
+def run_main_quietly(argv: List[str]) -> int:
+    with redirect_stdout(io.StringIO()):
+        return model_usage.main(argv)
+
+
+def main_argv(input_path: str, provider: str, mode: str, window: int) -> List[str]:
+    return [
+        "--input",
+        input_path,
+        "--provider",
+        provider,
+        "--mode",
+        mode,
+        "--days",
+        str(window),
+        "--format",
+        "json",
+        "--no-cache",
+    ]
+
+
+def run_functions_suite(
+    input_path: str, provider: str, window: int, repeat: int
+) -> List[Dict[str, Any]]:
+    payload = model_usage.load_payload(input_path, provider)
+    entries = model_usage.parse_daily_entries(payload)
+    recent = model_usage.filter_by_days(entries, window)
+    model = f"{provider}-model-0"
+    steps: List[Any] = [
+        ("load_payload", lambda: model_usage.load_payload(input_path, provider)),
+        ("parse_daily_entries", lambda: model_usage.parse_daily_entries(payload)),
+        ("filter_by_days", lambda: model_usage.filter_by_days(entries, window)),
+        ("aggregate_costs", lambda: model_usage.aggregate_costs(entries)),
+        ("pick_current_model", lambda: model_usage.pick_current_model(entries)),
+        ("latest_day_cost", lambda: model_usage.latest_day_cost(entries, model)),
+        ("summarize_entries[window]", lambda: model_usage.summarize_entries(recent)),
+        (
+            "main[current]",
+            lambda: run_main_quietly(main_argv(input_path, provider, "current", window)),
+        ),
+        ("main[all]", lambda: run_main_quietly(main_argv(input_path, provider, "all", window))),
+    ]
+    return [step("functions", name, func, repeat) for name, func in steps]
+
+
+def dict_queries(entries: List[Dict[str, Any]], window: int, model: str) -> None:
+    for days in (None, window):
+        rows = model_usage.filter_by_days(entries, days)
+        model_usage.aggregate_costs(rows)
+        model_usage.pick_current_model(rows)
+        model_usage.latest_day_cost(rows, model)
+
+
+def store_queries(store: model_usage.UsageStore, window: int, model: str) -> None:
+    for days in (None, window):
+        view = store.filter_by_days(days)
+        view.aggregate_costs()
+        view.pick_current_model()
+        view.latest_day_cost(model)
+
+
+def run_store_suite(days: int, models: int, window: int, repeat: int) -> List[Dict[str, Any]]:
+    entries = list(synthetic_daily("codex", days, models))
+    model = "codex-model-0"
+    store = model_usage.UsageStore.from_entries(entries)
+    return [
+        step(
+            "store",
+            "UsageStore.from_entries",
+            lambda: model_usage.UsageStore.from_entries(entries),
+            repeat,
+        ),
+        step("store", "queries[dict rows]", lambda: dict_queries(entries, window, model), repeat),
+        step("store", "queries[store]", lambda: store_queries(store, window, model), repeat),
+    ]
+
+
+def measure(path_kind: str, input_path: str, provider: str, days: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    if path_kind == "stream":
+        with model_usage.open_payload_stream(input_path, provider) as handle:
+            rows = model_usage.iter_daily_entries(handle, provider)
+            totals = model_usage.aggregate_costs(model_usage.iter_filter_by_days(rows, days))
+    else:
+        payload = model_usage.load_payload(input_path, provider)
+        entries = model_usage.filter_by_days(model_usage.parse_daily_entries(payload), days)
+        totals = model_usage.aggregate_costs(entries)
+    return {
+        "suite": "load",
+        "name": path_kind,
+        "seconds": time.perf_counter() - started,
+        "peakRssMiB": peak_rss_mib(),
+        "models": len(totals),
+    }
+
+
+def run_child(path_kind: str, input_path: str, provider: str, days: int) -> Dict[str, Any]:
+    cmd = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--measure",
+        path_kind,
+        "--input",
+        input_path,
+        "--provider",
+        provider,
+        "--window",
+        str(days),
+    ]
+    return json.loads(subprocess.check_output(cmd, text=True))
+
+
+def run_load_suite(input_path: str, provider: str, window: int) -> List[Dict[str, Any]]:
+    return [run_child(path_kind, input_path, provider, window) for path_kind in ("load", "stream")]
+
+
+def profile_main(input_path: str, provider: str, window: int, output: str) -> str:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    run_main_quietly(main_argv(input_path, provider, "current", window))
+    profiler.disable()
+    profiler.dump_stats(output)
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(15)
+    return report.getvalue()
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], max_ratio: float
+) -> List[str]:
+    """Return one message per step that got slower than `max_ratio` times its baseline."""
+    previous = {(item["suite"], item["name"]): item["seconds"] for item in baseline}
+    regressions = []
+    for item in results:
+        before = previous.get((item["suite"], item["name"]))
+        if before and item["seconds"] > before * max_ratio:
+            regressions.append(
+                f"{item['suite']}/{item['name']}: {item['seconds']:.4f}s vs {before:.4f}s baseline"
+            )
+    return regressions
+
+
+def render_results(results: List[Dict[str, Any]]) -> str:
+    lines = [f"{'suite':<10} {'step':<28} {'seconds':>10} {'memory':>16}"]
+    for item in results:
+        if "peakKiB" in item:
+            memory = f"{item['peakKiB']:.0f} KiB heap"
+        elif item["peakRssMiB"] is None:
+            memory = "n/a"
+        else:
+            memory = f"{item['peakRssMiB']:.1f} MiB RSS"
+        lines.append(
+            f"{item['suite']:<10} {item['name']:<28} {item['seconds']:>10.4f} {memory:>16}"
+        )
+    return "\n".join(lines)
+
+
+def run_benchmarks(
+    suite: str,
+    days: int,
+    models: int,
+    providers: int,
+    window: int,
+    repeat: int,
+    profile: Optional[str] = None,
+) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    profile_report = None
+    with tempfile.TemporaryDirectory(prefix="model_usage_bench_") as tmp:
+        input_path = str(Path(tmp) / "cost.json")
+        with open(input_path, "w", encoding="utf-8") as handle:
+            write_synthetic_payload(handle, days, models, providers)
+        # Measure the last provider so streaming cannot stop early; it is always
+        # a real provider name, which main() and --provider accept.
+        provider = provider_names(providers)[-1]
+        # Children inherit the parent's peak RSS on Linux, so spawn them while it is small.
+        if suite in ("load", "all"):
+            results.extend(run_load_suite(input_path, provider, window))
+        if suite in ("functions", "all"):
+            results.extend(run_functions_suite(input_path, provider, window, repeat))
+        if profile:
+            profile_report = profile_main(input_path, provider, window, profile)
+    if suite in ("store", "all"):
+        results.extend(run_store_suite(days, models, window, repeat))
+    return {
+        "config": {
+            "days": days,
+            "models": models,
+            "providers": providers,
+            "window": window,
+            "repeat": repeat,
+            "backend": "numpy" if model_usage.np is not None else "array",
+        },
+        "results": results,
+        "profile": profile_report,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark model_usage hot paths.")
+    parser.add_argument("--suite", choices=["functions", "load", "store", "all"], default="all")
+    parser.add_argument("--days", type=model_usage.positive_int, default=3650)
+    parser.add_argument("--models", type=model_usage.positive_int, default=50)
+    parser.add_argument("--providers", type=model_usage.positive_int, default=2)
+    parser.add_argument("--window", type=model_usage.positive_int, default=30)
+    parser.add_argument("--repeat", type=model_usage.positive_int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    parser.add_argument("--profile", help="Write cProfile stats of end-to-end main() to this file.")
+    parser.add_argument("--compare", help="Baseline JSON from a previous --json run.")
+    parser.add_argument(
+        "--max-regression",
+        type=model_usage.positive_float,
+        default=1.25,
+        help="Allowed slowdown ratio against --compare (default: 1.25).",
+    )
+    parser.add_argument("--measure", choices=["load", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    parser.add_argument("--provider", default="codex", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.input, args.provider, args.window)))
+        return 0
+
+    report = run_benchmarks(
+        args.suite, args.days, args.models, args.providers, args.window, args.repeat, args.profile
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        config = report["config"]
+        print(
+            f"Payload: {config['days']} days x {config['models']} models x "
+            f"{config['providers']} providers ({config['backend']} store backend)\n"
+        )
+        print(render_results(report["results"]))
+        if report["profile"]:
+            print(f"\nProfile of main() written to {args.profile}\n")
+            print(report["profile"])
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(report["results"], baseline["results"], args.max_regression)
+        for message in regressions:
+            model_usage.eprint(f"[REGRESSION] {message}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,13 +8,37 @@ Defaults to current model (most recent daily entry), or list all models.
 from __future__ import annotations
 
 import argparse
+import copy
+import hashlib
 import json
+import math
 import os
+import re
+import sqlite3
 import subprocess
 import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+PROVIDERS = ("codex", "claude")
+STREAM_CHUNK_SIZE = 64 * 1024
+CACHE_VERSION = 1
+DEFAULT_CACHE_TTL = 300
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
 
 def positive_int(value: str) -> int:
@@ -27,12 +51,33 @@ def positive_int(value: str) -> int:
     return parsed
 
 
+def positive_float(value: str) -> float:
+    try:
+        parsed = float(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("must be a number") from exc
+    if not parsed > 0:
+        raise argparse.ArgumentTypeError("must be > 0")
+    return parsed
+
+
+def iso_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("must be a YYYY-MM-DD date") from exc
+
+
 def eprint(msg: str) -> None:
     print(msg, file=sys.stderr)
 
 
+def codexbar_cost_command(provider: str) -> List[str]:
+    return ["codexbar", "cost", "--format", "json", "--provider", provider]
+
+
 def run_codexbar_cost(provider: str) -> List[Dict[str, Any]]:
-    cmd = ["codexbar", "cost", "--format", "json", "--provider", provider]
+    cmd = codexbar_cost_command(provider)
     try:
         output = subprocess.check_output(cmd, text=True)
     except FileNotFoundError:
@@ -48,33 +93,351 @@ def run_codexbar_cost(provider: str) -> List[Dict[str, Any]]:
     return payload
 
 
-def load_payload(input_path: Optional[str], provider: str) -> Dict[str, Any]:
+def default_cache_dir() -> Path:
+    override = os.environ.get("MODEL_USAGE_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "openclaw" / "model-usage"
+
+
+class CostCache:
+    """
+    On-disk cache of `codexbar cost` payloads, one file per provider.
+
+    Each file is a one-line JSON header (version, provider, fetch time, body
+    size) followed by the payload. Entries older than `ttl` seconds, or whose
+    size on disk does not match the header, are treated as misses. Writes go
+    through a temp file and `os.replace`; hits refresh the file mtime, which
+    drives least-recently-used eviction once the directory exceeds `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl: int = DEFAULT_CACHE_TTL,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+
+    def _path(self, provider: str) -> Path:
+        return self.directory / f"cost-{provider}.json"
+
+    def get(self, provider: str) -> Optional[Any]:
+        path = self._path(provider)
+        try:
+            file_size = path.stat().st_size
+            with open(path, "rb") as handle:
+                header_line = handle.readline()
+                header = json.loads(header_line)
+                if not isinstance(header, dict) or header.get("version") != CACHE_VERSION:
+                    return None
+                if header.get("provider") != provider:
+                    return None
+                if file_size != len(header_line) + header.get("size", -1):
+                    return None
+                age = self._clock() - float(header.get("fetchedAt", 0))
+                if age < 0 or age > self.ttl:
+                    return None
+                payload = json.loads(handle.read())
+        except (OSError, ValueError, TypeError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return payload
+
+    def put(self, provider: str, payload: Any) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        header = {
+            "version": CACHE_VERSION,
+            "provider": provider,
+            "fetchedAt": self._clock(),
+            "size": len(body),
+        }
+        tmp_path: Optional[str] = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".cost-", suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(json.dumps(header).encode("utf-8") + b"\n")
+                handle.write(body)
+            os.replace(tmp_path, self._path(provider))
+            tmp_path = None
+        except OSError as exc:
+            eprint(f"[WARN] Could not write model usage cache: {exc}")
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("cost-*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(reverse=True)
+        total = 0
+        for _, size, path in entries:
+            total += size
+            if total > self.max_bytes:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+def fetch_codexbar_cost(
+    provider: str, cache: Optional[CostCache] = None, refresh: bool = False
+) -> List[Dict[str, Any]]:
+    if cache is not None and not refresh:
+        cached = cache.get(provider)
+        if isinstance(cached, list):
+            return cached
+    data = run_codexbar_cost(provider)
+    if cache is not None:
+        cache.put(provider, data)
+    return data
+
+
+def read_input(input_path: str) -> Any:
+    if input_path == "-":
+        raw = sys.stdin.read()
+    else:
+        with open(input_path, "r", encoding="utf-8") as handle:
+            raw = handle.read()
+    return json.loads(raw)
+
+
+class ProviderNotFound(RuntimeError):
+    """The payload holds no data for the requested provider."""
+
+
+def load_payload(
+    input_path: Optional[str],
+    provider: str,
+    cache: Optional[CostCache] = None,
+    refresh: bool = False,
+    strict: bool = False,
+) -> Dict[str, Any]:
     if input_path:
-        if input_path == "-":
-            raw = sys.stdin.read()
-        else:
-            with open(input_path, "r", encoding="utf-8") as handle:
-                raw = handle.read()
-        data = json.loads(raw)
+        data = read_input(input_path)
     else:
-        data = run_codexbar_cost(provider)
+        data = fetch_codexbar_cost(provider, cache, refresh)
+    return select_provider(data, provider, strict)
 
+
+def select_provider(data: Any, provider: str, strict: bool = False) -> Dict[str, Any]:
+    """
+    Pick `provider`'s payload. A single-provider object is used as-is unless
+    `strict`, in which case its "provider" field must name `provider`.
+    """
     if isinstance(data, dict):
+        if strict and data.get("provider") != provider:
+            raise ProviderNotFound(f"Provider '{provider}' not found in codexbar payload.")
         return data
 
     if isinstance(data, list):
         for entry in data:
             if isinstance(entry, dict) and entry.get("provider") == provider:
                 return entry
-        raise RuntimeError(f"Provider '{provider}' not found in codexbar payload.")
+        raise ProviderNotFound(f"Provider '{provider}' not found in codexbar payload.")
 
     raise RuntimeError("Unsupported JSON input format.")
 
 
-@dataclass
-class ModelCost:
-    model: str
-    cost: float
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class _JsonStreamReader:
+    """Incremental JSON reader that decodes one value at a time from a text stream."""
+
+    def __init__(self, handle: IO[str], chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ("" at EOF)."""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in JSON stream, found {found or 'EOF'!r}.")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number may continue in the next chunk: raw_decode stops before a
+            # trailing "." or "e" it cannot complete yet, so read on while only
+            # number characters follow it.
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and all(char in _NUMBER_CHARS for char in self._buffer[end:])
+                and self._fill()
+            ):
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self) -> Iterator[None]:
+        """Yield once per array element; the caller consumes each element."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            found = self.peek()
+            self._pos += 1
+            if found == "]":
+                return
+            if found != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {found or 'EOF'!r}.")
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield each key of an object; the caller consumes the matching value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Expected string key in JSON object.")
+            self.expect(":")
+            yield key
+            found = self.peek()
+            self._pos += 1
+            if found == "}":
+                return
+            if found != ",":
+                raise ValueError(f"Expected ',' or '}}' in JSON object, found {found or 'EOF'!r}.")
+
+
+def _iter_provider_daily(
+    reader: _JsonStreamReader, provider: Optional[str]
+) -> Generator[Dict[str, Any], None, bool]:
+    """Yield the daily rows of one provider object; returns whether the provider matched."""
+    matched = provider is None
+    provider_seen = provider is None
+    pending: Optional[List[Dict[str, Any]]] = None
+    for key in reader.iter_object():
+        if key == "provider" and not provider_seen:
+            matched = reader.value() == provider
+            provider_seen = True
+            if matched and pending:
+                yield from pending
+            pending = None
+        elif key == "daily" and reader.peek() == "[":
+            # Rows that arrive before the "provider" key are held until it is known.
+            rows: List[Dict[str, Any]] = []
+            for _ in reader.iter_array():
+                item = reader.value()
+                if not isinstance(item, dict):
+                    continue
+                if not provider_seen:
+                    rows.append(item)
+                elif matched:
+                    yield item
+            if not provider_seen:
+                pending = rows
+        else:
+            reader.value()
+    return matched
+
+
+def iter_daily_entries(
+    handle: IO[str], provider: str, chunk_size: int = STREAM_CHUNK_SIZE, strict: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream daily rows for `provider` without materializing the whole payload.
+    `strict` applies to a single-provider object as in select_provider.
+    """
+    reader = _JsonStreamReader(handle, chunk_size)
+    first = reader.peek()
+    if first == "{":
+        if not (yield from _iter_provider_daily(reader, provider if strict else None)):
+            raise ProviderNotFound(f"Provider '{provider}' not found in codexbar payload.")
+        return
+    if first != "[":
+        raise RuntimeError("Unsupported JSON input format.")
+    for _ in reader.iter_array():
+        if reader.peek() != "{":
+            reader.value()
+            continue
+        if (yield from _iter_provider_daily(reader, provider)):
+            return
+    raise ProviderNotFound(f"Provider '{provider}' not found in codexbar payload.")
+
+
+@contextmanager
+def open_payload_stream(input_path: Optional[str], provider: str) -> Iterator[IO[str]]:
+    if input_path == "-":
+        yield sys.stdin
+        return
+    if input_path:
+        with open(input_path, "r", encoding="utf-8") as handle:
+            yield handle
+        return
+    try:
+        proc = subprocess.Popen(codexbar_cost_command(provider), stdout=subprocess.PIPE, text=True)
+    except FileNotFoundError:
+        raise RuntimeError("codexbar not found on PATH. Install CodexBar CLI first.")
+    with proc:
+        assert proc.stdout is not None
+        yield proc.stdout
+        # Drain whatever the reader left behind so codexbar can exit cleanly.
+        while proc.stdout.read(STREAM_CHUNK_SIZE):
+            pass
+    if proc.returncode:
+        raise RuntimeError(f"codexbar cost failed (exit {proc.returncode}).")
 
 
 def parse_daily_entries(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -86,26 +449,55 @@ def parse_daily_entries(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     return [entry for entry in daily if isinstance(entry, dict)]
 
 
+ISO_DAY = re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)
+
+
+@lru_cache(maxsize=16384)
 def parse_date(value: str) -> Optional[date]:
+    if ISO_DAY.fullmatch(value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
     try:
         return datetime.strptime(value, "%Y-%m-%d").date()
     except Exception:
         return None
 
 
-def filter_by_days(entries: List[Dict[str, Any]], days: Optional[int]) -> List[Dict[str, Any]]:
+def iter_filter_by_days(
+    entries: Iterable[Dict[str, Any]], days: Optional[int]
+) -> Iterator[Dict[str, Any]]:
     if not days:
-        return entries
-    cutoff = date.today() - timedelta(days=days - 1)
-    filtered: List[Dict[str, Any]] = []
+        yield from entries
+        return
+    yield from iter_filter_by_range(entries, date.today() - timedelta(days=days - 1), None)
+
+
+def iter_filter_by_range(
+    entries: Iterable[Dict[str, Any]], start: Optional[date], end: Optional[date]
+) -> Iterator[Dict[str, Any]]:
+    # Zero-padded ISO days order like the dates they name, so rows outside the
+    # window are rejected with a string compare; only kept rows are parsed.
+    low = start.isoformat() if start else ""
+    high = end.isoformat() if end else "9999-99-99"
     for entry in entries:
         day = entry.get("date")
         if not isinstance(day, str):
             continue
+        if ISO_DAY.fullmatch(day):
+            if low <= day <= high and parse_date(day) is not None:
+                yield entry
+            continue
         parsed = parse_date(day)
-        if parsed and parsed >= cutoff:
-            filtered.append(entry)
-    return filtered
+        if parsed and (start is None or parsed >= start) and (end is None or parsed <= end):
+            yield entry
+
+
+def filter_by_days(entries: List[Dict[str, Any]], days: Optional[int]) -> List[Dict[str, Any]]:
+    if not days:
+        return entries
+    return list(iter_filter_by_days(entries, days))
 
 
 def aggregate_costs(entries: Iterable[Dict[str, Any]]) -> Dict[str, float]:
@@ -129,60 +521,556 @@ def aggregate_costs(entries: Iterable[Dict[str, Any]]) -> Dict[str, float]:
     return totals
 
 
-def pick_current_model(entries: List[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
-    if not entries:
-        return None, None
-    sorted_entries = sorted(
-        entries,
-        key=lambda entry: entry.get("date") or "",
-    )
-    for entry in reversed(sorted_entries):
+@dataclass
+class UsageSummary:
+    totals: Dict[str, float]
+    current_model: Optional[str]
+    current_date: Optional[str]
+    latest_costs: Dict[str, Tuple[Optional[str], Optional[float]]]
+    row_count: int
+
+    def latest_day_cost(self, model: str) -> Tuple[Optional[str], Optional[float]]:
+        return self.latest_costs.get(model, (None, None))
+
+
+class UsageAccumulator:
+    """
+    Single-pass fold over daily rows.
+
+    Tracks per-model totals, the current model and each model's latest-day cost
+    by keeping the max date seen so far, so no sort is needed. Rows sharing a
+    date resolve to the later one, matching a stable sort by date.
+    """
+
+    def __init__(self) -> None:
+        self.totals: Dict[str, float] = {}
+        self.row_count = 0
+        self._current: Optional[Tuple[str, str, Optional[str]]] = None
+        self._latest: Dict[str, Tuple[str, Optional[str], Optional[float]]] = {}
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        self.row_count += 1
+        day = entry.get("date") if isinstance(entry.get("date"), str) else None
+        key = day or ""
+        candidate: Optional[str] = None
         breakdowns = entry.get("modelBreakdowns")
-        if isinstance(breakdowns, list) and breakdowns:
-            scored: List[ModelCost] = []
+        if isinstance(breakdowns, list):
+            best_cost = 0.0
+            seen: set = set()
             for item in breakdowns:
                 if not isinstance(item, dict):
                     continue
                 model = item.get("modelName")
+                if not isinstance(model, str):
+                    continue
                 cost = item.get("cost")
-                if isinstance(model, str) and isinstance(cost, (int, float)):
-                    scored.append(ModelCost(model=model, cost=float(cost)))
-            if scored:
-                scored.sort(key=lambda item: item.cost, reverse=True)
-                return scored[0].model, entry.get("date") if isinstance(entry.get("date"), str) else None
-        models_used = entry.get("modelsUsed")
-        if isinstance(models_used, list) and models_used:
-            last = models_used[-1]
-            if isinstance(last, str):
-                return last, entry.get("date") if isinstance(entry.get("date"), str) else None
-    return None, None
+                value = float(cost) if isinstance(cost, (int, float)) else None
+                if value is not None:
+                    self.totals[model] = self.totals.get(model, 0.0) + value
+                    if candidate is None or value > best_cost:
+                        candidate, best_cost = model, value
+                if model not in seen:
+                    seen.add(model)
+                    previous = self._latest.get(model)
+                    if previous is None or key >= previous[0]:
+                        self._latest[model] = (key, day, value)
+        if candidate is None:
+            models_used = entry.get("modelsUsed")
+            if isinstance(models_used, list) and models_used and isinstance(models_used[-1], str):
+                candidate = models_used[-1]
+        if candidate is not None and (self._current is None or key >= self._current[0]):
+            self._current = (key, candidate, day)
 
+    def update(self, entries: Iterable[Dict[str, Any]]) -> "UsageAccumulator":
+        for entry in entries:
+            self.add(entry)
+        return self
 
-def usd(value: Optional[float]) -> str:
-    if value is None:
-        return "—"
-    return f"${value:,.2f}"
+    def summary(self) -> UsageSummary:
+        current_model, current_date = (None, None)
+        if self._current is not None:
+            current_model, current_date = self._current[1], self._current[2]
+        return UsageSummary(
+            totals=dict(self.totals),
+            current_model=current_model,
+            current_date=current_date,
+            latest_costs={model: (day, cost) for model, (_, day, cost) in self._latest.items()},
+            row_count=self.row_count,
+        )
+
+
+def summarize_entries(entries: Iterable[Dict[str, Any]]) -> UsageSummary:
+    return UsageAccumulator().update(entries).summary()
+
+
+class LiveUsage:
+    """
+    Per-day view of a provider's rows that can be diffed against a new payload.
+
+    `update` compares each day's rows with the previous payload and re-folds
+    only days that changed, adjusting running totals in place. The current
+    model and latest-day costs are read back from the newest days on demand.
+    """
+
+    def __init__(self) -> None:
+        self._rows: Dict[str, List[Dict[str, Any]]] = {}
+        self._days: Dict[str, UsageSummary] = {}
+        self._order: List[str] = []
+        self._totals: Dict[str, float] = {}
+        self._contributors: Dict[str, int] = {}
+        self._row_count = 0
+
+    def update(self, entries: Iterable[Dict[str, Any]]) -> List[str]:
+        """Apply a full snapshot of rows; returns the days that changed."""
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            day = entry.get("date")
+            grouped.setdefault(day if isinstance(day, str) else "", []).append(entry)
+        changed = [day for day in self._rows if day not in grouped]
+        changed.extend(day for day, rows in grouped.items() if self._rows.get(day) != rows)
+        for day in changed:
+            self._remove(day)
+            if day in grouped:
+                self._add(day, grouped[day])
+        return changed
+
+    def _add(self, day: str, rows: List[Dict[str, Any]]) -> None:
+        summary = summarize_entries(rows)
+        self._rows[day] = rows
+        self._days[day] = summary
+        insort(self._order, day)
+        self._row_count += summary.row_count
+        for model, cost in summary.totals.items():
+            self._totals[model] = self._totals.get(model, 0.0) + cost
+            self._contributors[model] = self._contributors.get(model, 0) + 1
+
+    def _remove(self, day: str) -> None:
+        summary = self._days.pop(day, None)
+        if summary is None:
+            return
+        del self._rows[day]
+        self._order.pop(bisect_left(self._order, day))
+        self._row_count -= summary.row_count
+        for model, cost in summary.totals.items():
+            self._contributors[model] -= 1
+            if self._contributors[model]:
+                self._totals[model] -= cost
+            else:
+                del self._contributors[model]
+                del self._totals[model]
+
+    def summary(self) -> UsageSummary:
+        current_model, current_date = None, None
+        latest: Dict[str, Tuple[Optional[str], Optional[float]]] = {}
+        for day in reversed(self._order):
+            summary = self._days[day]
+            if current_model is None and summary.current_model is not None:
+                current_model, current_date = summary.current_model, summary.current_date
+            for model, value in summary.latest_costs.items():
+                latest.setdefault(model, value)
+        return UsageSummary(
+            totals=dict(self._totals),
+            current_model=current_model,
+            current_date=current_date,
+            latest_costs=latest,
+            row_count=self._row_count,
+        )
+
+
+def _day_ordinal(value: Any) -> int:
+    parsed = parse_date(value) if isinstance(value, str) else None
+    return parsed.toordinal() if parsed else 0
+
+
+class UsageStore:
+    """
+    Compact, columnar form of the daily rows for repeated queries.
+
+    Rows are sorted by day once at build time. Row columns hold the day ordinal
+    (0 when the date is missing or invalid), the interned id of the row's current
+    model (-1 if none) and the offset of the row's first breakdown item; item
+    columns hold the model id and cost (NaN when the cost is not a number). A
+    store is a window over shared columns, so date filtering is a bisect and
+    group-by-model sums touch only the items inside the window.
+    """
+
+    def __init__(self) -> None:
+        self.models: List[str] = []
+        self._model_ids: Dict[str, int] = {}
+        self.row_days = array("i")
+        self.row_current = array("i")
+        self.row_items = array("q", [0])
+        self.item_models = array("i")
+        self.item_costs = array("d")
+        self._lo = 0
+        self._hi = 0
 
+    @classmethod
+    def from_entries(cls, entries: Iterable[Dict[str, Any]]) -> "UsageStore":
+        store = cls()
+        rows: List[Tuple[int, int, List[Tuple[int, float]]]] = []
+        for entry in entries:
+            items: List[Tuple[int, float]] = []
+            current = -1
+            best_cost = 0.0
+            breakdowns = entry.get("modelBreakdowns")
+            if isinstance(breakdowns, list):
+                for item in breakdowns:
+                    if not isinstance(item, dict) or not isinstance(item.get("modelName"), str):
+                        continue
+                    model_id = store._intern(item["modelName"])
+                    cost = item.get("cost")
+                    value = float(cost) if isinstance(cost, (int, float)) else math.nan
+                    items.append((model_id, value))
+                    if value == value and (current < 0 or value > best_cost):
+                        current, best_cost = model_id, value
+            if current < 0:
+                models_used = entry.get("modelsUsed")
+                if (
+                    isinstance(models_used, list)
+                    and models_used
+                    and isinstance(models_used[-1], str)
+                ):
+                    current = store._intern(models_used[-1])
+            rows.append((_day_ordinal(entry.get("date")), current, items))
 
-def latest_day_cost(entries: List[Dict[str, Any]], model: str) -> Tuple[Optional[str], Optional[float]]:
-    if not entries:
+        rows.sort(key=lambda row: row[0])
+        for day, current, items in rows:
+            store.row_days.append(day)
+            store.row_current.append(current)
+            for model_id, value in items:
+                store.item_models.append(model_id)
+                store.item_costs.append(value)
+            store.row_items.append(len(store.item_models))
+        store._hi = len(store.row_days)
+        return store
+
+    def _intern(self, model: str) -> int:
+        model_id = self._model_ids.get(model)
+        if model_id is None:
+            model_id = self._model_ids[model] = len(self.models)
+            self.models.append(model)
+        return model_id
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    def window(self, start: Optional[date] = None, end: Optional[date] = None) -> "UsageStore":
+        """Return a view limited to rows dated within [start, end]."""
+        view = copy.copy(self)
+        if start is not None:
+            view._lo = bisect_left(self.row_days, start.toordinal(), self._lo, self._hi)
+        if end is not None:
+            view._hi = bisect_right(self.row_days, end.toordinal(), view._lo, self._hi)
+        return view
+
+    def filter_by_days(self, days: Optional[int]) -> "UsageStore":
+        if not days:
+            return self
+        return self.window(start=date.today() - timedelta(days=days - 1))
+
+    def aggregate_costs(self) -> Dict[str, float]:
+        start, stop = self.row_items[self._lo], self.row_items[self._hi]
+        if np is not None:
+            ids = np.frombuffer(self.item_models, dtype=np.intc)[start:stop]
+            costs = np.frombuffer(self.item_costs, dtype=np.float64)[start:stop]
+            valid = ~np.isnan(costs)
+            sums = np.bincount(ids[valid], weights=costs[valid], minlength=len(self.models))
+            counts = np.bincount(ids[valid], minlength=len(self.models))
+            return {self.models[i]: float(sums[i]) for i in np.flatnonzero(counts)}
+        sums: Dict[int, float] = {}
+        for model_id, value in zip(self.item_models[start:stop], self.item_costs[start:stop]):
+            if value == value:
+                sums[model_id] = sums.get(model_id, 0.0) + value
+        return {self.models[model_id]: total for model_id, total in sums.items()}
+
+    def _row_date(self, row: int) -> Optional[str]:
+        day = self.row_days[row]
+        return date.fromordinal(day).isoformat() if day else None
+
+    def _first_item(self, row: int, model_id: int) -> Optional[float]:
+        for index in range(self.row_items[row], self.row_items[row + 1]):
+            if self.item_models[index] == model_id:
+                value = self.item_costs[index]
+                return value if value == value else None
+        raise KeyError(model_id)
+
+    def latest_day_cost(self, model: str) -> Tuple[Optional[str], Optional[float]]:
+        model_id = self._model_ids.get(model)
+        if model_id is None:
+            return None, None
+        for row in range(self._hi - 1, self._lo - 1, -1):
+            try:
+                cost = self._first_item(row, model_id)
+            except KeyError:
+                continue
+            return self._row_date(row), cost
         return None, None
-    sorted_entries = sorted(
-        entries,
-        key=lambda entry: entry.get("date") or "",
-    )
-    for entry in reversed(sorted_entries):
-        breakdowns = entry.get("modelBreakdowns")
-        if not isinstance(breakdowns, list):
-            continue
-        for item in breakdowns:
-            if not isinstance(item, dict):
+
+    def pick_current_model(self) -> Tuple[Optional[str], Optional[str]]:
+        for row in range(self._hi - 1, self._lo - 1, -1):
+            current = self.row_current[row]
+            if current >= 0:
+                return self.models[current], self._row_date(row)
+        return None, None
+
+    def prefix_sums(self) -> "CostPrefixSums":
+        return CostPrefixSums(self)
+
+    def summary(self) -> UsageSummary:
+        latest: Dict[str, Tuple[Optional[str], Optional[float]]] = {}
+        for row in range(self._hi - 1, self._lo - 1, -1):
+            for index in range(self.row_items[row], self.row_items[row + 1]):
+                model = self.models[self.item_models[index]]
+                if model not in latest:
+                    value = self.item_costs[index]
+                    latest[model] = (self._row_date(row), value if value == value else None)
+        current_model, current_date = self.pick_current_model()
+        return UsageSummary(
+            totals=self.aggregate_costs(),
+            current_model=current_model,
+            current_date=current_date,
+            latest_costs=latest,
+            row_count=len(self),
+        )
+
+
+class CostPrefixSums:
+    """
+    Per-model running cost totals over the distinct dated days of a store.
+
+    Built in one O(days x models) pass; the total for any date window is then
+    two bisects plus one subtraction per model. Undated rows are left out.
+    """
+
+    def __init__(self, store: UsageStore) -> None:
+        self.models = list(store.models)
+        self.days = array("i")
+        self._sums = [array("d", [0.0]) for _ in self.models]
+        self._counts = [array("i", [0]) for _ in self.models]
+        running = [0.0] * len(self.models)
+        counts = [0] * len(self.models)
+        row = store._lo
+        while row < store._hi:
+            day = store.row_days[row]
+            start = store.row_items[row]
+            while row < store._hi and store.row_days[row] == day:
+                row += 1
+            if not day:
+                continue
+            for index in range(start, store.row_items[row]):
+                value = store.item_costs[index]
+                if value == value:
+                    model_id = store.item_models[index]
+                    running[model_id] += value
+                    counts[model_id] += 1
+            self.days.append(day)
+            for model_id in range(len(self.models)):
+                self._sums[model_id].append(running[model_id])
+                self._counts[model_id].append(counts[model_id])
+
+    @property
+    def first_day(self) -> Optional[date]:
+        return date.fromordinal(self.days[0]) if self.days else None
+
+    @property
+    def last_day(self) -> Optional[date]:
+        return date.fromordinal(self.days[-1]) if self.days else None
+
+    def totals(self, start: date, end: date) -> Dict[str, float]:
+        """Per-model cost totals for rows dated within [start, end]."""
+        lo = bisect_left(self.days, start.toordinal())
+        hi = bisect_right(self.days, end.toordinal())
+        totals: Dict[str, float] = {}
+        for model_id, model in enumerate(self.models):
+            if self._counts[model_id][hi] > self._counts[model_id][lo]:
+                totals[model] = self._sums[model_id][hi] - self._sums[model_id][lo]
+        return totals
+
+
+class UsageLedger:
+    """
+    Incremental SQLite ledger of per-day, per-model costs.
+
+    `sync` remembers the last ingested date per provider and only folds rows
+    dated on or after it (that day is re-ingested because codexbar keeps
+    updating today's row). Queries read pre-aggregated day totals, so they
+    cost O(days in window) instead of a full re-parse. Rows without a valid
+    date cannot be keyed and are skipped.
+
+    A ledger holds the history of one `source` (codexbar, or one input file);
+    opening it for another source raises instead of merging unrelated rows.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sync_state (
+            provider TEXT PRIMARY KEY,
+            last_day TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS day_rows (
+            provider TEXT NOT NULL,
+            day TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            current_model TEXT,
+            PRIMARY KEY (provider, day, seq)
+        );
+        CREATE TABLE IF NOT EXISTS day_costs (
+            provider TEXT NOT NULL,
+            day TEXT NOT NULL,
+            model TEXT NOT NULL,
+            cost REAL,
+            latest_cost REAL,
+            PRIMARY KEY (provider, day, model)
+        );
+        CREATE INDEX IF NOT EXISTS day_costs_by_model ON day_costs (provider, model, day);
+        CREATE TABLE IF NOT EXISTS ledger_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: Path, source: Optional[str] = None) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30)
+        self._conn.executescript(self.SCHEMA)
+        if source is not None:
+            try:
+                self._claim_source(path, source)
+            except Exception:
+                self._conn.close()
+                raise
+
+    def _claim_source(self, path: Path, source: str) -> None:
+        with self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO ledger_meta VALUES ('source', ?)", (source,))
+            (recorded,) = self._conn.execute(
+                "SELECT value FROM ledger_meta WHERE key = 'source'"
+            ).fetchone()
+        if recorded != source:
+            raise RuntimeError(
+                f"Ledger {path} holds usage from {recorded}, not {source}; "
+                "pass a different --ledger-path."
+            )
+
+    def __enter__(self) -> "UsageLedger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def last_day(self, provider: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT last_day FROM sync_state WHERE provider = ?", (provider,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def sync(self, provider: str, entries: Iterable[Dict[str, Any]]) -> int:
+        """Ingest rows newer than the last sync; returns the number of rows ingested."""
+        since = self.last_day(provider) or ""
+        day_rows: List[Tuple[str, str, int, Optional[str]]] = []
+        day_costs: Dict[Tuple[str, str], List[Optional[float]]] = {}
+        seqs: Dict[str, int] = {}
+        for entry in entries:
+            raw_day = entry.get("date")
+            if not isinstance(raw_day, str):
+                continue
+            parsed = parse_date(raw_day)
+            if parsed is None:
                 continue
-            if item.get("modelName") == model:
-                cost = item.get("cost") if isinstance(item.get("cost"), (int, float)) else None
-                day = entry.get("date") if isinstance(entry.get("date"), str) else None
-                return day, float(cost) if cost is not None else None
-    return None, None
+            # Compare the normalized day: "2024-9-30" sorts after "2024-10-01".
+            day = parsed.isoformat()
+            if day < since:
+                continue
+            accumulator = UsageAccumulator()
+            accumulator.add(entry)
+            row = accumulator.summary()
+            seq = seqs[day] = seqs.get(day, -1) + 1
+            day_rows.append((provider, day, seq, row.current_model))
+            for model, (_, latest_cost) in row.latest_costs.items():
+                slot = day_costs.setdefault((day, model), [None, None])
+                if model in row.totals:
+                    slot[0] = (slot[0] or 0.0) + row.totals[model]
+                # Later rows on the same day win, as in UsageAccumulator.
+                slot[1] = latest_cost
+        if not day_rows:
+            return 0
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM day_rows WHERE provider = ? AND day >= ?", (provider, since)
+            )
+            self._conn.execute(
+                "DELETE FROM day_costs WHERE provider = ? AND day >= ?", (provider, since)
+            )
+            self._conn.executemany("INSERT INTO day_rows VALUES (?, ?, ?, ?)", day_rows)
+            self._conn.executemany(
+                "INSERT INTO day_costs VALUES (?, ?, ?, ?, ?)",
+                [
+                    (provider, day, model, cost, latest)
+                    for (day, model), (cost, latest) in day_costs.items()
+                ],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)",
+                (provider, max(row[1] for row in day_rows)),
+            )
+        return len(day_rows)
+
+    def summary(
+        self, provider: str, start: Optional[date] = None, end: Optional[date] = None
+    ) -> UsageSummary:
+        where = "provider = ? AND day >= ? AND day <= ?"
+        params = (provider, start.isoformat() if start else "", end.isoformat() if end else "~")
+        conn = self._conn
+        totals = dict(
+            conn.execute(
+                f"SELECT model, SUM(cost) FROM day_costs WHERE {where} "
+                "GROUP BY model HAVING COUNT(cost) > 0",
+                params,
+            ).fetchall()
+        )
+        # SQLite fills bare columns from the row that produced MAX(day).
+        latest_costs = {
+            model: (day, cost)
+            for model, day, cost in conn.execute(
+                f"SELECT model, MAX(day), latest_cost FROM day_costs WHERE {where} GROUP BY model",
+                params,
+            )
+        }
+        current = conn.execute(
+            f"SELECT current_model, day FROM day_rows WHERE {where} "
+            "AND current_model IS NOT NULL ORDER BY day DESC, seq DESC LIMIT 1",
+            params,
+        ).fetchone()
+        (row_count,) = conn.execute(
+            f"SELECT COUNT(*) FROM day_rows WHERE {where}", params
+        ).fetchone()
+        return UsageSummary(
+            totals=totals,
+            current_model=current[0] if current else None,
+            current_date=current[1] if current else None,
+            latest_costs=latest_costs,
+            row_count=row_count,
+        )
+
+
+def pick_current_model(entries: List[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
+    summary = summarize_entries(entries)
+    return summary.current_model, summary.current_date
+
+
+def latest_day_cost(
+    entries: List[Dict[str, Any]], model: str
+) -> Tuple[Optional[str], Optional[float]]:
+    return summarize_entries(entries).latest_day_cost(model)
+
+
+def usd(value: Optional[float]) -> str:
+    if value is None:
+        return "—"
+    return f"${value:,.2f}"
 
 
 def render_text_current(
@@ -204,10 +1092,16 @@ def render_text_current(
     return "\n".join(lines)
 
 
+def render_model_lines(totals: Dict[str, float], indent: str = "") -> List[str]:
+    return [
+        f"{indent}- {model}: {usd(cost)}"
+        for model, cost in sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    ]
+
+
 def render_text_all(provider: str, totals: Dict[str, float]) -> str:
     lines = [f"Provider: {provider}", "Models:"]
-    for model, cost in sorted(totals.items(), key=lambda item: item[1], reverse=True):
-        lines.append(f"- {model}: {usd(cost)}")
+    lines.extend(render_model_lines(totals))
     return "\n".join(lines)
 
 
@@ -243,76 +1137,518 @@ def build_json_all(provider: str, totals: Dict[str, float]) -> Dict[str, Any]:
     }
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Summarize CodexBar model usage from local cost logs.")
-    parser.add_argument("--provider", choices=["codex", "claude"], default="codex")
+def bucket_start(day: date, group_by: str) -> date:
+    if group_by == "week":
+        return day - timedelta(days=day.weekday())
+    if group_by == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket_start(start: date, group_by: str) -> date:
+    if group_by == "week":
+        return start + timedelta(days=7)
+    if group_by == "month":
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def build_buckets(
+    sums: CostPrefixSums,
+    group_by: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    rolling: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Bucket per-model totals by day, ISO week or month within [start, end].
+
+    With `rolling`, each bucket also gets the per-model average daily cost over
+    the `rolling` calendar days ending on the bucket's last day, which may
+    reach back before `start`.
+    """
+    start = start or sums.first_day
+    end = end or sums.last_day
+    if start is None or end is None:
+        return []
+    buckets = []
+    cursor = bucket_start(start, group_by)
+    while cursor <= end:
+        following = next_bucket_start(cursor, group_by)
+        first, last = max(cursor, start), min(following - timedelta(days=1), end)
+        bucket: Dict[str, Any] = {"start": first, "end": last, "totals": sums.totals(first, last)}
+        if rolling:
+            window = sums.totals(last - timedelta(days=rolling - 1), last)
+            bucket["rolling"] = {model: cost / rolling for model, cost in window.items()}
+        buckets.append(bucket)
+        cursor = following
+    return buckets
+
+
+def render_text_buckets(
+    provider: str, group_by: str, buckets: List[Dict[str, Any]], rolling: Optional[int]
+) -> str:
+    header = f"Group by: {group_by}"
+    if rolling:
+        header += f" (rolling {rolling}-day average per model)"
+    lines = [f"Provider: {provider}", header]
+    for bucket in buckets:
+        span = bucket["start"].isoformat()
+        if bucket["end"] != bucket["start"]:
+            span += f" .. {bucket['end'].isoformat()}"
+        lines.append(f"{span}: {usd(sum(bucket['totals'].values()))}")
+        lines.extend(render_model_lines(bucket["totals"], indent="  "))
+        for model, average in sorted(bucket.get("rolling", {}).items()):
+            lines.append(f"  ~ {model}: {usd(average)}/day")
+    return "\n".join(lines)
+
+
+def build_json_buckets(
+    provider: str, group_by: str, buckets: List[Dict[str, Any]], rolling: Optional[int]
+) -> Dict[str, Any]:
+    items = []
+    for bucket in buckets:
+        item = {
+            "start": bucket["start"].isoformat(),
+            "end": bucket["end"].isoformat(),
+            "totalCostUSD": sum(bucket["totals"].values()),
+            "models": build_json_all(provider, bucket["totals"])["models"],
+        }
+        if rolling:
+            item["rollingAverageUSD"] = bucket["rolling"]
+        items.append(item)
+    return {
+        "provider": provider,
+        "mode": "buckets",
+        "groupBy": group_by,
+        "rollingDays": rolling,
+        "buckets": items,
+    }
+
+
+def current_report(
+    provider: str, summary: UsageSummary, model: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Collect the fields shared by `render_text_current` and `build_json_current`."""
+    latest_date = None
+    if not model:
+        model, latest_date = summary.current_model, summary.current_date
+    if not model:
+        return None
+    latest_cost_date, latest_cost = summary.latest_day_cost(model)
+    return {
+        "provider": provider,
+        "model": model,
+        "latest_date": latest_date,
+        "total_cost": summary.totals.get(model),
+        "latest_cost": latest_cost,
+        "latest_cost_date": latest_cost_date,
+        "entry_count": summary.row_count,
+    }
+
+
+def render_text_combined(sections: List[str], grand_total: float) -> str:
+    return "\n\n".join(sections + [f"Grand total: {usd(grand_total)}"])
+
+
+def build_json_combined(
+    mode: str, providers: List[Dict[str, Any]], grand_total: float
+) -> Dict[str, Any]:
+    return {
+        "provider": "all",
+        "mode": mode,
+        "providers": providers,
+        "grandTotalCostUSD": grand_total,
+    }
+
+
+@dataclass
+class LoadOptions:
+    input_path: Optional[str] = None
+    days: Optional[int] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+    stream: bool = False
+    cache: Optional[CostCache] = None
+    refresh: bool = False
+    ledger_path: Optional[Path] = None
+    ledger_source: Optional[str] = None
+
+    def window_start(self) -> Optional[date]:
+        """Combine --days and --from into the first day to include."""
+        if not self.days:
+            return self.start
+        cutoff = date.today() - timedelta(days=self.days - 1)
+        return max(self.start, cutoff) if self.start else cutoff
+
+
+def filter_rows(rows: Iterable[Dict[str, Any]], options: LoadOptions) -> Iterator[Dict[str, Any]]:
+    rows = iter_filter_by_days(rows, options.days)
+    if options.start or options.end:
+        rows = iter_filter_by_range(rows, options.start, options.end)
+    return iter(rows)
+
+
+def summarize_rows(
+    provider: str, rows: Iterable[Dict[str, Any]], options: LoadOptions
+) -> UsageSummary:
+    if options.ledger_path is None:
+        return summarize_entries(filter_rows(rows, options))
+    with UsageLedger(options.ledger_path, options.ledger_source) as ledger:
+        ledger.sync(provider, rows)
+        return ledger.summary(provider, start=options.window_start(), end=options.end)
+
+
+RowConsumer = Callable[[str, Iterable[Dict[str, Any]]], Any]
+
+
+def load_provider(
+    provider: str, options: LoadOptions, consume: RowConsumer, strict: bool = False
+) -> Any:
+    if options.stream:
+        with open_payload_stream(options.input_path, provider) as handle:
+            return consume(provider, iter_daily_entries(handle, provider, strict=strict))
+    payload = load_payload(options.input_path, provider, options.cache, options.refresh, strict)
+    return consume(provider, parse_daily_entries(payload))
+
+
+def load_providers(
+    providers: List[str], options: LoadOptions, consume: RowConsumer
+) -> Dict[str, Any]:
+    """
+    Feed each provider's daily rows to `consume`, running codexbar concurrently.
+
+    With several providers and an --input file, providers absent from the input
+    are skipped, and a single-provider object only counts for the provider it
+    names, so its rows are never totalled once per provider.
+    """
+    strict = bool(options.input_path) and len(providers) > 1
+    results: Dict[str, Any] = {}
+    if options.input_path and not options.stream:
+        # Parse the input once; stdin cannot be read per provider.
+        data = read_input(options.input_path)
+        for provider in providers:
+            try:
+                payload = select_provider(data, provider, strict)
+            except ProviderNotFound:
+                if not strict:
+                    raise
+                continue
+            results[provider] = consume(provider, parse_daily_entries(payload))
+    elif len(providers) == 1:
+        results[providers[0]] = load_provider(providers[0], options, consume)
+    else:
+        with ThreadPoolExecutor(max_workers=len(providers)) as pool:
+            futures = {
+                provider: pool.submit(load_provider, provider, options, consume, strict)
+                for provider in providers
+            }
+            for provider, future in futures.items():
+                try:
+                    results[provider] = future.result()
+                except ProviderNotFound:
+                    if not strict:
+                        raise
+    if not results:
+        raise RuntimeError(
+            "No provider found in the input payload; name one with --provider "
+            "or add a 'provider' field."
+        )
+    return results
+
+
+def load_summaries(providers: List[str], options: LoadOptions) -> Dict[str, UsageSummary]:
+    return load_providers(
+        providers, options, lambda provider, rows: summarize_rows(provider, rows, options)
+    )
+
+
+def load_stores(providers: List[str], options: LoadOptions) -> Dict[str, "UsageStore"]:
+    return load_providers(providers, options, lambda _provider, rows: UsageStore.from_entries(rows))
+
+
+def ledger_source(input_path: Optional[str]) -> str:
+    """Where ledger rows come from: codexbar, stdin or one resolved input file."""
+    if not input_path:
+        return "codexbar"
+    if input_path == "-":
+        return "stdin"
+    return f"input:{Path(input_path).resolve()}"
+
+
+def default_ledger_path(cache_dir: Path, source: str) -> Path:
+    """One ledger per source, so codexbar and --input histories never mix."""
+    if source == "codexbar":
+        return cache_dir / "usage-ledger.sqlite3"
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"usage-ledger-{digest}.sqlite3"
+
+
+def print_json(payload: Dict[str, Any], pretty: bool) -> None:
+    indent = 2 if pretty else None
+    print(json.dumps(payload, indent=indent, sort_keys=pretty))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Summarize CodexBar model usage from local cost logs."
+    )
+    parser.add_argument(
+        "--provider",
+        choices=[*PROVIDERS, "all"],
+        default="codex",
+        help="Provider to summarize; 'all' fetches every provider concurrently.",
+    )
     parser.add_argument("--mode", choices=["current", "all"], default="current")
     parser.add_argument("--model", help="Explicit model name to report instead of auto-current.")
     parser.add_argument("--input", help="Path to codexbar cost JSON (or '-' for stdin).")
-    parser.add_argument("--days", type=positive_int, help="Limit to last N days (based on daily rows).")
+    parser.add_argument(
+        "--days", type=positive_int, help="Limit to last N days (based on daily rows)."
+    )
+    parser.add_argument(
+        "--from", dest="start", type=iso_date, help="First day to include (YYYY-MM-DD)."
+    )
+    parser.add_argument("--to", dest="end", type=iso_date, help="Last day to include (YYYY-MM-DD).")
+    parser.add_argument(
+        "--group-by",
+        choices=["day", "week", "month"],
+        help="Report per-model totals per day, ISO week or month instead of --mode.",
+    )
+    parser.add_argument(
+        "--rolling",
+        type=positive_int,
+        help="Add per-model N-day rolling average daily cost to each bucket (implies --group-by day).",
+    )
+    parser.add_argument(
+        "--watch",
+        type=positive_float,
+        metavar="SECONDS",
+        help="Keep running, re-polling every SECONDS and re-rendering when days change.",
+    )
     parser.add_argument("--format", choices=["text", "json"], default="text")
     parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON output.")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse the payload incrementally so memory stays flat on long histories "
+        "(reads codexbar directly, bypassing the cost cache).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always run codexbar instead of reading or writing the local cost cache.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached codexbar output but store the fresh result.",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=positive_int,
+        default=DEFAULT_CACHE_TTL,
+        help=f"Seconds a cached codexbar result stays fresh (default: {DEFAULT_CACHE_TTL}).",
+    )
+    parser.add_argument("--cache-dir", help="Cache directory (default: user cache dir).")
+    parser.add_argument(
+        "--ledger",
+        action="store_true",
+        help="Sync new daily rows into a local usage ledger and answer queries from it.",
+    )
+    parser.add_argument(
+        "--ledger-path", help="Ledger file (default: usage-ledger.sqlite3 in the cache dir)."
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.provider == "all" and args.stream and args.input == "-":
+        parser.error("--stream with --provider all needs a file path, not stdin.")
+    if args.rolling and not args.group_by:
+        args.group_by = "day"
+    if args.group_by and (args.ledger or args.ledger_path):
+        parser.error("--group-by/--rolling read the payload directly and cannot use --ledger.")
+    if args.ledger and args.input == "-" and not args.ledger_path:
+        parser.error("--ledger with --input - needs --ledger-path to name the ledger.")
+    if args.watch and (args.input == "-" or args.group_by or args.ledger or args.ledger_path):
+        parser.error(
+            "--watch needs a file or codexbar input and cannot use --group-by or --ledger."
+        )
 
+    cache_dir = Path(args.cache_dir) if args.cache_dir else default_cache_dir()
+    options = LoadOptions(
+        input_path=args.input,
+        days=args.days,
+        start=args.start,
+        end=args.end,
+        stream=args.stream,
+        cache=None if args.no_cache else CostCache(cache_dir, ttl=args.cache_ttl),
+        refresh=args.refresh,
+    )
+    if args.watch:
+        # Every poll should see fresh codexbar output; still refresh the cache for other callers.
+        options.refresh = True
+    if args.ledger or args.ledger_path:
+        options.ledger_source = ledger_source(args.input)
+        options.ledger_path = Path(
+            args.ledger_path or default_ledger_path(cache_dir, options.ledger_source)
+        )
+
+    providers = list(PROVIDERS) if args.provider == "all" else [args.provider]
+    if args.group_by:
+        return emit_buckets(args, providers, options)
+    if args.watch:
+        return watch_usage(args, providers, options)
     try:
-        payload = load_payload(args.input, args.provider)
+        summaries = load_summaries(providers, options)
     except Exception as exc:
         eprint(str(exc))
         return 1
+    return emit_summaries(args, summaries)
 
-    entries = parse_daily_entries(payload)
-    entries = filter_by_days(entries, args.days)
 
+def emit_summaries(args: argparse.Namespace, summaries: Dict[str, UsageSummary]) -> int:
+    if len(summaries) > 1:
+        return emit_combined(args, summaries)
+
+    provider, summary = next(iter(summaries.items()))
     if args.mode == "current":
-        model = args.model
-        latest_date = None
-        if not model:
-            model, latest_date = pick_current_model(entries)
-        if not model:
+        report = current_report(provider, summary, args.model)
+        if report is None:
             eprint("No model data found in codexbar cost payload.")
             return 2
-        totals = aggregate_costs(entries)
-        total_cost = totals.get(model)
-        latest_cost_date, latest_cost = latest_day_cost(entries, model)
-
         if args.format == "json":
-            payload_out = build_json_current(
-                provider=args.provider,
-                model=model,
-                latest_date=latest_date,
-                total_cost=total_cost,
-                latest_cost=latest_cost,
-                latest_cost_date=latest_cost_date,
-                entry_count=len(entries),
-            )
-            indent = 2 if args.pretty else None
-            print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
+            print_json(build_json_current(**report), args.pretty)
         else:
-            print(
-                render_text_current(
-                    provider=args.provider,
-                    model=model,
-                    latest_date=latest_date,
-                    total_cost=total_cost,
-                    latest_cost=latest_cost,
-                    latest_cost_date=latest_cost_date,
-                    entry_count=len(entries),
-                )
-            )
+            print(render_text_current(**report))
         return 0
 
-    totals = aggregate_costs(entries)
+    totals = summary.totals
     if not totals:
         eprint("No model breakdowns found in codexbar cost payload.")
         return 2
 
     if args.format == "json":
-        payload_out = build_json_all(provider=args.provider, totals=totals)
-        indent = 2 if args.pretty else None
-        print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
+        print_json(build_json_all(provider=provider, totals=totals), args.pretty)
+    else:
+        print(render_text_all(provider=provider, totals=totals))
+    return 0
+
+
+def input_signature(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def watch_usage(
+    args: argparse.Namespace,
+    providers: List[str],
+    options: LoadOptions,
+    iterations: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """
+    Keep polling the input file (by mtime and size) or codexbar and re-render
+    whenever a day changes. Each provider's LiveUsage re-folds only the days
+    whose rows differ from the previous poll.
+    """
+    live = {provider: LiveUsage() for provider in providers}
+    signature: Optional[Tuple[int, int]] = None
+    polls = 0
+    try:
+        while True:
+            changed = False
+            try:
+                current_signature = (
+                    input_signature(options.input_path) if options.input_path else None
+                )
+                if current_signature is None or current_signature != signature:
+                    rows = load_providers(
+                        providers, options, lambda _provider, rows: list(filter_rows(rows, options))
+                    )
+                    for provider, provider_rows in rows.items():
+                        changed = bool(live[provider].update(provider_rows)) or changed
+                    signature = current_signature
+            except Exception as exc:
+                eprint(str(exc))
+            if changed:
+                emit_summaries(
+                    args, {provider: usage.summary() for provider, usage in live.items()}
+                )
+                if args.format == "text":
+                    print()
+                sys.stdout.flush()
+            polls += 1
+            if iterations is not None and polls >= iterations:
+                return 0
+            sleep(args.watch)
+    except KeyboardInterrupt:
+        return 0
+
+
+def emit_buckets(args: argparse.Namespace, providers: List[str], options: LoadOptions) -> int:
+    try:
+        stores = load_stores(providers, options)
+    except Exception as exc:
+        eprint(str(exc))
+        return 1
+
+    start = options.window_start()
+    sections: List[str] = []
+    reports: List[Dict[str, Any]] = []
+    grand_total = 0.0
+    for provider, store in stores.items():
+        buckets = build_buckets(
+            store.prefix_sums(), args.group_by, start, options.end, args.rolling
+        )
+        grand_total += sum(sum(bucket["totals"].values()) for bucket in buckets)
+        reports.append(build_json_buckets(provider, args.group_by, buckets, args.rolling))
+        sections.append(render_text_buckets(provider, args.group_by, buckets, args.rolling))
+
+    if not any(report["buckets"] for report in reports):
+        eprint("No dated rows found in codexbar cost payload.")
+        return 2
+    if len(reports) == 1:
+        if args.format == "json":
+            print_json(reports[0], args.pretty)
+        else:
+            print(sections[0])
+    elif args.format == "json":
+        print_json(build_json_combined("buckets", reports, grand_total), args.pretty)
+    else:
+        print(render_text_combined(sections, grand_total))
+    return 0
+
+
+def emit_combined(args: argparse.Namespace, summaries: Dict[str, UsageSummary]) -> int:
+    sections: List[str] = []
+    reports: List[Dict[str, Any]] = []
+    grand_total = 0.0
+    for provider, summary in summaries.items():
+        if args.mode == "current":
+            report = current_report(provider, summary, args.model)
+            if report is None:
+                eprint(f"No model data found for provider '{provider}'.")
+                continue
+            grand_total += report["total_cost"] or 0.0
+            reports.append(build_json_current(**report))
+            sections.append(render_text_current(**report))
+            continue
+        if not summary.totals:
+            eprint(f"No model breakdowns found for provider '{provider}'.")
+            continue
+        provider_total = sum(summary.totals.values())
+        grand_total += provider_total
+        reports.append({**build_json_all(provider, summary.totals), "totalCostUSD": provider_total})
+        sections.append(
+            f"{render_text_all(provider, summary.totals)}\nTotal: {usd(provider_total)}"
+        )
+
+    if not reports:
+        eprint("No model data found in codexbar cost payload.")
+        return 2
+    if args.format == "json":
+        print_json(build_json_combined(args.mode, reports, grand_total), args.pretty)
     else:
-        print(render_text_all(provider=args.provider, totals=totals))
+        print(render_text_combined(sections, grand_total))
     return 0
 
 
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the model_usage benchmark harness.
+"""
+
+import io
+import json
+from unittest import TestCase, main
+
+import bench_model_usage
+
+
+class TestBenchModelUsage(TestCase):
+    def test_synthetic_payload_has_requested_shape(self):
+        handle = io.StringIO()
+
+        bench_model_usage.write_synthetic_payload(handle, days=5, models=3, providers=3)
+
+        payload = json.loads(handle.getvalue())
+        self.assertEqual(
+            [entry["provider"] for entry in payload], ["provider-0", "codex", "claude"]
+        )
+        self.assertEqual(len(payload[0]["daily"]), 5)
+        self.assertEqual(len(payload[0]["daily"][0]["modelBreakdowns"]), 3)
+
+    def test_functions_and_store_suites_report_every_step(self):
+        report = bench_model_usage.run_benchmarks(
+            "functions", days=10, models=2, providers=1, window=3, repeat=1
+        )
+        report["results"].extend(bench_model_usage.run_store_suite(10, 2, 3, 1))
+
+        names = [item["name"] for item in report["results"]]
+        self.assertIn("load_payload", names)
+        self.assertIn("main[current]", names)
+        self.assertIn("queries[store]", names)
+        for item in report["results"]:
+            self.assertGreaterEqual(item["seconds"], 0)
+            self.assertGreaterEqual(item["peakKiB"], 0)
+
+    def test_functions_suite_runs_with_synthetic_providers(self):
+        report = bench_model_usage.run_benchmarks(
+            "functions", days=5, models=2, providers=3, window=3, repeat=1
+        )
+
+        self.assertIn("main[all]", [item["name"] for item in report["results"]])
+
+    def test_compare_flags_only_steps_over_the_ratio(self):
+        baseline = [
+            {"suite": "functions", "name": "fast", "seconds": 1.0},
+            {"suite": "functions", "name": "slow", "seconds": 1.0},
+        ]
+        results = [
+            {"suite": "functions", "name": "fast", "seconds": 1.1},
+            {"suite": "functions", "name": "slow", "seconds": 2.0},
+            {"suite": "functions", "name": "new", "seconds": 9.0},
+        ]
+
+        regressions = bench_model_usage.compare(results, baseline, 1.25)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("functions/slow", regressions[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,58 @@ Tests for model_usage helpers.
 """
 
 import argparse
-from datetime import date, timedelta
+import io
+import json
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
 from unittest import TestCase, main
+from unittest.mock import patch
 
-from model_usage import filter_by_days, positive_int
+import model_usage
+from model_usage import (
+    CostCache,
+    LiveUsage,
+    LoadOptions,
+    UsageLedger,
+    UsageStore,
+    build_buckets,
+    filter_by_days,
+    iter_daily_entries,
+    load_payload,
+    load_summaries,
+    parse_daily_entries,
+    positive_int,
+    summarize_entries,
+)
+
+SAMPLE_PAYLOAD = [
+    {
+        "provider": "claude",
+        "daily": [{"date": "2025-01-01", "modelBreakdowns": [{"modelName": "opus", "cost": 1}]}],
+    },
+    {
+        "provider": "codex",
+        "totals": {"totalCost": 12.5},
+        "daily": [
+            {"date": "2025-01-01", "modelBreakdowns": [{"modelName": "gpt-5", "cost": 1.25}]},
+            "not-a-row",
+            {"date": "2025-01-02", "modelBreakdowns": [{"modelName": "gpt-5", "cost": 11.25}]},
+        ],
+    },
+]
 
 
 class TestModelUsage(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_model_usage_"))
+
+    def tearDown(self):
+        import shutil
+
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
     def test_positive_int_accepts_valid_numbers(self):
         self.assertEqual(positive_int("1"), 1)
         self.assertEqual(positive_int("7"), 7)
@@ -35,6 +80,409 @@ class TestModelUsage(TestCase):
         self.assertEqual(filtered[0]["date"], (today - timedelta(days=1)).strftime("%Y-%m-%d"))
         self.assertEqual(filtered[1]["date"], today.strftime("%Y-%m-%d"))
 
+    def test_filter_by_days_handles_non_iso_and_invalid_dates(self):
+        today = date.today()
+        entries = [
+            {"date": f"{today.year}-{today.month}-{today.day}"},
+            {"date": f"{today.year}-99-99"},
+            {"date": "yesterday"},
+            {"date": None},
+        ]
+
+        filtered = filter_by_days(entries, 1)
+
+        self.assertEqual(filtered, entries[:1])
+
+    def test_filter_by_days_parses_only_kept_rows_once_per_day(self):
+        today = date.today()
+        entries = [
+            {"date": (today - timedelta(days=offset % 3650)).isoformat()}
+            for offset in range(100_000)
+        ]
+        cutoff = today - timedelta(days=29)
+        expected = [
+            entry
+            for entry in entries
+            if datetime.strptime(entry["date"], "%Y-%m-%d").date() >= cutoff
+        ]
+
+        model_usage.parse_date.cache_clear()
+        filtered = filter_by_days(entries, 30)
+        info = model_usage.parse_date.cache_info()
+
+        self.assertEqual(filtered, expected)
+        # Rows outside the window never reach parse_date; kept rows parse each
+        # of the 30 days once and hit the cache after that.
+        self.assertEqual(info.misses, 30)
+        self.assertEqual(info.hits, len(filtered) - 30)
+
+    def test_summary_tracks_latest_rows_without_sorting(self):
+        entries = [
+            {"date": "2025-01-03", "modelBreakdowns": [{"modelName": "b", "cost": 3}]},
+            {"date": "2025-01-01", "modelBreakdowns": [{"modelName": "a", "cost": 9}]},
+            {
+                "date": "2025-01-02",
+                "modelBreakdowns": [{"modelName": "a", "cost": 1}, {"modelName": "b", "cost": 2}],
+            },
+        ]
+
+        summary = summarize_entries(entries)
+
+        self.assertEqual(summary.totals, {"a": 10.0, "b": 5.0})
+        self.assertEqual((summary.current_model, summary.current_date), ("b", "2025-01-03"))
+        self.assertEqual(summary.latest_day_cost("a"), ("2025-01-02", 1.0))
+        self.assertEqual(summary.latest_day_cost("b"), ("2025-01-03", 3.0))
+        self.assertEqual(summary.latest_day_cost("missing"), (None, None))
+        self.assertEqual(summary.row_count, 3)
+
+    def test_summary_prefers_later_row_on_same_date_and_falls_back_to_models_used(self):
+        entries = [
+            {"date": "2025-01-02", "modelBreakdowns": [{"modelName": "a", "cost": 1}]},
+            {"date": "2025-01-02", "modelBreakdowns": [], "modelsUsed": ["a", "c"]},
+            {"date": "2025-01-01", "modelBreakdowns": [{"modelName": "b", "cost": 5}]},
+        ]
+
+        summary = summarize_entries(entries)
+
+        self.assertEqual((summary.current_model, summary.current_date), ("c", "2025-01-02"))
+        self.assertEqual(summary.latest_day_cost("a"), ("2025-01-02", 1.0))
+
+    def test_store_queries_match_row_summary(self):
+        entries = [
+            {"date": "2025-01-03", "modelBreakdowns": [{"modelName": "b", "cost": 3}]},
+            {"date": "2025-01-01", "modelBreakdowns": [{"modelName": "a", "cost": 9}]},
+            {"date": "2025-01-02", "modelBreakdowns": [{"modelName": "a", "cost": "n/a"}]},
+            {"date": "2025-01-02", "modelsUsed": ["c"]},
+        ]
+
+        store = UsageStore.from_entries(entries)
+
+        self.assertEqual(store.summary(), summarize_entries(entries))
+        self.assertEqual(store.models, ["b", "a", "c"])
+        self.assertEqual(store.latest_day_cost("a"), ("2025-01-02", None))
+
+    def test_store_window_bisects_sorted_days(self):
+        today = date.today()
+        entries = [
+            {
+                "date": (today - timedelta(days=offset)).isoformat(),
+                "modelBreakdowns": [{"modelName": "m", "cost": offset}],
+            }
+            for offset in range(10)
+        ]
+        store = UsageStore.from_entries(entries)
+
+        recent = store.filter_by_days(3)
+        middle = store.window(today - timedelta(days=6), today - timedelta(days=5))
+
+        self.assertEqual(len(recent), 3)
+        self.assertEqual(recent.aggregate_costs(), {"m": 3.0})
+        self.assertEqual(middle.aggregate_costs(), {"m": 11.0})
+        self.assertEqual(len(store), 10)
+
+    def test_prefix_sums_answer_arbitrary_windows(self):
+        entries = [
+            {
+                "date": f"2025-01-{day:02d}",
+                "modelBreakdowns": [{"modelName": "a", "cost": day}, {"modelName": "b", "cost": 1}],
+            }
+            for day in range(1, 32)
+        ]
+        sums = UsageStore.from_entries(entries).prefix_sums()
+
+        for first, last in ((1, 31), (5, 9), (20, 20)):
+            window = [entry for entry in entries if first <= int(entry["date"][-2:]) <= last]
+            self.assertEqual(
+                sums.totals(date(2025, 1, first), date(2025, 1, last)),
+                summarize_entries(window).totals,
+            )
+
+    def test_build_buckets_groups_by_week_with_rolling_average(self):
+        entries = [
+            {"date": f"2025-01-{day:02d}", "modelBreakdowns": [{"modelName": "a", "cost": 2}]}
+            for day in range(1, 15)
+        ]
+        sums = UsageStore.from_entries(entries).prefix_sums()
+
+        buckets = build_buckets(sums, "week", start=date(2025, 1, 3), rolling=8)
+
+        self.assertEqual(
+            [(bucket["start"], bucket["end"]) for bucket in buckets],
+            [
+                (date(2025, 1, 3), date(2025, 1, 5)),
+                (date(2025, 1, 6), date(2025, 1, 12)),
+                (date(2025, 1, 13), date(2025, 1, 14)),
+            ],
+        )
+        self.assertEqual([bucket["totals"]["a"] for bucket in buckets], [6.0, 14.0, 4.0])
+        self.assertEqual(buckets[0]["rolling"], {"a": 1.25})
+        self.assertEqual(buckets[1]["rolling"], {"a": 2.0})
+
+    def test_ledger_syncs_only_new_days_and_matches_row_summary(self):
+        entries = [
+            {"date": "2025-01-01", "modelBreakdowns": [{"modelName": "a", "cost": 2}]},
+            {
+                "date": "2025-01-02",
+                "modelBreakdowns": [{"modelName": "a", "cost": 1}, {"modelName": "b", "cost": 4}],
+            },
+        ]
+        updated_today = {
+            "date": "2025-01-02",
+            "modelBreakdowns": [{"modelName": "a", "cost": 5}, {"modelName": "b", "cost": 4}],
+        }
+        new_day = {"date": "2025-01-03", "modelBreakdowns": [], "modelsUsed": ["c"]}
+
+        with UsageLedger(self.temp_dir / "ledger.sqlite3") as ledger:
+            self.assertEqual(ledger.sync("codex", entries), 2)
+            self.assertEqual(ledger.summary("codex"), summarize_entries(entries))
+
+            history = [entries[0], updated_today, new_day]
+            self.assertEqual(ledger.sync("codex", history), 2)
+            self.assertEqual(ledger.last_day("codex"), "2025-01-03")
+            self.assertEqual(ledger.summary("codex"), summarize_entries(history))
+
+            recent = ledger.summary("codex", start=date(2025, 1, 2))
+            self.assertEqual(recent, summarize_entries(history[1:]))
+            self.assertEqual(ledger.summary("claude").row_count, 0)
+
+    def test_ledger_resyncs_non_padded_dates(self):
+        entries = [
+            {"date": "2024-9-30", "modelBreakdowns": [{"modelName": "a", "cost": 2}]},
+            {"date": "2024-10-01", "modelBreakdowns": [{"modelName": "a", "cost": 3}]},
+        ]
+
+        with UsageLedger(self.temp_dir / "ledger.sqlite3") as ledger:
+            self.assertEqual(ledger.sync("codex", entries), 2)
+            self.assertEqual(ledger.sync("codex", entries), 1)
+            summary = ledger.summary("codex")
+        self.assertEqual((summary.totals, summary.row_count), ({"a": 5.0}, 2))
+
+    def test_ledger_keeps_each_source_separate(self):
+        cache_dir = self.temp_dir / "cache"
+        first = self.temp_dir / "a.json"
+        second = self.temp_dir / "b.json"
+        first.write_text(json.dumps(SAMPLE_PAYLOAD), encoding="utf-8")
+        later = {"date": "2025-02-01", "modelBreakdowns": [{"modelName": "opus", "cost": 7}]}
+        second.write_text(json.dumps([{"provider": "claude", "daily": [later]}]), encoding="utf-8")
+        base = ["--provider", "claude", "--mode", "all", "--format", "json", "--ledger"]
+        base += ["--cache-dir", str(cache_dir)]
+
+        totals = []
+        for path in (first, second, first):
+            with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                self.assertEqual(model_usage.main(base + ["--input", str(path)]), 0)
+            totals.append(json.loads(stdout.getvalue())["models"])
+        self.assertEqual(totals[0], [{"model": "opus", "totalCostUSD": 1.0}])
+        self.assertEqual(totals[1], [{"model": "opus", "totalCostUSD": 7.0}])
+        self.assertEqual(totals[2], totals[0])
+        self.assertEqual(len(list(cache_dir.glob("usage-ledger-*.sqlite3"))), 2)
+
+        shared = self.temp_dir / "shared.sqlite3"
+        with UsageLedger(shared, "input:a"):
+            pass
+        with self.assertRaisesRegex(RuntimeError, "holds usage from input:a"):
+            UsageLedger(shared, "codexbar")
+
+    def test_stream_matches_full_load_across_chunk_boundaries(self):
+        raw = json.dumps(SAMPLE_PAYLOAD, indent=2)
+        path = self.temp_dir / "cost.json"
+        path.write_text(raw, encoding="utf-8")
+        expected = parse_daily_entries(load_payload(str(path), "codex"))
+
+        for chunk_size in (1, 7, 64):
+            streamed = list(iter_daily_entries(io.StringIO(raw), "codex", chunk_size=chunk_size))
+            self.assertEqual(streamed, expected)
+
+    def test_stream_reads_numbers_split_across_chunks(self):
+        payload = [
+            {
+                "provider": "codex",
+                "lastCost": 12.5,
+                "tokens": 1e5,
+                "daily": [{"date": "2025-01-03"}],
+            },
+            {"provider": "claude", "lastCost": -0.25e-3, "daily": []},
+        ]
+        raw = json.dumps(payload)
+
+        for chunk_size in range(1, len(raw) + 1):
+            with self.subTest(chunk_size=chunk_size):
+                streamed = list(
+                    iter_daily_entries(io.StringIO(raw), "codex", chunk_size=chunk_size)
+                )
+                self.assertEqual(streamed, [{"date": "2025-01-03"}])
+                reader = model_usage._JsonStreamReader(io.StringIO("[1e5, 12.5]"), chunk_size)
+                self.assertEqual(reader.value(), [1e5, 12.5])
+
+    def test_stream_holds_rows_until_provider_key_is_seen(self):
+        payload = [{"daily": [{"date": "2025-01-03"}], "provider": "codex"}]
+
+        streamed = list(iter_daily_entries(io.StringIO(json.dumps(payload)), "codex"))
+
+        self.assertEqual(streamed, [{"date": "2025-01-03"}])
+
+    def test_stream_accepts_single_provider_object(self):
+        raw = json.dumps(SAMPLE_PAYLOAD[0])
+
+        streamed = list(iter_daily_entries(io.StringIO(raw), "codex"))
+
+        self.assertEqual(len(streamed), 1)
+
+    def test_stream_raises_for_missing_provider(self):
+        with self.assertRaises(RuntimeError):
+            list(iter_daily_entries(io.StringIO(json.dumps(SAMPLE_PAYLOAD)), "gemini"))
+
+    def test_stream_rejects_truncated_input(self):
+        raw = json.dumps(SAMPLE_PAYLOAD)[:-20]
+        with self.assertRaises(ValueError):
+            list(iter_daily_entries(io.StringIO(raw), "codex", chunk_size=16))
+
+    def test_cache_round_trips_within_ttl_and_expires_after(self):
+        now = [1000.0]
+        cache = CostCache(self.temp_dir / "cache", ttl=60, clock=lambda: now[0])
+
+        cache.put("codex", SAMPLE_PAYLOAD)
+        self.assertEqual(cache.get("codex"), SAMPLE_PAYLOAD)
+        self.assertIsNone(cache.get("claude"))
+
+        now[0] += 61
+        self.assertIsNone(cache.get("codex"))
+
+    def test_cache_rejects_truncated_entry(self):
+        cache = CostCache(self.temp_dir / "cache")
+        cache.put("codex", SAMPLE_PAYLOAD)
+        path = self.temp_dir / "cache" / "cost-codex.json"
+        path.write_bytes(path.read_bytes()[:-5])
+
+        self.assertIsNone(cache.get("codex"))
+
+    def test_cache_evicts_least_recently_used_entries(self):
+        import os
+
+        cache_dir = self.temp_dir / "cache"
+        cache = CostCache(cache_dir, max_bytes=10**9)
+        cache.put("codex", SAMPLE_PAYLOAD)
+        os.utime(cache_dir / "cost-codex.json", (1, 1))
+        entry_size = (cache_dir / "cost-codex.json").stat().st_size
+
+        cache.max_bytes = entry_size + 10
+        cache.put("claude", SAMPLE_PAYLOAD)
+
+        self.assertFalse((cache_dir / "cost-codex.json").exists())
+        self.assertTrue((cache_dir / "cost-claude.json").exists())
+
+    def test_load_payload_uses_cache_until_refresh(self):
+        cache = CostCache(self.temp_dir / "cache")
+        with patch.object(model_usage, "run_codexbar_cost", return_value=SAMPLE_PAYLOAD) as run:
+            first = load_payload(None, "codex", cache)
+            second = load_payload(None, "codex", cache)
+            self.assertEqual(run.call_count, 1)
+            load_payload(None, "codex", cache, refresh=True)
+            self.assertEqual(run.call_count, 2)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first["provider"], "codex")
+
+    def test_load_summaries_runs_codexbar_for_providers_concurrently(self):
+        import threading
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_run(provider):
+            barrier.wait()
+            return [entry for entry in SAMPLE_PAYLOAD if entry["provider"] == provider]
+
+        with patch.object(model_usage, "run_codexbar_cost", side_effect=fake_run):
+            summaries = load_summaries(["codex", "claude"], LoadOptions())
+
+        self.assertEqual(summaries["codex"].totals, {"gpt-5": 12.5})
+        self.assertEqual(summaries["claude"].totals, {"opus": 1.0})
+
+    def test_main_reports_combined_totals_for_all_providers(self):
+        path = self.temp_dir / "cost.json"
+        path.write_text(json.dumps(SAMPLE_PAYLOAD), encoding="utf-8")
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            code = model_usage.main(
+                ["--provider", "all", "--mode", "all", "--input", str(path), "--format", "json"]
+            )
+
+        self.assertEqual(code, 0)
+        report = json.loads(stdout.getvalue())
+        self.assertEqual([item["provider"] for item in report["providers"]], ["codex", "claude"])
+        self.assertEqual(report["providers"][0]["totalCostUSD"], 12.5)
+        self.assertEqual(report["grandTotalCostUSD"], 13.5)
+
+    def test_all_providers_count_a_single_provider_object_once(self):
+        path = self.temp_dir / "single.json"
+        path.write_text(json.dumps(SAMPLE_PAYLOAD[1]), encoding="utf-8")
+        args = ["--provider", "all", "--mode", "all", "--input", str(path), "--format", "json"]
+
+        for extra in ([], ["--stream"]):
+            with self.subTest(stream=bool(extra)):
+                with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                    code = model_usage.main(args + extra)
+
+                self.assertEqual(code, 0)
+                report = json.loads(stdout.getvalue())
+                self.assertEqual(report["provider"], "codex")
+                self.assertEqual(report["models"], [{"model": "gpt-5", "totalCostUSD": 12.5}])
+
+        unnamed = self.temp_dir / "unnamed.json"
+        unnamed.write_text(json.dumps({"daily": SAMPLE_PAYLOAD[1]["daily"]}), encoding="utf-8")
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            code = model_usage.main(["--provider", "all", "--input", str(unnamed)])
+        self.assertEqual(code, 1)
+        self.assertIn("--provider", stderr.getvalue())
+
+    def test_live_usage_refolds_only_changed_days(self):
+        history = [
+            {"date": "2025-01-01", "modelBreakdowns": [{"modelName": "a", "cost": 2}]},
+            {"date": "2025-01-02", "modelBreakdowns": [{"modelName": "b", "cost": 1}]},
+        ]
+        live = LiveUsage()
+
+        self.assertEqual(sorted(live.update(history)), ["2025-01-01", "2025-01-02"])
+        self.assertEqual(live.update(history), [])
+
+        updated = [
+            history[0],
+            {"date": "2025-01-02", "modelBreakdowns": [{"modelName": "b", "cost": 3}]},
+        ]
+        self.assertEqual(live.update(updated), ["2025-01-02"])
+        self.assertEqual(live.summary(), summarize_entries(updated))
+
+        self.assertEqual(live.update(updated[1:]), ["2025-01-01"])
+        self.assertEqual(live.summary(), summarize_entries(updated[1:]))
+
+    def test_watch_rerenders_only_when_input_changes(self):
+        path = self.temp_dir / "cost.json"
+        path.write_text(json.dumps(SAMPLE_PAYLOAD), encoding="utf-8")
+        args = argparse.Namespace(watch=1.0, format="json", pretty=False, mode="all", model=None)
+        polls = []
+
+        def fake_sleep(_seconds):
+            polls.append(_seconds)
+            if len(polls) == 2:
+                payload = json.loads(json.dumps(SAMPLE_PAYLOAD))
+                payload[1]["daily"].append(
+                    {"date": "2025-01-03", "modelBreakdowns": [{"modelName": "o3", "cost": 2}]}
+                )
+                path.write_text(json.dumps(payload), encoding="utf-8")
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            code = model_usage.watch_usage(
+                args, ["codex"], LoadOptions(input_path=str(path)), iterations=4, sleep=fake_sleep
+            )
+
+        self.assertEqual(code, 0)
+        reports = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(len(reports), 2)
+        self.assertEqual(
+            reports[1]["models"],
+            [{"model": "gpt-5", "totalCostUSD": 12.5}, {"model": "o3", "totalCostUSD": 2.0}],
+        )
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark package_skill compression scaling across --jobs values.
+
+Builds a synthetic skill of text-like assets (default 256 MiB over 64 files),
+packages it once per jobs value, and reports wall time and speedup over
+jobs=1. Deflate runs outside the GIL, so on an idle machine the speedup
+should track the job count up to the number of physical cores.
+
+Usage:
+    python bench_package_skill.py [--size-mib N] [--files N]
+                                  [--jobs 1,2,4,8] [--repeat N] [--json]
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from package_skill import package_skill  # noqa: E402
+
+WORDS = (
+    "skill agent model token prompt context script asset reference image audio "
+    "voice render layout table chart query index cache bundle archive"
+).split()
+
+
+def build_synthetic_skill(root: Path, size_mib: int, files: int, seed: int = 0) -> Path:
+    """Write a skill whose assets compress roughly like source text and docs."""
+    skill_dir = root / "bench-skill"
+    assets = skill_dir / "assets"
+    assets.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(
+        "---\nname: bench-skill\ndescription: Synthetic skill for packaging benchmarks.\n---\n"
+    )
+    rng = random.Random(seed)
+    block = " ".join(rng.choice(WORDS) + str(rng.randrange(1000)) for _ in range(200_000))
+    block = block.encode()
+    per_file = max(1, size_mib * 1024 * 1024 // files)
+    for index in range(files):
+        offset = rng.randrange(len(block))
+        rotated = block[offset:] + block[:offset]
+        with open(assets / f"asset-{index:04d}.txt", "wb") as handle:
+            remaining = per_file
+            while remaining > 0:
+                chunk = rotated[:remaining]
+                handle.write(chunk)
+                remaining -= len(chunk)
+    return skill_dir
+
+
+def time_package(skill_dir: Path, out_dir: Path, jobs: int, repeat: int) -> Dict[str, Any]:
+    best = float("inf")
+    archive = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            archive = package_skill(skill_dir, out_dir, jobs=jobs)
+        best = min(best, time.perf_counter() - started)
+    if archive is None:
+        raise RuntimeError(f"packaging failed with jobs={jobs}")
+    return {"jobs": jobs, "seconds": best, "archiveBytes": Path(archive).stat().st_size}
+
+
+def run_benchmark(size_mib: int, files: int, jobs_values: List[int], repeat: int) -> Dict[str, Any]:
+    temp_dir = Path(tempfile.mkdtemp(prefix="bench_package_skill_"))
+    try:
+        skill_dir = build_synthetic_skill(temp_dir, size_mib, files)
+        results = [
+            time_package(skill_dir, temp_dir / f"out-{jobs}", jobs, repeat) for jobs in jobs_values
+        ]
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    baseline = results[0]["seconds"]
+    for item in results:
+        item["speedup"] = baseline / item["seconds"] if item["seconds"] else 0.0
+    return {"sizeMiB": size_mib, "files": files, "cpus": os.cpu_count(), "results": results}
+
+
+def render_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"{report['sizeMiB']} MiB in {report['files']} files, {report['cpus']} CPUs",
+        f"{'jobs':>6} {'seconds':>10} {'MiB/s':>10} {'speedup':>8}",
+    ]
+    for item in report["results"]:
+        rate = report["sizeMiB"] / item["seconds"] if item["seconds"] else 0.0
+        lines.append(
+            f"{item['jobs']:>6} {item['seconds']:>10.3f} {rate:>10.1f} {item['speedup']:>7.2f}x"
+        )
+    return "\n".join(lines)
+
+
+def parse_jobs(value: str) -> List[int]:
+    try:
+        jobs = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected comma-separated integers") from None
+    if not jobs or min(jobs) < 1:
+        raise argparse.ArgumentTypeError("job counts must be positive")
+    return jobs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark parallel skill packaging.")
+    parser.add_argument("--size-mib", type=int, default=256)
+    parser.add_argument("--files", type=int, default=64)
+    parser.add_argument("--jobs", type=parse_jobs, default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+    if args.size_mib < 1 or args.files < 1 or args.repeat < 1:
+        parser.error("--size-mib, --files and --repeat must be positive")
+
+    report = run_benchmark(args.size_mib, args.files, args.jobs, args.repeat)
+    print(json.dumps(report, indent=2) if args.json else render_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
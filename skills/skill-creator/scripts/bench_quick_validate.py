@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark the frontmatter parsers quick_validate can use.
+
+Reads the frontmatter of every SKILL.md under a skills directory (default:
+this repository's skills/) and parses all of them with PyYAML's pure-Python
+SafeLoader, libyaml's CSafeLoader when PyYAML was built with it, and the
+yaml_subset fallback. Reports the best time per parser and how many
+documents each parser reads exactly as SafeLoader does.
+
+Usage:
+    python bench_quick_validate.py [--root DIR] [--repeat N] [--json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+import yaml_subset  # noqa: E402
+from quick_validate import find_nested_skills, read_frontmatter  # noqa: E402
+
+try:
+    import yaml
+except ModuleNotFoundError:
+    yaml = None
+
+DEFAULT_ROOT = SCRIPT_DIR.parents[1]
+
+
+def load_documents(root: Path) -> List[str]:
+    """Frontmatter text of every skill under `root` that has a well-formed block."""
+    documents = []
+    for skill in find_nested_skills(root):
+        text, _error = read_frontmatter(skill / "SKILL.md")
+        if text is not None:
+            documents.append(text)
+    return documents
+
+
+def available_parsers() -> Dict[str, Callable[[str], Any]]:
+    parsers: Dict[str, Callable[[str], Any]] = {}
+    if yaml is not None:
+        parsers["pyyaml"] = lambda text: yaml.load(text, Loader=yaml.SafeLoader)
+        if hasattr(yaml, "CSafeLoader"):
+            parsers["libyaml"] = lambda text: yaml.load(text, Loader=yaml.CSafeLoader)
+    parsers["subset"] = yaml_subset.load
+    return parsers
+
+
+def _parse_or_error(parse: Callable[[str], Any], text: str) -> Any:
+    try:
+        return parse(text)
+    except Exception as e:
+        return ("error", type(e).__name__)
+
+
+def time_parser(parse: Callable[[str], Any], documents: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in documents:
+            _parse_or_error(parse, text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_benchmark(root: Path, repeat: int) -> Dict[str, Any]:
+    documents = load_documents(root)
+    parsers = available_parsers()
+    reference = None
+    if "pyyaml" in parsers:
+        reference = [_parse_or_error(parsers["pyyaml"], text) for text in documents]
+    results = []
+    for name, parse in parsers.items():
+        seconds = time_parser(parse, documents, repeat)
+        item = {
+            "parser": name,
+            "seconds": seconds,
+            "usPerDocument": seconds / len(documents) * 1e6 if documents else 0.0,
+        }
+        if reference is not None:
+            parsed = [_parse_or_error(parse, text) for text in documents]
+            item["matchesSafeLoader"] = sum(a == b for a, b in zip(parsed, reference))
+        results.append(item)
+    baseline = results[0]["seconds"]
+    for item in results:
+        item["speedup"] = baseline / item["seconds"] if item["seconds"] else 0.0
+    return {"root": str(root), "documents": len(documents), "repeat": repeat, "results": results}
+
+
+def render_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"{report['documents']} frontmatter blocks from {report['root']}, best of {report['repeat']}",
+        f"{'parser':>8} {'seconds':>10} {'us/doc':>10} {'speedup':>8} {'matches':>8}",
+    ]
+    for item in report["results"]:
+        matches = item.get("matchesSafeLoader", "-")
+        lines.append(
+            f"{item['parser']:>8} {item['seconds']:>10.4f} {item['usPerDocument']:>10.1f} "
+            f"{item['speedup']:>7.2f}x {matches:>8}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SKILL.md frontmatter parsers.")
+    parser.add_argument("--root", type=Path, default=DEFAULT_ROOT, help="Skills directory")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be positive")
+
+    report = run_benchmark(args.root, args.repeat)
+    print(json.dumps(report, indent=2) if args.json else render_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Per-member compression policy for .skill archives.
+
+Media, archives and model weights are already compressed, so deflating them
+costs CPU for no size gain. The policy stores those members as-is, decided by
+file extension first and then by the byte entropy of the file's first block,
+and applies the configured method and level to everything else.
+"""
+
+import math
+import zipfile
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Optional, Tuple
+
+METHODS = {
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+    "store": zipfile.ZIP_STORED,
+}
+METHOD_NAMES = {value: key for key, value in METHODS.items()}
+
+INCOMPRESSIBLE_EXTENSIONS = frozenset(
+    (
+        # images
+        ".png .jpg .jpeg .gif .webp .avif .heic .ico "
+        # audio and video
+        ".mp3 .m4a .aac .ogg .opus .flac .mp4 .m4v .mov .webm .mkv "
+        # archives and packages
+        ".zip .skill .gz .tgz .bz2 .xz .zst .7z .rar .jar .whl "
+        # fonts and model weights
+        ".woff .woff2 .onnx .safetensors .gguf .pt .tflite"
+    ).split()
+)
+
+ENTROPY_SAMPLE_SIZE = 64 * 1024
+# Bits per byte; text and source sit around 4-6, compressed data near 8.
+ENTROPY_THRESHOLD = 7.5
+
+
+def byte_entropy(sample: bytes) -> float:
+    """Shannon entropy of `sample` in bits per byte (0.0 for empty input)."""
+    total = len(sample)
+    if not total:
+        return 0.0
+    return -sum(count / total * math.log2(count / total) for count in Counter(sample).values())
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    method: int = zipfile.ZIP_DEFLATED
+    level: Optional[int] = None
+    entropy_threshold: float = ENTROPY_THRESHOLD
+    sample_size: int = ENTROPY_SAMPLE_SIZE
+
+    def choose(self, arcname: str, sample: bytes) -> Tuple[int, Optional[int]]:
+        """Return (method, level) for a member given the start of its contents."""
+        if self.method == zipfile.ZIP_STORED:
+            return zipfile.ZIP_STORED, None
+        if PurePosixPath(arcname).suffix.lower() in INCOMPRESSIBLE_EXTENSIONS:
+            return zipfile.ZIP_STORED, None
+        if byte_entropy(sample[: self.sample_size]) >= self.entropy_threshold:
+            return zipfile.ZIP_STORED, None
+        return self.method, self.level
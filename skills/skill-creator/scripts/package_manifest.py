@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Sidecar files kept beside a .skill archive.
+
+The manifest records each packaged file's size, mtime and SHA-256 together
+with the compression policy and the archive's own size and mtime. When all of
+those still line up, the next package run can copy unchanged members' bytes
+straight out of the previous archive instead of compressing them again.
+
+The digest record of a reproducible build stores the SHA-256 of its inputs
+and of the archive, so an unchanged skill can be skipped without compressing.
+"""
+
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+MANIFEST_VERSION = 1
+
+
+def _read_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import: os.umask() can only be read by setting it, which would
+# race with files created by other threads while sidecars are written.
+_UMASK = _read_umask()
+
+
+@dataclass
+class FileRecord:
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+@dataclass
+class PackageManifest:
+    policy: Dict[str, Any]
+    files: Dict[str, FileRecord] = field(default_factory=dict)
+    archive_size: int = 0
+    archive_mtime_ns: int = 0
+
+
+def manifest_path_for(skill_filename: Path) -> Path:
+    return skill_filename.with_name(skill_filename.name + ".manifest.json")
+
+
+def digest_path_for(skill_filename: Path) -> Path:
+    return skill_filename.with_name(skill_filename.name + ".digest.json")
+
+
+def sidecar_paths(skill_filename: Path) -> Tuple[Path, ...]:
+    return manifest_path_for(skill_filename), digest_path_for(skill_filename)
+
+
+def load_manifest(
+    manifest_path: Path, skill_filename: Path, policy: Dict[str, Any]
+) -> Optional[PackageManifest]:
+    """
+    Return the previous manifest if it still describes `skill_filename`.
+
+    Returns None when the manifest is missing, unreadable, from another
+    version or policy, or when the archive changed since it was written.
+    """
+    try:
+        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+        archive_stat = skill_filename.stat()
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != MANIFEST_VERSION:
+        return None
+    if payload.get("policy") != policy:
+        return None
+    archive = payload.get("archive") or {}
+    if (
+        archive.get("size") != archive_stat.st_size
+        or archive.get("mtimeNs") != archive_stat.st_mtime_ns
+    ):
+        return None
+    try:
+        files = {
+            arcname: FileRecord(
+                size=int(record["size"]),
+                mtime_ns=int(record["mtimeNs"]),
+                sha256=str(record["sha256"]),
+            )
+            for arcname, record in payload.get("files", {}).items()
+        }
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+    return PackageManifest(
+        policy=policy,
+        files=files,
+        archive_size=archive_stat.st_size,
+        archive_mtime_ns=archive_stat.st_mtime_ns,
+    )
+
+
+def save_manifest(manifest_path: Path, skill_filename: Path, manifest: PackageManifest) -> None:
+    """Write the manifest atomically, stamped with the archive's current size and mtime."""
+    archive_stat = skill_filename.stat()
+    payload = {
+        "version": MANIFEST_VERSION,
+        "policy": manifest.policy,
+        "archive": {"size": archive_stat.st_size, "mtimeNs": archive_stat.st_mtime_ns},
+        "files": {
+            arcname: {"size": record.size, "mtimeNs": record.mtime_ns, "sha256": record.sha256}
+            for arcname, record in sorted(manifest.files.items())
+        },
+    }
+    _write_json(manifest_path, payload)
+
+
+def load_digest(digest_path: Path) -> Optional[Dict[str, str]]:
+    """Return {"inputs": ..., "sha256": ...} from a previous reproducible build."""
+    try:
+        payload = json.loads(digest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != MANIFEST_VERSION:
+        return None
+    if not isinstance(payload.get("inputs"), str) or not isinstance(payload.get("sha256"), str):
+        return None
+    return {"inputs": payload["inputs"], "sha256": payload["sha256"]}
+
+
+def save_digest(digest_path: Path, inputs: str, sha256: str) -> None:
+    _write_json(digest_path, {"version": MANIFEST_VERSION, "inputs": inputs, "sha256": sha256})
+
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    fd, temp_path = tempfile.mkstemp(prefix=".sidecar-", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+            handle.write("\n")
+        # mkstemp creates the file 0600; give the sidecar the mode open() would.
+        os.chmod(temp_path, 0o666 & ~_UMASK)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def policy_key(policy) -> Dict[str, Any]:
+    """JSON-comparable form of a CompressionPolicy."""
+    return asdict(policy)
@@ -3,18 +3,70 @@
 Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--jobs N]
+    python utils/package_skill.py --all <skills-directory> --out <output-directory> [--jobs N]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill ./dist --jobs 8
+    python utils/package_skill.py skills/public/my-skill --compression lzma --report
+    python utils/package_skill.py skills/public/my-skill ./dist --incremental
+    python utils/package_skill.py skills/public/my-skill ./dist --reproducible
+    python utils/package_skill.py --all skills/public --out ./dist --jobs 8
+    python utils/package_skill.py skills/public/my-skill --output - | sha256sum
+    python utils/package_skill.py skills/public/my-skill --max-file-size 50M --progress
 """
 
+import argparse
+import hashlib
+import json
+import os
+import queue
+import re
 import sys
+import threading
+import time
 import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
-from quick_validate import validate_skill
+from compression_policy import METHOD_NAMES, METHODS, CompressionPolicy
+from package_manifest import (
+    FileRecord,
+    PackageManifest,
+    digest_path_for,
+    load_digest,
+    load_manifest,
+    manifest_path_for,
+    policy_key,
+    save_digest,
+    save_manifest,
+    sidecar_paths,
+)
+from quick_validate import ValidationCache, validate_skill
+from skill_archive import (
+    DEFAULT_DATE_TIME,
+    ArchiveSource,
+    CompressedMember,
+    MemberInfo,
+    SkillArchiveWriter,
+    compress_member,
+    zip_date_time,
+)
+from skill_walk import IGNORE_FILENAME, IgnoreRules, walk_skill
+
+EXCLUDED_DIRS = {".git", ".svn", ".hg", "__pycache__", "node_modules"}
+# Files above this size are streamed through the writer instead of being
+# buffered whole in a worker, so memory stays bounded for large assets.
+STREAM_THRESHOLD = 64 * 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+STREAM_CHUNK_SIZE = 256 * 1024
+# Bumped whenever reproducible output would change for the same inputs.
+REPRODUCIBLE_FORMAT = 1
 
 
 def _is_within(path: Path, root: Path) -> bool:
@@ -25,42 +77,472 @@ def _is_within(path: Path, root: Path) -> bool:
         return False
 
 
-def package_skill(skill_path, output_dir=None):
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+class SkillFile(NamedTuple):
+    path: Path
+    arcname: str
+    stat: os.stat_result
+
+
+def collect_files(
+    skill_path: Path, skill_filename: Optional[Path], log=print
+) -> Optional[List[SkillFile]]:
+    """List the files to package, or None if a file escapes the skill root."""
+    outputs = {}
+    if skill_filename is not None:
+        outputs[skill_filename.resolve()] = "output archive"
+        outputs.update(
+            (sidecar.resolve(), "package sidecar") for sidecar in sidecar_paths(skill_filename)
+        )
+    ignore = IgnoreRules.from_file(skill_path / IGNORE_FILENAME)
+
+    def warn_symlink(path: Path) -> None:
+        log(f"[WARN] Skipping symlink: {path}")
+
+    files = []
+    for file_path, rel_path, stat in walk_skill(skill_path, EXCLUDED_DIRS, ignore, warn_symlink):
+        # walk_skill yields real paths, so this needs no per-file resolve().
+        if not _is_within(file_path, skill_path):
+            log(f"[ERROR] File escapes skill root: {file_path}")
+            return None
+        # If output lives under skill_path, avoid writing archive into itself.
+        if file_path in outputs:
+            log(f"[WARN] Skipping {outputs[file_path]}: {file_path}")
+            continue
+
+        # Calculate the relative path within the zip.
+        files.append(SkillFile(file_path, f"{skill_path.name}/{rel_path}", stat))
+    return files
+
+
+@dataclass
+class PreparedMember:
+    info: MemberInfo
+    size: int
+    level: Optional[int]
+    # None when the file is too large to buffer and the writer streams it instead.
+    member: Optional[CompressedMember] = None
+    seconds: float = 0.0
+    # Set in incremental mode: the manifest entry for this file, and whether its
+    # compressed bytes can be copied from the previous archive.
+    record: Optional[FileRecord] = None
+    reused: bool = False
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte count such as `512`, `64K`, `1.5M` or `2GiB` (binary units)."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?\s*", value, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"invalid size: {value!r}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " kmgt".index(unit.lower() or " "))
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size} B" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def _check_budgets(
+    files: List[SkillFile],
+    max_file_size: Optional[int],
+    max_total_size: Optional[int],
+    log=print,
+) -> bool:
+    """Check size budgets from the walk's stat data, before anything is compressed."""
+    largest = sorted(files, key=lambda item: item.stat.st_size, reverse=True)
+    if max_file_size is not None:
+        oversized = [item for item in largest if item.stat.st_size > max_file_size]
+        if oversized:
+            for item in oversized[:10]:
+                log(f"   {item.arcname} ({format_size(item.stat.st_size)})")
+            if len(oversized) > 10:
+                log(f"   ... and {len(oversized) - 10} more")
+            log(
+                f"[ERROR] {len(oversized)} file(s) exceed the per-file limit of "
+                f"{format_size(max_file_size)}"
+            )
+            return False
+    total = sum(item.stat.st_size for item in files)
+    if max_total_size is not None and total > max_total_size:
+        for item in largest[:5]:
+            log(f"   {item.arcname} ({format_size(item.stat.st_size)})")
+        log(
+            f"[ERROR] Skill files total {format_size(total)}, over the limit of "
+            f"{format_size(max_total_size)}"
+        )
+        return False
+    return True
+
+
+def hash_file(file_path: Path, buffer_size: int = READ_CHUNK_SIZE) -> str:
+    """Hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    for chunk in read_chunks(file_path, buffer_size):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _prepare_member(
+    skill_file: SkillFile,
+    policy: CompressionPolicy,
+    track: bool = False,
+    previous: Optional[FileRecord] = None,
+    buffer_size: int = READ_CHUNK_SIZE,
+) -> PreparedMember:
     """
-    Package a skill folder into a .skill file.
+    Pick a method and compress a file in a worker; large files are left to stream.
 
-    Args:
-        skill_path: Path to the skill folder
-        output_dir: Optional output directory for the .skill file (defaults to current directory)
+    With `track`, the file is also hashed for the manifest. A file matching
+    `previous` by size and mtime, or failing that by content hash, is marked
+    for reuse and not compressed at all.
+    """
+    started = time.perf_counter()
+    file_path, arcname, stat = skill_file
+    info = MemberInfo(
+        arcname=arcname,
+        date_time=zip_date_time(stat.st_mtime),
+        mode=stat.st_mode,
+    )
 
-    Returns:
-        Path to the created .skill file, or None if error
+    def reuse(record: FileRecord) -> PreparedMember:
+        seconds = time.perf_counter() - started
+        return PreparedMember(info, record.size, None, seconds=seconds, record=record, reused=True)
+
+    if (
+        track
+        and previous is not None
+        and previous.size == stat.st_size
+        and previous.mtime_ns == stat.st_mtime_ns
+    ):
+        return reuse(previous)
+
+    if stat.st_size > STREAM_THRESHOLD:
+        record = None
+        if track:
+            digest = hash_file(file_path, buffer_size)
+            record = FileRecord(stat.st_size, stat.st_mtime_ns, digest)
+            if previous is not None and previous.sha256 == record.sha256:
+                return reuse(record)
+        with open(file_path, "rb") as handle:
+            info.method, level = policy.choose(arcname, handle.read(policy.sample_size))
+        seconds = time.perf_counter() - started
+        return PreparedMember(info, stat.st_size, level, seconds=seconds, record=record)
+
+    data = file_path.read_bytes()
+    record = None
+    if track:
+        record = FileRecord(len(data), stat.st_mtime_ns, hashlib.sha256(data).hexdigest())
+        if previous is not None and previous.sha256 == record.sha256:
+            return reuse(record)
+    info.method, level = policy.choose(arcname, data)
+    member = compress_member(info, data, level)
+    seconds = time.perf_counter() - started
+    return PreparedMember(info, len(data), level, member, seconds, record)
+
+
+def iter_prepared(
+    files: List[SkillFile],
+    jobs: int,
+    policy: CompressionPolicy,
+    previous: Optional[Dict[str, FileRecord]] = None,
+    buffer_size: int = READ_CHUNK_SIZE,
+) -> Iterator[PreparedMember]:
     """
+    Yield prepared members in input order, compressing up to `jobs` at a time.
+
+    `previous` maps arcnames to reusable manifest entries; passing it (even
+    empty) turns on hashing for a new manifest.
+    """
+    track = previous is not None
+    previous = previous or {}
+    if jobs <= 1:
+        for skill_file in files:
+            record = previous.get(skill_file.arcname)
+            yield _prepare_member(skill_file, policy, track, record, buffer_size)
+        return
+    # zlib releases the GIL while deflating, so threads scale across cores. The
+    # window of in-flight futures caps how many compressed buffers sit in memory.
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for skill_file in files:
+            record = previous.get(skill_file.arcname)
+            pending.append(
+                pool.submit(_prepare_member, skill_file, policy, track, record, buffer_size)
+            )
+            if len(pending) >= jobs * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def read_chunks(file_path: Path, buffer_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    with open(file_path, "rb") as handle:
+        while True:
+            chunk = handle.read(buffer_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def format_report(members: List[PreparedMember]) -> str:
+    """Per-file method, size, compression ratio and time, plus a total row."""
+    width = max([len(item.info.arcname) for item in members] + [5])
+    lines = [f"{'File':<{width}}  {'Method':<7} {'Size':>12} {'Packed':>12} {'Ratio':>6} {'ms':>8}"]
+
+    def row(name, method, size, packed, seconds):
+        ratio = packed / size if size else 1.0
+        return (
+            f"{name:<{width}}  {method:<7} {size:>12,} {packed:>12,} "
+            f"{ratio:>6.1%} {seconds * 1000:>8.1f}"
+        )
+
+    for item in members:
+        info = item.info
+        method = METHOD_NAMES.get(info.method, str(info.method))
+        lines.append(row(info.arcname, method, info.file_size, info.compress_size, item.seconds))
+    lines.append(
+        row(
+            "Total",
+            "",
+            sum(item.info.file_size for item in members),
+            sum(item.info.compress_size for item in members),
+            sum(item.seconds for item in members),
+        )
+    )
+    return "\n".join(lines)
+
+
+def reproducible_date_time() -> Tuple[int, int, int, int, int, int]:
+    """Timestamp for every member of a reproducible archive (honours SOURCE_DATE_EPOCH)."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch is None:
+        return DEFAULT_DATE_TIME
+    return zip_date_time(int(epoch), utc=True)
+
+
+def reproducible_mode(mode: int) -> int:
+    """Collapse permissions to 0644, or 0755 when any execute bit is set."""
+    return 0o100755 if mode & 0o111 else 0o100644
+
+
+def inputs_digest(
+    files: List[SkillFile], policy: CompressionPolicy, date_time: Tuple[int, ...]
+) -> str:
+    """SHA-256 over everything that determines a reproducible archive's bytes."""
+    digest = hashlib.sha256()
+    settings = {
+        "format": REPRODUCIBLE_FORMAT,
+        "policy": policy_key(policy),
+        "dateTime": list(date_time),
+    }
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    for file_path, arcname, stat in files:
+        mode = reproducible_mode(stat.st_mode)
+        digest.update(f"\0{arcname}\0{mode:o}\0".encode())
+        digest.update(bytes.fromhex(hash_file(file_path)))
+    return digest.hexdigest()
+
+
+def _file_sha256(path: Path) -> Optional[str]:
+    try:
+        return hash_file(path)
+    except OSError:
+        return None
+
+
+class _HashingWriter:
+    """File wrapper that hashes everything written through it."""
+
+    def __init__(self, handle) -> None:
+        self._handle = handle
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        return self._handle.write(data)
+
+
+class ByteProgress:
+    """Counts source bytes written and reports (done, total) to a callback."""
+
+    def __init__(self, total: int, callback: Optional[Callable[[int, int], None]]) -> None:
+        self.total = total
+        self.done = 0
+        self._callback = callback
+
+    def advance(self, count: int) -> None:
+        self.done += count
+        if self._callback is not None:
+            self._callback(self.done, self.total)
+
+    def track(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+            self.advance(len(chunk))
+
+
+def write_prepared(
+    writer: SkillArchiveWriter,
+    file_path: Path,
+    prepared: PreparedMember,
+    source: Optional[ArchiveSource],
+    progress: ByteProgress,
+    buffer_size: int = READ_CHUNK_SIZE,
+) -> None:
+    """Write one member: copied from the previous archive, pre-compressed, or streamed."""
+    started = time.perf_counter()
+    if prepared.reused:
+        raw = source.member_info(prepared.info.arcname)
+        prepared.info.method = raw.method
+        prepared.info.crc = raw.crc
+        prepared.info.file_size = raw.file_size
+        prepared.info.compress_size = raw.compress_size
+        writer.add_raw(prepared.info, source.iter_raw(prepared.info.arcname, buffer_size))
+        progress.advance(prepared.info.file_size)
+    elif prepared.member is not None:
+        writer.add(prepared.member)
+        progress.advance(prepared.info.file_size)
+        return
+    else:
+        chunks = progress.track(read_chunks(file_path, buffer_size))
+        writer.add_stream(prepared.info, chunks, prepared.size, prepared.level)
+    prepared.seconds += time.perf_counter() - started
+
+
+def _write_archive(
+    handle,
+    files: List[SkillFile],
+    jobs: int,
+    policy: CompressionPolicy,
+    log=print,
+    previous: Optional[Dict[str, FileRecord]] = None,
+    source: Optional[ArchiveSource] = None,
+    date_time: Optional[Tuple[int, int, int, int, int, int]] = None,
+    buffer_size: int = READ_CHUNK_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[PreparedMember]:
+    """
+    Write `files` as a zip archive to `handle`, which only needs write().
+
+    `date_time`, when given, replaces every member's timestamp and normalizes
+    its permissions for reproducible output. `progress` is called with
+    (bytes done, total bytes) of source data as members are written.
+    """
+    written = []
+    tracker = ByteProgress(sum(item.stat.st_size for item in files), progress)
+    with SkillArchiveWriter(handle) as writer:
+        prepared_members = iter_prepared(files, jobs, policy, previous, buffer_size)
+        for (file_path, arcname, _stat), prepared in zip(files, prepared_members):
+            if date_time is not None:
+                prepared.info.date_time = date_time
+                prepared.info.mode = reproducible_mode(prepared.info.mode)
+            write_prepared(writer, file_path, prepared, source, tracker, buffer_size)
+            written.append(prepared)
+            log(f"  {'Reused' if prepared.reused else 'Added'}: {arcname}")
+    return written
+
+
+def _open_previous(
+    skill_filename: Path, manifest_path: Path, policy: CompressionPolicy
+) -> Tuple[Dict[str, FileRecord], Optional[ArchiveSource]]:
+    """Manifest entries whose members can be copied from the existing archive."""
+    manifest = load_manifest(manifest_path, skill_filename, policy_key(policy))
+    if manifest is None:
+        return {}, None
+    try:
+        source = ArchiveSource(skill_filename)
+    except (OSError, zipfile.BadZipFile):
+        return {}, None
+    records = {name: record for name, record in manifest.files.items() if name in source}
+    return records, source
+
+
+def _check_skill(
+    skill_path, validate=True, log=print, cache: Optional[ValidationCache] = None
+) -> Optional[Path]:
+    """Resolve `skill_path` and check it is a valid skill folder; None if not."""
     skill_path = Path(skill_path).resolve()
 
     # Validate skill folder exists
     if not skill_path.exists():
-        print(f"[ERROR] Skill folder not found: {skill_path}")
+        log(f"[ERROR] Skill folder not found: {skill_path}")
         return None
 
     if not skill_path.is_dir():
-        print(f"[ERROR] Path is not a directory: {skill_path}")
+        log(f"[ERROR] Path is not a directory: {skill_path}")
         return None
 
     # Validate SKILL.md exists
     skill_md = skill_path / "SKILL.md"
     if not skill_md.exists():
-        print(f"[ERROR] SKILL.md not found in {skill_path}")
+        log(f"[ERROR] SKILL.md not found in {skill_path}")
         return None
 
     # Run validation before packaging
-    print("Validating skill...")
-    valid, message = validate_skill(skill_path)
-    if not valid:
-        print(f"[ERROR] Validation failed: {message}")
-        print("   Please fix the validation errors before packaging.")
+    if validate:
+        log("Validating skill...")
+        valid, message = validate_skill(skill_path, cache)
+        if not valid:
+            log(f"[ERROR] Validation failed: {message}")
+            log("   Please fix the validation errors before packaging.")
+            return None
+        log(f"[OK] {message}\n")
+
+    return skill_path
+
+
+def package_skill(
+    skill_path,
+    output_dir=None,
+    jobs=None,
+    policy=None,
+    report=False,
+    incremental=False,
+    reproducible=False,
+    validate=True,
+    log=print,
+    max_file_size=None,
+    max_total_size=None,
+    buffer_size=READ_CHUNK_SIZE,
+    progress=None,
+    validation_cache=None,
+):
+    """
+    Package a skill folder into a .skill file.
+
+    Args:
+        skill_path: Path to the skill folder
+        output_dir: Optional output directory for the .skill file (defaults to current directory)
+        jobs: Number of files to compress in parallel (defaults to the CPU count)
+        policy: CompressionPolicy choosing each member's method (defaults to deflate,
+            storing already-compressed files)
+        report: Print per-file compression ratio and time after packaging
+        incremental: Keep a manifest beside the archive and copy unchanged members
+            from the previous archive instead of recompressing them
+        reproducible: Sort members and normalize timestamps and permissions so identical
+            inputs give byte-identical archives; skip the build when the inputs
+            digest matches the previous reproducible build
+        validate: Run quick_validate first (batch mode validates up front instead)
+        log: Called with each progress or error message (defaults to print)
+        max_file_size: Fail before compressing if any file is larger than this many bytes
+        max_total_size: Fail before compressing if all files together are larger
+        buffer_size: Read size for streaming, hashing and copying large files
+        progress: Called with (bytes done, total bytes) as members are written
+        validation_cache: ValidationCache that lets an unchanged SKILL.md skip validation
+
+    Returns:
+        Path to the created .skill file, or None if error
+    """
+    skill_path = _check_skill(skill_path, validate, log, validation_cache)
+    if skill_path is None:
         return None
-    print(f"[OK] {message}\n")
 
     # Determine output location
     skill_name = skill_path.name
@@ -72,62 +554,625 @@ def package_skill(skill_path, output_dir=None):
 
     skill_filename = output_path / f"{skill_name}.skill"
 
-    EXCLUDED_DIRS = {".git", ".svn", ".hg", "__pycache__", "node_modules"}
+    jobs = jobs or default_jobs()
+    policy = policy or CompressionPolicy()
+
+    manifest_path = manifest_path_for(skill_filename)
+    # Build next to the destination and rename into place, so the previous
+    # archive stays readable for incremental reuse and is never left half-written.
+    temp_filename = skill_filename.with_name(f".{skill_filename.name}.{os.getpid()}.tmp")
+    source = None
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, "w", zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob("*"):
-                # Security: never follow or package symlinks.
-                if file_path.is_symlink():
-                    print(f"[WARN] Skipping symlink: {file_path}")
-                    continue
-
-                rel_parts = file_path.relative_to(skill_path).parts
-                if any(part in EXCLUDED_DIRS for part in rel_parts):
-                    continue
-
-                if file_path.is_file():
-                    resolved_file = file_path.resolve()
-                    if not _is_within(resolved_file, skill_path):
-                        print(f"[ERROR] File escapes skill root: {file_path}")
-                        return None
-                    # If output lives under skill_path, avoid writing archive into itself.
-                    if resolved_file == skill_filename.resolve():
-                        print(f"[WARN] Skipping output archive: {file_path}")
-                        continue
-
-                    # Calculate the relative path within the zip.
-                    arcname = Path(skill_name) / file_path.relative_to(skill_path)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
-
-        print(f"\n[OK] Successfully packaged skill to: {skill_filename}")
+        files = collect_files(skill_path, skill_filename, log)
+        if files is None or not _check_budgets(files, max_file_size, max_total_size, log):
+            return None
+
+        if reproducible:
+            files.sort(key=lambda item: item.arcname)
+            date_time = reproducible_date_time()
+            digest_path = digest_path_for(skill_filename)
+            digest = inputs_digest(files, policy, date_time)
+            recorded = load_digest(digest_path)
+            if (
+                recorded is not None
+                and recorded["inputs"] == digest
+                and _file_sha256(skill_filename) == recorded["sha256"]
+            ):
+                log(f"[OK] Inputs unchanged, keeping: {skill_filename}")
+                log(f"   SHA-256: {recorded['sha256']}")
+                return skill_filename
+
+        previous = None
+        if incremental:
+            previous, source = _open_previous(skill_filename, manifest_path, policy)
+
+        with open(temp_filename, "wb") as handle:
+            hashing = _HashingWriter(handle)
+            written = _write_archive(
+                hashing,
+                files,
+                jobs,
+                policy,
+                log,
+                previous=previous,
+                source=source,
+                date_time=date_time if reproducible else None,
+                buffer_size=buffer_size,
+                progress=progress,
+            )
+
+        if source is not None:
+            source.close()
+            source = None
+        os.replace(temp_filename, skill_filename)
+        if reproducible:
+            save_digest(digest_path, digest, hashing.sha256.hexdigest())
+        if incremental:
+            records = {item.info.arcname: item.record for item in written}
+            save_manifest(
+                manifest_path, skill_filename, PackageManifest(policy_key(policy), records)
+            )
+            reused = sum(item.reused for item in written)
+            log(f"\n[OK] Reused {reused} of {len(written)} members from the previous archive")
+
+        if report:
+            log()
+            log(format_report(written))
+        log(f"\n[OK] Successfully packaged skill to: {skill_filename}")
+        if reproducible:
+            log(f"   SHA-256: {hashing.sha256.hexdigest()}")
         return skill_filename
 
     except Exception as e:
-        print(f"[ERROR] Error creating .skill file: {e}")
+        log(f"[ERROR] Error creating .skill file: {e}")
         return None
 
+    finally:
+        if source is not None:
+            source.close()
+        temp_filename.unlink(missing_ok=True)
+
+
+def stream_skill(
+    skill_path,
+    stream,
+    jobs=None,
+    policy=None,
+    report=False,
+    reproducible=False,
+    validate=True,
+    log=print,
+    output_file=None,
+    max_file_size=None,
+    max_total_size=None,
+    buffer_size=READ_CHUNK_SIZE,
+    progress=None,
+    validation_cache=None,
+):
+    """
+    Package a skill folder as a .skill archive written to a binary stream.
+
+    The stream only needs write(): every member carries a data descriptor, so
+    pipes, sockets and stdout work. Incremental reuse and skipping unchanged
+    reproducible builds need an archive on disk and are not available here.
+
+    Args:
+        skill_path: Path to the skill folder
+        stream: Writable binary file object
+        output_file: Path the stream writes to, if any, so it is not packaged into itself
+        jobs, policy, report, reproducible, validate, log, max_file_size,
+        max_total_size, buffer_size, progress, validation_cache: As for package_skill
+
+    Returns:
+        True on success, False if error
+    """
+    skill_path = _check_skill(skill_path, validate, log, validation_cache)
+    if skill_path is None:
+        return False
+    jobs = jobs or default_jobs()
+    policy = policy or CompressionPolicy()
+    try:
+        files = collect_files(skill_path, Path(output_file) if output_file else None, log)
+        if files is None or not _check_budgets(files, max_file_size, max_total_size, log):
+            return False
+        date_time = None
+        if reproducible:
+            files.sort(key=lambda item: item.arcname)
+            date_time = reproducible_date_time()
+        hashing = _HashingWriter(stream)
+        written = _write_archive(
+            hashing,
+            files,
+            jobs,
+            policy,
+            log,
+            date_time=date_time,
+            buffer_size=buffer_size,
+            progress=progress,
+        )
+        stream.flush()
+    except _StreamCancelled:
+        return False
+    except Exception as e:
+        log(f"[ERROR] Error creating .skill file: {e}")
+        return False
+
+    if report:
+        log()
+        log(format_report(written))
+    log(f"\n[OK] Successfully streamed skill archive ({len(written)} files)")
+    if reproducible:
+        log(f"   SHA-256: {hashing.sha256.hexdigest()}")
+    return True
+
+
+class _StreamCancelled(Exception):
+    pass
+
+
+class _ChunkQueue:
+    """Writable sink handing fixed-size chunks to a consumer through a bounded queue."""
+
+    _DONE = object()
+
+    def __init__(self, chunk_size: int, max_pending: int) -> None:
+        self._chunk_size = chunk_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._buffer = bytearray()
+        self._cancelled = threading.Event()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self._chunk_size:
+            self._put(bytes(self._buffer[: self._chunk_size]))
+            del self._buffer[: self._chunk_size]
+        return len(data)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def finish(self, error: Optional[str]) -> None:
+        try:
+            self._put((self._DONE, error))
+        except _StreamCancelled:
+            pass
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def _put(self, item) -> None:
+        # Blocks while the consumer is behind, which bounds memory to max_pending chunks.
+        while True:
+            if self._cancelled.is_set():
+                raise _StreamCancelled()
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def get(self):
+        return self._queue.get()
+
+
+def iter_skill_archive(
+    skill_path,
+    jobs=None,
+    policy=None,
+    reproducible=False,
+    validate=True,
+    chunk_size=STREAM_CHUNK_SIZE,
+    max_pending_chunks=8,
+) -> Iterator[bytes]:
+    """
+    Yield a skill's .skill archive as byte chunks of `chunk_size`.
+
+    Packaging runs in a background thread and stalls once `max_pending_chunks`
+    chunks are waiting, so memory stays bounded however slowly the chunks are
+    consumed. Closing the iterator early stops packaging.
+
+    Raises:
+        RuntimeError: if the skill is invalid or packaging fails
+    """
+    sink = _ChunkQueue(chunk_size, max_pending_chunks)
+    errors: List[str] = []
+
+    def log(*parts):
+        line = " ".join(str(part) for part in parts)
+        if line.startswith("[ERROR]"):
+            errors.append(line.removeprefix("[ERROR] "))
+
+    def produce():
+        ok = stream_skill(
+            skill_path,
+            sink,
+            jobs=jobs,
+            policy=policy,
+            reproducible=reproducible,
+            validate=validate,
+            log=log,
+        )
+        sink.finish(None if ok else (errors[-1] if errors else "packaging failed"))
+
+    producer = threading.Thread(target=produce, name="skill-archive-producer", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = sink.get()
+            if isinstance(item, tuple) and item[0] is _ChunkQueue._DONE:
+                if item[1] is not None:
+                    raise RuntimeError(item[1])
+                return
+            yield item
+    finally:
+        sink.cancel()
+        producer.join()
+
+
+@dataclass
+class BatchResult:
+    name: str
+    status: str  # "ok", "invalid" or "failed"
+    seconds: float = 0.0
+    archive: Optional[Path] = None
+    size: int = 0
+    message: str = ""
+
+
+def discover_skills(skills_root) -> List[Path]:
+    """
+    Immediate subdirectories of `skills_root` that contain a SKILL.md.
+
+    Archives are written flat as `<folder name>.skill`, so nested skills are
+    not picked up; quick_validate.find_nested_skills searches deeper.
+    """
+    return sorted(
+        child
+        for child in Path(skills_root).resolve().iterdir()
+        if child.is_dir()
+        and not child.is_symlink()
+        and not child.name.startswith(".")
+        and child.name not in EXCLUDED_DIRS
+        and (child / "SKILL.md").is_file()
+    )
+
+
+def package_all(
+    skills_root,
+    output_dir,
+    jobs=None,
+    policy=None,
+    incremental=False,
+    reproducible=False,
+    max_file_size=None,
+    max_total_size=None,
+    buffer_size=READ_CHUNK_SIZE,
+    validation_cache=None,
+) -> List[BatchResult]:
+    """
+    Validate and package every skill under `skills_root` into `output_dir`.
+
+    Validation runs for all skills in parallel first; valid skills are then
+    packaged concurrently, sharing `jobs` workers between them.
+    """
+    jobs = jobs or default_jobs()
+    skills = discover_skills(skills_root)
+    results: Dict[Path, BatchResult] = {}
+
+    def check(skill: Path):
+        # One unreadable skill must not abort the batch.
+        try:
+            return validate_skill(skill, validation_cache)
+        except Exception as e:
+            return False, f"Validation failed: {e}"
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        to_package = []
+        verdicts = pool.map(check, skills)
+        for skill, (valid, message) in zip(skills, verdicts):
+            if valid:
+                to_package.append(skill)
+            else:
+                results[skill] = BatchResult(skill.name, "invalid", message=message)
+
+        # Spread spare workers over each skill's members when there are fewer
+        # skills than jobs; otherwise each skill compresses serially.
+        member_jobs = max(1, jobs // max(1, len(to_package)))
+
+        def build(skill: Path) -> BatchResult:
+            lines: List[str] = []
+
+            def log(*parts):
+                lines.append(" ".join(str(part) for part in parts))
+
+            started = time.perf_counter()
+            try:
+                archive = package_skill(
+                    skill,
+                    output_dir,
+                    jobs=member_jobs,
+                    policy=policy,
+                    incremental=incremental,
+                    reproducible=reproducible,
+                    validate=False,
+                    log=log,
+                    max_file_size=max_file_size,
+                    max_total_size=max_total_size,
+                    buffer_size=buffer_size,
+                )
+            except Exception as e:
+                seconds = time.perf_counter() - started
+                return BatchResult(
+                    skill.name, "failed", seconds, message=str(e) or type(e).__name__
+                )
+            seconds = time.perf_counter() - started
+            if archive is None:
+                errors = [line for line in lines if line.startswith("[ERROR]")]
+                message = errors[-1].removeprefix("[ERROR] ") if errors else "packaging failed"
+                return BatchResult(skill.name, "failed", seconds, message=message)
+            return BatchResult(skill.name, "ok", seconds, archive, archive.stat().st_size)
+
+        for skill, result in zip(to_package, pool.map(build, to_package)):
+            results[skill] = result
+
+    return [results[skill] for skill in skills]
+
+
+def format_summary(results: List[BatchResult], elapsed: float) -> str:
+    """Table of per-skill status, duration and archive size, plus a totals line."""
+    width = max([len(result.name) for result in results] + [5])
+    lines = [f"{'Skill':<{width}}  {'Status':<8} {'Seconds':>8} {'Size':>12}  Details"]
+    for result in results:
+        size = f"{result.size:,}" if result.archive else "-"
+        lines.append(
+            f"{result.name:<{width}}  {result.status:<8} {result.seconds:>8.2f} {size:>12}  "
+            f"{result.message}".rstrip()
+        )
+    counts = {
+        status: sum(r.status == status for r in results) for status in ("ok", "invalid", "failed")
+    }
+    lines.append(
+        f"\n{counts['ok']} packaged, {counts['invalid']} invalid, {counts['failed']} failed "
+        f"in {elapsed:.2f}s"
+    )
+    return "\n".join(lines)
+
+
+class ProgressPrinter:
+    """Progress callback that redraws one stderr line, at most once per percent."""
+
+    def __init__(self, stream=None) -> None:
+        self._stream = stream or sys.stderr
+        self._last = -1
+
+    def __call__(self, done: int, total: int) -> None:
+        percent = 100 if total == 0 else done * 100 // total
+        if percent == self._last:
+            return
+        self._last = percent
+        end = "\n" if done >= total else ""
+        print(
+            f"\r   {format_size(done)} / {format_size(total)} ({percent}%)",
+            end=end,
+            file=self._stream,
+            flush=True,
+        )
+
+
+def _size_arg(value: str) -> int:
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def add_compression_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--compression",
+        choices=sorted(METHODS),
+        default="deflate",
+        help="Method for compressible files; media and archives are always stored "
+        "(default: deflate)",
+    )
+    parser.add_argument(
+        "--level",
+        type=int,
+        help="Compression level: 0-9 for deflate, 1-9 for bzip2 (default: library default)",
+    )
+
+
+def policy_from_args(parser: argparse.ArgumentParser, args) -> CompressionPolicy:
+    """Check --compression/--level and build the policy they describe."""
+    if args.level is not None:
+        if args.compression == "deflate" and not 0 <= args.level <= 9:
+            parser.error("--level must be between 0 and 9 for deflate")
+        elif args.compression == "bzip2" and not 1 <= args.level <= 9:
+            parser.error("--level must be between 1 and 9 for bzip2")
+        elif args.compression in ("lzma", "store"):
+            parser.error(f"--level is not supported with --compression {args.compression}")
+    return CompressionPolicy(method=METHODS[args.compression], level=args.level)
+
+
+def stream_to_output(args, policy, validation_cache=None) -> bool:
+    """Handle --output: stream the archive to stdout or a file, logging to stderr."""
+
+    def log(*parts):
+        print(*parts, file=sys.stderr)
+
+    log(f"Packaging skill: {args.skill_path}")
+    options = dict(
+        jobs=args.jobs,
+        policy=policy,
+        report=args.report,
+        reproducible=args.reproducible,
+        log=log,
+        max_file_size=args.max_file_size,
+        max_total_size=args.max_total_size,
+        buffer_size=args.buffer_size,
+        progress=ProgressPrinter() if args.progress else None,
+        validation_cache=validation_cache,
+    )
+    if args.output == "-":
+        ok = stream_skill(args.skill_path, sys.stdout.buffer, **options)
+        if not ok:
+            # The reader may have closed the pipe; keep the interpreter from failing
+            # again while flushing stdout at exit.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return ok
+    output_file = Path(args.output).resolve()
+    with open(output_file, "wb") as handle:
+        ok = stream_skill(args.skill_path, handle, output_file=output_file, **options)
+    if not ok:
+        output_file.unlink(missing_ok=True)
+    return ok
+
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Package a skill folder into a distributable .skill file.",
+    )
+    parser.add_argument("skill_path", nargs="?", help="Path to the skill folder")
+    parser.add_argument("output_dir", nargs="?", help="Output directory (default: cwd)")
+    parser.add_argument(
+        "--all",
+        metavar="SKILLS_DIR",
+        help="Package every skill folder directly under SKILLS_DIR",
+    )
+    parser.add_argument("--out", metavar="DIR", help="Output directory (default: cwd)")
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Write the archive to FILE, or to stdout with '-' (progress goes to stderr)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=default_jobs(),
+        help="Files to compress in parallel (default: CPU count)",
+    )
+    add_compression_arguments(parser)
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Print per-file method, compression ratio and time",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep a manifest beside the archive and only recompress changed files",
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Build byte-identical archives from identical inputs and print their SHA-256; "
+        "skip skills whose inputs are unchanged",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=_size_arg,
+        metavar="SIZE",
+        help="Fail before compressing if any file is larger than SIZE (e.g. 50M, 2G)",
+    )
+    parser.add_argument(
+        "--max-total-size",
+        type=_size_arg,
+        metavar="SIZE",
+        help="Fail before compressing if the skill's files add up to more than SIZE",
+    )
+    parser.add_argument(
+        "--buffer-size",
+        type=_size_arg,
+        default=READ_CHUNK_SIZE,
+        metavar="SIZE",
+        help="Read size for streaming and copying large files (default: 1M)",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show bytes packaged so far on stderr",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Validate SKILL.md afresh instead of reusing cached validation results",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    policy = policy_from_args(parser, args)
+    if args.all and args.skill_path:
+        parser.error("--all takes no skill path; use --out for the output directory")
+    if not args.all and not args.skill_path:
+        parser.error("a skill path or --all SKILLS_DIR is required")
+    if args.out and args.output_dir:
+        parser.error("give the output directory either positionally or with --out")
+    if args.all and args.report:
+        parser.error("--report applies to a single skill")
+    if args.all and args.progress:
+        parser.error("--progress applies to a single skill")
+    if args.buffer_size < 1:
+        parser.error("--buffer-size must be at least 1 byte")
+    if args.output and (args.all or args.out or args.output_dir):
+        parser.error(
+            "--output names the archive itself; it cannot be combined with --all, "
+            "--out or an output directory"
+        )
+    if args.output and args.incremental:
+        parser.error("--incremental needs an output directory, not --output")
+    output_dir = args.out or args.output_dir
+    cache = None if args.no_cache else ValidationCache()
+
+    if args.all:
+        print(f"Packaging all skills in: {args.all}")
+        started = time.perf_counter()
+        results = package_all(
+            args.all,
+            output_dir,
+            jobs=args.jobs,
+            policy=policy,
+            incremental=args.incremental,
+            reproducible=args.reproducible,
+            max_file_size=args.max_file_size,
+            max_total_size=args.max_total_size,
+            buffer_size=args.buffer_size,
+            validation_cache=cache,
+        )
+        if cache is not None:
+            cache.save()
+        print(format_summary(results, time.perf_counter() - started))
+        sys.exit(0 if all(result.status == "ok" for result in results) else 1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    if args.output:
+        ok = stream_to_output(args, policy, cache)
+        if cache is not None:
+            cache.save()
+        sys.exit(0 if ok else 1)
 
-    print(f"Packaging skill: {skill_path}")
+    print(f"Packaging skill: {args.skill_path}")
     if output_dir:
         print(f"   Output directory: {output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(
+        args.skill_path,
+        output_dir,
+        jobs=args.jobs,
+        policy=policy,
+        report=args.report,
+        incremental=args.incremental,
+        reproducible=args.reproducible,
+        max_file_size=args.max_file_size,
+        max_total_size=args.max_total_size,
+        buffer_size=args.buffer_size,
+        progress=ProgressPrinter() if args.progress else None,
+        validation_cache=cache,
+    )
+    if cache is not None:
+        cache.save()
 
     if result:
         sys.exit(0)
@@ -1,12 +1,29 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    python quick_validate.py <skill_directory>
+    python quick_validate.py --all <skills-directory> [--jobs N] [--format json]
+    python quick_validate.py <skill_directory> --no-cache
 """
 
+import argparse
+import hashlib
+import io
+import json
+import os
 import re
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+import yaml_subset
 
 try:
     import yaml
@@ -14,146 +31,492 @@ except ModuleNotFoundError:
     yaml = None
 
 MAX_SKILL_NAME_LENGTH = 64
+MAX_DESCRIPTION_LENGTH = 1024
+# Frontmatter is a handful of short keys; anything longer is almost surely a missing fence.
+MAX_FRONTMATTER_CHARS = 64 * 1024
+ALLOWED_PROPERTIES = frozenset({"name", "description", "license", "allowed-tools", "metadata"})
+SKIPPED_DIRS = {"__pycache__", "node_modules"}
+# Bump when validation rules change in a way the source digest below cannot see.
+VALIDATOR_VERSION = 1
+CACHE_VERSION = 2
 
 
-def _extract_frontmatter(content: str) -> Optional[str]:
-    lines = content.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return None
-    for i in range(1, len(lines)):
-        if lines[i].strip() == "---":
-            return "\n".join(lines[1:i])
-    return None
+def frontmatter_from_stream(
+    handle: TextIO, max_chars: Optional[int] = MAX_FRONTMATTER_CHARS
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read the frontmatter block from a text stream, stopping at the closing `---`.
+
+    Nothing after the closing fence is read, and at most `max_chars` characters
+    of frontmatter are (None for no limit), so the cost does not depend on the
+    size of the document body. Returns (frontmatter text, None) or (None, error).
+    """
+    limit = -1 if max_chars is None else max_chars + 1
+    if handle.readline(limit).strip() != "---":
+        return None, "Invalid frontmatter format"
+    lines = []
+    size = 0
+    while True:
+        line = handle.readline(limit)
+        if not line:
+            return None, "Invalid frontmatter format"
+        if line.strip() == "---":
+            return "\n".join(lines), None
+        size += len(line)
+        if max_chars is not None and size > max_chars:
+            return None, f"Frontmatter is longer than {max_chars} characters"
+        lines.append(line.rstrip("\r\n"))
 
 
-def _parse_simple_frontmatter(frontmatter_text: str) -> Optional[dict[str, str]]:
+def read_frontmatter(
+    skill_md, max_chars: Optional[int] = MAX_FRONTMATTER_CHARS
+) -> Tuple[Optional[str], Optional[str]]:
     """
-    Minimal fallback parser used when PyYAML is unavailable.
-    Supports simple `key: value` mappings used by SKILL.md frontmatter.
+    Frontmatter text of a SKILL.md file, as frontmatter_from_stream.
+
+    Raises OSError if the file cannot be read, or UnicodeDecodeError if it is not UTF-8.
     """
-    parsed: dict[str, str] = {}
-    current_key: Optional[str] = None
-    for raw_line in frontmatter_text.splitlines():
-        stripped = raw_line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
+    with open(skill_md, encoding="utf-8") as handle:
+        return frontmatter_from_stream(handle, max_chars)
 
-        is_indented = raw_line[:1].isspace()
-        if is_indented:
-            if current_key is None:
-                return None
-            current_value = parsed[current_key]
-            parsed[current_key] = (
-                f"{current_value}\n{stripped}" if current_value else stripped
-            )
-            continue
 
-        if ":" not in stripped:
-            return None
-        key, value = stripped.split(":", 1)
-        key = key.strip()
-        value = value.strip()
-        if not key:
-            return None
-        if (value.startswith('"') and value.endswith('"')) or (
-            value.startswith("'") and value.endswith("'")
-        ):
-            value = value[1:-1]
-        parsed[key] = value
-        current_key = key
-    return parsed
+def _extract_frontmatter(content: str) -> Optional[str]:
+    frontmatter_text, _error = frontmatter_from_stream(io.StringIO(content, newline=None), None)
+    return frontmatter_text
 
 
-def validate_skill(skill_path):
-    """Basic validation of a skill"""
-    skill_path = Path(skill_path)
+def _yaml_loader():
+    """libyaml's C loader when PyYAML was built with it, else the pure-Python one."""
+    return getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
 
-    skill_md = skill_path / "SKILL.md"
-    if not skill_md.exists():
-        return False, "SKILL.md not found"
 
-    try:
-        content = skill_md.read_text(encoding="utf-8")
-    except OSError as e:
-        return False, f"Could not read SKILL.md: {e}"
+def parser_name() -> str:
+    if yaml is None:
+        return "subset"
+    return "libyaml" if _yaml_loader() is not yaml.SafeLoader else "pyyaml"
+
 
+def parse_frontmatter(content: str) -> Tuple[Optional[dict], Optional[str]]:
+    """Parse SKILL.md frontmatter, returning (frontmatter, None) or (None, error message)."""
     frontmatter_text = _extract_frontmatter(content)
     if frontmatter_text is None:
-        return False, "Invalid frontmatter format"
+        return None, "Invalid frontmatter format"
+    return parse_frontmatter_text(frontmatter_text)
+
+
+def parse_frontmatter_text(frontmatter_text: str) -> Tuple[Optional[dict], Optional[str]]:
+    """Parse the text between the `---` fences, as parse_frontmatter does."""
     if yaml is not None:
         try:
-            frontmatter = yaml.safe_load(frontmatter_text)
-            if not isinstance(frontmatter, dict):
-                return False, "Frontmatter must be a YAML dictionary"
+            frontmatter = yaml.load(frontmatter_text, Loader=_yaml_loader())
         except yaml.YAMLError as e:
-            return False, f"Invalid YAML in frontmatter: {e}"
+            return None, f"Invalid YAML in frontmatter: {e}"
     else:
-        frontmatter = _parse_simple_frontmatter(frontmatter_text)
-        if frontmatter is None:
-            return (
-                False,
-                "Invalid YAML in frontmatter: unsupported syntax without PyYAML installed",
-            )
+        try:
+            frontmatter = yaml_subset.load(frontmatter_text)
+        except yaml_subset.SubsetError as e:
+            return None, f"Invalid YAML in frontmatter: {e} (PyYAML is not installed)"
+    if not isinstance(frontmatter, dict):
+        return None, "Frontmatter must be a YAML dictionary"
+    return frontmatter, None
 
-    allowed_properties = {"name", "description", "license", "allowed-tools", "metadata"}
+
+def skill_errors(skill_path, cache: Optional["ValidationCache"] = None) -> List[str]:
+    """
+    Every problem found in a skill folder, in check order; empty when it is valid.
+
+    With `cache`, an unchanged SKILL.md reuses its earlier result without parsing.
+    """
+    skill_path = Path(skill_path)
+
+    skill_md = skill_path / "SKILL.md"
+    if not skill_md.exists():
+        return ["SKILL.md not found"]
+
+    if cache is None:
+        try:
+            frontmatter_text, error = read_frontmatter(skill_md)
+        except (OSError, ValueError) as e:
+            return [f"Could not read SKILL.md: {e}"]
+        if frontmatter_text is None:
+            return [error]
+        return frontmatter_errors(frontmatter_text)
+
+    try:
+        errors = cache.lookup(skill_md)
+    except (OSError, ValueError) as e:
+        return [f"Could not read SKILL.md: {e}"]
+    if errors is None:
+        errors, entry = _errors_with_entry(skill_md)
+        if entry is not None:
+            cache.put(skill_md, entry)
+    return errors
+
+
+def _frontmatter_digest(frontmatter_text: Optional[str], error: Optional[str]) -> str:
+    # Only the frontmatter decides the result, so edits to the body stay cache hits.
+    key = frontmatter_text if frontmatter_text is not None else f"\0{error}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _errors_with_entry(skill_md: Path) -> Tuple[List[str], Optional[Dict[str, Any]]]:
+    """Validate SKILL.md from one read, returning its errors and a cache entry for them."""
+    try:
+        # Stat first: if the file changes mid-read, the entry's mtime is stale and
+        # the next lookup falls back to comparing frontmatter hashes.
+        stat = skill_md.stat()
+        frontmatter_text, error = read_frontmatter(skill_md)
+    except (OSError, ValueError) as e:
+        # ValueError covers UnicodeDecodeError from a SKILL.md that is not UTF-8.
+        return [f"Could not read SKILL.md: {e}"], None
+    errors = [error] if frontmatter_text is None else frontmatter_errors(frontmatter_text)
+    entry = {
+        "size": stat.st_size,
+        "mtimeNs": stat.st_mtime_ns,
+        "sha256": _frontmatter_digest(frontmatter_text, error),
+        "errors": errors,
+    }
+    return errors, entry
+
+
+def frontmatter_errors(frontmatter_text: str) -> List[str]:
+    """Every problem found in SKILL.md frontmatter text, in check order."""
+    frontmatter, error = parse_frontmatter_text(frontmatter_text)
+    if frontmatter is None:
+        return [error]
+
+    errors = []
+    allowed_properties = ALLOWED_PROPERTIES
 
     unexpected_keys = set(frontmatter.keys()) - allowed_properties
     if unexpected_keys:
         allowed = ", ".join(sorted(allowed_properties))
         unexpected = ", ".join(sorted(unexpected_keys))
-        return (
-            False,
-            f"Unexpected key(s) in SKILL.md frontmatter: {unexpected}. Allowed properties are: {allowed}",
+        errors.append(
+            f"Unexpected key(s) in SKILL.md frontmatter: {unexpected}. Allowed properties are: {allowed}"
         )
 
     if "name" not in frontmatter:
-        return False, "Missing 'name' in frontmatter"
+        errors.append("Missing 'name' in frontmatter")
     if "description" not in frontmatter:
-        return False, "Missing 'description' in frontmatter"
+        errors.append("Missing 'description' in frontmatter")
 
     name = frontmatter.get("name", "")
     if not isinstance(name, str):
-        return False, f"Name must be a string, got {type(name).__name__}"
+        errors.append(f"Name must be a string, got {type(name).__name__}")
+        name = ""
     name = name.strip()
     if name:
         if not re.match(r"^[a-z0-9-]+$", name):
-            return (
-                False,
-                f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)",
+            errors.append(
+                f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)"
             )
         if name.startswith("-") or name.endswith("-") or "--" in name:
-            return (
-                False,
-                f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens",
+            errors.append(
+                f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens"
             )
         if len(name) > MAX_SKILL_NAME_LENGTH:
-            return (
-                False,
+            errors.append(
                 f"Name is too long ({len(name)} characters). "
-                f"Maximum is {MAX_SKILL_NAME_LENGTH} characters.",
+                f"Maximum is {MAX_SKILL_NAME_LENGTH} characters."
             )
 
     description = frontmatter.get("description", "")
     if not isinstance(description, str):
-        return False, f"Description must be a string, got {type(description).__name__}"
+        errors.append(f"Description must be a string, got {type(description).__name__}")
+        description = ""
     description = description.strip()
     if description:
         if "<" in description or ">" in description:
-            return False, "Description cannot contain angle brackets (< or >)"
-        if len(description) > 1024:
-            return (
-                False,
-                f"Description is too long ({len(description)} characters). Maximum is 1024 characters.",
+            errors.append("Description cannot contain angle brackets (< or >)")
+        if len(description) > MAX_DESCRIPTION_LENGTH:
+            errors.append(
+                f"Description is too long ({len(description)} characters). "
+                f"Maximum is {MAX_DESCRIPTION_LENGTH} characters."
             )
 
+    return errors
+
+
+def validate_skill(skill_path, cache: Optional["ValidationCache"] = None):
+    """Basic validation of a skill"""
+    errors = skill_errors(skill_path, cache)
+    if errors:
+        return False, errors[0]
     return True, "Skill is valid!"
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python quick_validate.py <skill_directory>")
-        sys.exit(1)
+def default_cache_dir() -> Path:
+    override = os.environ.get("SKILL_CREATOR_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "openclaw" / "skill-creator"
+
+
+def validator_fingerprint() -> str:
+    """Digest of everything that decides a result: rules, parser and this file's source."""
+    rules = {
+        "version": VALIDATOR_VERSION,
+        "allowedProperties": sorted(ALLOWED_PROPERTIES),
+        "maxNameLength": MAX_SKILL_NAME_LENGTH,
+        "maxDescriptionLength": MAX_DESCRIPTION_LENGTH,
+        "parser": parser_name(),
+    }
+    digest = hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8"))
+    digest.update(Path(__file__).read_bytes())
+    if yaml is None:
+        digest.update(Path(yaml_subset.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """
+    On-disk validation results, keyed by the resolved path of each SKILL.md.
+
+    An entry holds the file's size and mtime, a SHA-256 of its frontmatter and
+    the errors found. A file matching by size and mtime is a hit without being
+    read; otherwise a matching frontmatter hash is a hit and the entry's size
+    and mtime are refreshed. The
+    whole cache is discarded when the validator fingerprint changes, so rule
+    or parser changes never serve stale results.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path else default_cache_dir() / "validation-cache.json"
+        self.fingerprint = validator_fingerprint()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if (
+            isinstance(payload, dict)
+            and payload.get("version") == CACHE_VERSION
+            and payload.get("fingerprint") == self.fingerprint
+            and isinstance(payload.get("entries"), dict)
+        ):
+            self._entries = payload["entries"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, skill_md: Path) -> Optional[List[str]]:
+        """Cached errors for `skill_md`, or None when it must be validated again."""
+        key = str(Path(skill_md).resolve())
+        stat = os.stat(key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.get("size") == stat.st_size and entry.get("mtimeNs") == stat.st_mtime_ns:
+            return list(entry["errors"])
+        if entry.get("sha256") != _frontmatter_digest(*read_frontmatter(key)):
+            return None
+        with self._lock:
+            entry.update(size=stat.st_size, mtimeNs=stat.st_mtime_ns)
+            self._dirty = True
+        return list(entry["errors"])
+
+    def put(self, skill_md: Path, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[str(Path(skill_md).resolve())] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache if anything changed, dropping entries for deleted files."""
+        if not self._dirty:
+            return
+        with self._lock:
+            entries = {key: entry for key, entry in self._entries.items() if os.path.exists(key)}
+            self._dirty = False
+        payload = {"version": CACHE_VERSION, "fingerprint": self.fingerprint, "entries": entries}
+        temp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".validation-")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, separators=(",", ":"))
+            os.replace(temp_path, self.path)
+            temp_path = None
+        except OSError as e:
+            print(f"[WARN] Could not write validation cache: {e}", file=sys.stderr)
+        finally:
+            if temp_path is not None:
+                Path(temp_path).unlink(missing_ok=True)
+
+
+@dataclass
+class SkillReport:
+    name: str
+    path: str
+    errors: List[str]
+    seconds: float
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+def find_nested_skills(root) -> List[Path]:
+    """
+    Every folder under `root` holding a SKILL.md, at any depth, sorted by path.
 
-    valid, message = validate_skill(sys.argv[1])
-    print(message)
-    sys.exit(0 if valid else 1)
+    Hidden and dependency folders are skipped, and a skill's own subfolders
+    are not searched for further skills. This is deliberately wider than
+    package_skill.discover_skills, which takes only immediate children: a
+    release gate validates nested trees (say skills/public and
+    skills/private) in one run, while packaging writes one flat
+    `<name>.skill` per folder and so must not pick up nested skills whose
+    names could collide.
+    """
+    found = []
+    for current, dirnames, filenames in os.walk(root):
+        if "SKILL.md" in filenames:
+            found.append(Path(current))
+            dirnames[:] = []
+            continue
+        dirnames[:] = [
+            name for name in dirnames if not name.startswith(".") and name not in SKIPPED_DIRS
+        ]
+    return sorted(found)
+
+
+def _report(skill_path: Path, root: Path, errors: List[str], started: float) -> SkillReport:
+    seconds = time.perf_counter() - started
+    return SkillReport(skill_path.relative_to(root).as_posix(), str(skill_path), errors, seconds)
+
+
+def _timed_entry(skill_path: Path, root: Path) -> Tuple[SkillReport, Optional[Dict[str, Any]]]:
+    """Worker-process validation; the cache entry goes back to the parent to record."""
+    started = time.perf_counter()
+    skill_md = skill_path / "SKILL.md"
+    if not skill_md.exists():
+        return _report(skill_path, root, skill_errors(skill_path), started), None
+    errors, entry = _errors_with_entry(skill_md)
+    return _report(skill_path, root, errors, started), entry
+
+
+def validate_all(
+    root, jobs: Optional[int] = None, cache: Optional[ValidationCache] = None
+) -> List[SkillReport]:
+    """Validate every skill under `root`, `jobs` at a time, collecting all errors."""
+    root = Path(root).resolve()
+    skills = find_nested_skills(root)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(skills) <= 1:
+        reports = []
+        for skill in skills:
+            started = time.perf_counter()
+            reports.append(_report(skill, root, skill_errors(skill, cache), started))
+        return reports
+
+    results: Dict[Path, SkillReport] = {}
+    pending = []
+    for skill in skills:
+        started = time.perf_counter()
+        try:
+            errors = cache.lookup(skill / "SKILL.md") if cache is not None else None
+        except (OSError, ValueError):
+            errors = None
+        if errors is None:
+            pending.append(skill)
+        else:
+            results[skill] = _report(skill, root, errors, started)
+
+    if pending:
+        # YAML parsing is pure Python and holds the GIL, so spread it over processes.
+        chunksize = max(1, len(pending) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+            outcomes = pool.map(_timed_entry, pending, [root] * len(pending), chunksize=chunksize)
+            for skill, (report, entry) in zip(pending, outcomes):
+                results[skill] = report
+                if cache is not None and entry is not None:
+                    cache.put(skill / "SKILL.md", entry)
+    return [results[skill] for skill in skills]
+
+
+def format_reports(reports: List[SkillReport], root, elapsed: float, output_format: str) -> str:
+    invalid = sum(not report.valid for report in reports)
+    if output_format == "json":
+        payload = {
+            "root": str(Path(root).resolve()),
+            "seconds": round(elapsed, 6),
+            "total": len(reports),
+            "valid": len(reports) - invalid,
+            "invalid": invalid,
+            "skills": [
+                {
+                    "name": report.name,
+                    "path": report.path,
+                    "valid": report.valid,
+                    "errors": report.errors,
+                    "seconds": round(report.seconds, 6),
+                }
+                for report in reports
+            ],
+        }
+        return json.dumps(payload, indent=2)
+    lines = []
+    for report in reports:
+        status = "[OK]" if report.valid else "[ERROR]"
+        lines.append(f"{status} {report.name} ({report.seconds * 1000:.1f} ms)")
+        lines.extend(f"   {error}" for error in report.errors)
+    lines.append(
+        f"\n{len(reports) - invalid} valid, {invalid} invalid of {len(reports)} skills "
+        f"in {elapsed:.2f}s"
+    )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate skill folders.")
+    parser.add_argument("skill_directory", nargs="?", help="Skill folder to validate")
+    parser.add_argument(
+        "--all",
+        metavar="DIR",
+        help="Validate every skill folder under DIR and report all errors per skill",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Skills to validate in parallel with --all (default: CPU count)",
+    )
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Validate every SKILL.md afresh, without reading or writing the result cache",
+    )
+    parser.add_argument("--cache-file", help="Result cache file (default: user cache dir)")
+    args = parser.parse_args()
+    if bool(args.all) == bool(args.skill_directory):
+        parser.error("give either a skill directory or --all DIR")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    cache = None if args.no_cache else ValidationCache(args.cache_file)
+
+    if not args.all:
+        valid, message = validate_skill(args.skill_directory, cache)
+        if cache is not None:
+            cache.save()
+        print(message)
+        sys.exit(0 if valid else 1)
+
+    started = time.perf_counter()
+    reports = validate_all(args.all, args.jobs, cache)
+    if cache is not None:
+        cache.save()
+    print(format_reports(reports, args.all, time.perf_counter() - started, args.format))
+    sys.exit(0 if all(report.valid for report in reports) else 1)
+
+
+if __name__ == "__main__":
+    main()
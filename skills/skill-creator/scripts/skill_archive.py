@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Sequential .skill (zip) writer for members compressed ahead of time.
+
+zipfile.ZipFile compresses each member while writing it, which serializes
+compression. SkillArchiveWriter only lays out headers: callers hand it
+members whose bytes are already compressed (in a worker pool, or copied raw
+from a previous archive by ArchiveSource), or stream a large file through it
+chunk by chunk. Every member is written
+with a data descriptor, so the output never needs to be seeked.
+"""
+
+import bz2
+import lzma
+import struct
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+# Same thresholds as zipfile, so archives switch to ZIP64 at the same sizes.
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+UINT32_MAX = 0xFFFFFFFF
+DEFAULT_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+_LOCAL_HEADER_SIZE = 30
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_ZIP64_VERSION = 45
+_VERSION_NEEDED = {
+    zipfile.ZIP_STORED: 20,
+    zipfile.ZIP_DEFLATED: 20,
+    zipfile.ZIP_BZIP2: 46,
+    zipfile.ZIP_LZMA: 63,
+}
+# Zip LZMA members open with the LZMA SDK version (9.4), the length of the
+# LZMA1 properties and the properties themselves, then the raw stream. These
+# are preset 6's properties, the ones zipfile writes.
+_LZMA_SDK_VERSION = (9, 4)
+_LZMA_FILTER = {"id": lzma.FILTER_LZMA1, "lc": 3, "lp": 0, "pb": 2, "dict_size": 1 << 23}
+
+
+@dataclass
+class MemberInfo:
+    arcname: str
+    method: int = zipfile.ZIP_DEFLATED
+    date_time: Tuple[int, int, int, int, int, int] = DEFAULT_DATE_TIME
+    mode: int = 0o100644
+    crc: int = 0
+    file_size: int = 0
+    compress_size: int = 0
+    header_offset: int = 0
+    zip64: bool = False
+
+
+@dataclass
+class CompressedMember:
+    info: MemberInfo
+    data: bytes
+
+
+def zip_date_time(timestamp: float, utc: bool = False) -> Tuple[int, int, int, int, int, int]:
+    """Time tuple for a zip header, clamped to the range DOS dates can hold."""
+    date_time = tuple((time.gmtime if utc else time.localtime)(timestamp)[:6])
+    if date_time[0] < 1980:
+        return DEFAULT_DATE_TIME
+    if date_time[0] > 2107:
+        return (2107, 12, 31, 23, 59, 58)
+    return date_time
+
+
+def _lzma_header(filter_spec: dict) -> bytes:
+    packed = (filter_spec["pb"] * 5 + filter_spec["lp"]) * 9 + filter_spec["lc"]
+    properties = struct.pack("<BI", packed, filter_spec["dict_size"])
+    return struct.pack("<BBH", *_LZMA_SDK_VERSION, len(properties)) + properties
+
+
+def _lzma_filter(properties: bytes) -> dict:
+    """Decode LZMA1 properties (lc/lp/pb packed in one byte, then the dictionary size)."""
+    if len(properties) != 5 or properties[0] >= 9 * 5 * 5:
+        raise zipfile.BadZipFile("Bad LZMA properties")
+    packed, dict_size = struct.unpack("<BI", properties)
+    packed, lc = divmod(packed, 9)
+    pb, lp = divmod(packed, 5)
+    return {"id": lzma.FILTER_LZMA1, "lc": lc, "lp": lp, "pb": pb, "dict_size": dict_size}
+
+
+class _LzmaCompressor:
+    """Raw LZMA1 compressor whose output starts with the zip LZMA header."""
+
+    def __init__(self) -> None:
+        self._compressor = lzma.LZMACompressor(lzma.FORMAT_RAW, filters=[_LZMA_FILTER])
+        self._header = _lzma_header(_LZMA_FILTER)
+
+    def compress(self, data: bytes) -> bytes:
+        header, self._header = self._header, b""
+        return header + self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        header, self._header = self._header, b""
+        return header + self._compressor.flush()
+
+
+class _LzmaDecompressor:
+    """Reads the zip LZMA header, then decodes the raw LZMA1 stream behind it."""
+
+    def __init__(self) -> None:
+        self._decompressor: Optional[lzma.LZMADecompressor] = None
+        self._header = b""
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor is not None and self._decompressor.eof
+
+    @property
+    def needs_input(self) -> bool:
+        return self._decompressor is None or self._decompressor.needs_input
+
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+        if self._decompressor is None:
+            self._header += data
+            if len(self._header) < 4:
+                return b""
+            end = 4 + struct.unpack_from("<H", self._header, 2)[0]
+            if len(self._header) < end:
+                return b""
+            filter_spec = _lzma_filter(self._header[4:end])
+            data, self._header = self._header[end:], b""
+            self._decompressor = lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=[filter_spec])
+        return self._decompressor.decompress(data, max_length)
+
+
+def compressor_for(method: int, level: Optional[int] = None):
+    """
+    Return an incremental compressor for `method`, or None for stored members.
+
+    The streams are the ones zip readers expect: raw deflate, bzip2, and LZMA1
+    behind the zip LZMA header. LZMA takes no level.
+
+    Raises:
+        NotImplementedError: for any other compression method
+    """
+    if method == zipfile.ZIP_STORED:
+        return None
+    if method == zipfile.ZIP_DEFLATED:
+        if level is None:
+            level = zlib.Z_DEFAULT_COMPRESSION
+        return zlib.compressobj(level, zlib.DEFLATED, -15)
+    if method == zipfile.ZIP_BZIP2:
+        return bz2.BZ2Compressor() if level is None else bz2.BZ2Compressor(level)
+    if method == zipfile.ZIP_LZMA:
+        return _LzmaCompressor()
+    raise NotImplementedError(f"compression method {method} is not supported")
+
+
+def decompressor_for(method: int):
+    """
+    Return an incremental decompressor for a member stored with `method`, or None
+    for stored members. Each one takes `max_length`; zlib's leaves what it did not
+    consume in `unconsumed_tail`, the others report `needs_input`.
+
+    Raises:
+        NotImplementedError: for compression methods other than those above
+    """
+    if method == zipfile.ZIP_STORED:
+        return None
+    if method == zipfile.ZIP_DEFLATED:
+        return zlib.decompressobj(-15)
+    if method == zipfile.ZIP_BZIP2:
+        return bz2.BZ2Decompressor()
+    if method == zipfile.ZIP_LZMA:
+        return _LzmaDecompressor()
+    raise NotImplementedError(f"compression method {method} is not supported")
+
+
+def compress_bytes(data: bytes, method: int, level: Optional[int] = None) -> bytes:
+    compressor = compressor_for(method, level)
+    if compressor is None:
+        return data
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_member(info: MemberInfo, data: bytes, level: Optional[int] = None) -> CompressedMember:
+    """Fill in size and CRC for `data` and compress it; safe to run in worker threads."""
+    info.crc = zlib.crc32(data)
+    info.file_size = len(data)
+    return CompressedMember(info=info, data=compress_bytes(data, info.method, level))
+
+
+def _dos_date_time(date_time: Tuple[int, int, int, int, int, int]) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    return (year - 1980) << 9 | month << 5 | day, hour << 11 | minute << 5 | second // 2
+
+
+class SkillArchiveWriter:
+    """Write zip members in order to a (possibly non-seekable) binary stream."""
+
+    def __init__(self, fileobj: BinaryIO) -> None:
+        self._fp = fileobj
+        self._offset = 0
+        self._members: List[MemberInfo] = []
+        self._closed = False
+
+    def __enter__(self) -> "SkillArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+
+    @property
+    def members(self) -> List[MemberInfo]:
+        return list(self._members)
+
+    @property
+    def bytes_written(self) -> int:
+        return self._offset
+
+    def _write(self, data: bytes) -> None:
+        self._fp.write(data)
+        self._offset += len(data)
+
+    @staticmethod
+    def _flags(info: MemberInfo) -> int:
+        return _FLAG_DATA_DESCRIPTOR | (0 if info.arcname.isascii() else _FLAG_UTF8)
+
+    @staticmethod
+    def _version_needed(info: MemberInfo) -> int:
+        version = _VERSION_NEEDED.get(info.method, 20)
+        return max(version, _ZIP64_VERSION) if info.zip64 else version
+
+    def _write_local_header(self, info: MemberInfo) -> None:
+        info.header_offset = self._offset
+        name = info.arcname.encode("utf-8")
+        size_field = UINT32_MAX if info.zip64 else 0
+        extra = struct.pack("<HHQQ", 1, 16, 0, 0) if info.zip64 else b""
+        dos_date, dos_time = _dos_date_time(info.date_time)
+        header = struct.pack(
+            "<4s5H3L2H",
+            b"PK\x03\x04",
+            self._version_needed(info),
+            self._flags(info),
+            info.method,
+            dos_time,
+            dos_date,
+            0,
+            size_field,
+            size_field,
+            len(name),
+            len(extra),
+        )
+        self._write(header + name + extra)
+
+    def _write_data_descriptor(self, info: MemberInfo) -> None:
+        layout = "<4sLQQ" if info.zip64 else "<4sLLL"
+        self._write(
+            struct.pack(layout, b"PK\x07\x08", info.crc, info.compress_size, info.file_size)
+        )
+        self._members.append(info)
+
+    def add(self, member: CompressedMember) -> None:
+        info = member.info
+        info.compress_size = len(member.data)
+        info.zip64 = info.file_size > ZIP64_LIMIT or info.compress_size > ZIP64_LIMIT
+        self._write_local_header(info)
+        self._write(member.data)
+        self._write_data_descriptor(info)
+
+    def add_raw(self, info: MemberInfo, chunks: Iterable[bytes]) -> None:
+        """Write already-compressed bytes; `info` must carry the CRC and both sizes."""
+        info.zip64 = info.file_size > ZIP64_LIMIT or info.compress_size > ZIP64_LIMIT
+        self._write_local_header(info)
+        written = 0
+        for chunk in chunks:
+            self._write(chunk)
+            written += len(chunk)
+        if written != info.compress_size:
+            raise zipfile.BadZipFile(
+                f"{info.arcname}: expected {info.compress_size} compressed bytes, got {written}"
+            )
+        self._write_data_descriptor(info)
+
+    def add_stream(
+        self,
+        info: MemberInfo,
+        chunks: Iterable[bytes],
+        expected_size: int,
+        level: Optional[int] = None,
+    ) -> None:
+        """Compress `chunks` while writing them, for members too large to buffer."""
+        info.zip64 = expected_size * 1.05 > ZIP64_LIMIT
+        self._write_local_header(info)
+        compressor = compressor_for(info.method, level)
+        crc = size = compress_size = 0
+        for chunk in chunks:
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            out = compressor.compress(chunk) if compressor is not None else chunk
+            if out:
+                self._write(out)
+                compress_size += len(out)
+        if compressor is not None:
+            tail = compressor.flush()
+            self._write(tail)
+            compress_size += len(tail)
+        if not info.zip64 and (size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT):
+            raise zipfile.LargeZipFile(f"{info.arcname} grew past the ZIP64 limit while packaging")
+        info.crc, info.file_size, info.compress_size = crc, size, compress_size
+        self._write_data_descriptor(info)
+
+    def _write_central_header(self, info: MemberInfo) -> None:
+        file_size, compress_size = info.file_size, info.compress_size
+        header_offset = info.header_offset
+        extra_fields = []
+        if file_size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT:
+            extra_fields += [file_size, compress_size]
+            file_size = compress_size = UINT32_MAX
+        if header_offset > ZIP64_LIMIT:
+            extra_fields.append(header_offset)
+            header_offset = UINT32_MAX
+        extra = b""
+        if extra_fields:
+            extra = struct.pack(f"<HH{len(extra_fields)}Q", 1, 8 * len(extra_fields), *extra_fields)
+        version = self._version_needed(info)
+        if extra_fields:
+            version = max(version, _ZIP64_VERSION)
+        name = info.arcname.encode("utf-8")
+        dos_date, dos_time = _dos_date_time(info.date_time)
+        header = struct.pack(
+            "<4s4B4HL2L5H2L",
+            b"PK\x01\x02",
+            version,
+            3,  # made by: Unix, so external attributes carry the file mode
+            version,
+            0,
+            self._flags(info),
+            info.method,
+            dos_time,
+            dos_date,
+            info.crc,
+            compress_size,
+            file_size,
+            len(name),
+            len(extra),
+            0,
+            0,
+            0,
+            (info.mode & 0xFFFF) << 16,
+            header_offset,
+        )
+        self._write(header + name + extra)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        directory_offset = self._offset
+        for info in self._members:
+            self._write_central_header(info)
+        directory_size = self._offset - directory_offset
+        count = len(self._members)
+        if (
+            count > ZIP_FILECOUNT_LIMIT
+            or directory_offset > ZIP64_LIMIT
+            or directory_size > ZIP64_LIMIT
+        ):
+            zip64_end_offset = self._offset
+            self._write(
+                struct.pack(
+                    "<4sQ2H2L4Q",
+                    b"PK\x06\x06",
+                    44,
+                    _ZIP64_VERSION,
+                    _ZIP64_VERSION,
+                    0,
+                    0,
+                    count,
+                    count,
+                    directory_size,
+                    directory_offset,
+                )
+            )
+            self._write(struct.pack("<4sLQL", b"PK\x06\x07", 0, zip64_end_offset, 1))
+            count = min(count, 0xFFFF)
+            directory_size = min(directory_size, UINT32_MAX)
+            directory_offset = min(directory_offset, UINT32_MAX)
+        self._write(
+            struct.pack(
+                "<4s4H2LH",
+                b"PK\x05\x06",
+                0,
+                0,
+                count,
+                count,
+                directory_size,
+                directory_offset,
+                0,
+            )
+        )
+
+
+class ArchiveSource:
+    """Read members of an existing archive as raw compressed bytes, without inflating."""
+
+    def __init__(self, path) -> None:
+        self._fp = open(path, "rb")
+        try:
+            with zipfile.ZipFile(self._fp) as archive:
+                self._infos = {info.filename: info for info in archive.infolist()}
+        except Exception:
+            self._fp.close()
+            raise
+
+    def __enter__(self) -> "ArchiveSource":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._fp.close()
+
+    def __contains__(self, arcname: str) -> bool:
+        return arcname in self._infos
+
+    def member_info(self, arcname: str) -> MemberInfo:
+        zinfo = self._infos[arcname]
+        return MemberInfo(
+            arcname=arcname,
+            method=zinfo.compress_type,
+            date_time=zinfo.date_time,
+            mode=zinfo.external_attr >> 16,
+            crc=zinfo.CRC,
+            file_size=zinfo.file_size,
+            compress_size=zinfo.compress_size,
+        )
+
+    def iter_raw(self, arcname: str, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """Yield the member's compressed bytes exactly as stored."""
+        zinfo = self._infos[arcname]
+        self._fp.seek(zinfo.header_offset)
+        header = self._fp.read(_LOCAL_HEADER_SIZE)
+        if len(header) != _LOCAL_HEADER_SIZE or header[:4] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"{arcname}: bad local file header")
+        name_length, extra_length = struct.unpack("<2H", header[26:30])
+        self._fp.seek(name_length + extra_length, 1)
+        remaining = zinfo.compress_size
+        while remaining > 0:
+            chunk = self._fp.read(min(chunk_size, remaining))
+            if not chunk:
+                raise zipfile.BadZipFile(f"{arcname}: truncated member data")
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Skill Bundle - Stores many skills in one content-addressed archive
+
+A bundle is a zip that holds each distinct file content once, as a blob
+named by its SHA-256 and compression method, plus one manifest per skill
+mapping the skill's paths to blobs. Each path gets the method package_skill
+would pick for it, so content stored under differently treated names (say
+`logo.png` and `logo.bin`) becomes one blob per method. Scripts and assets
+shared between skills are read, stored and compressed once however many
+skills ship them. `export` turns a bundle back into
+ordinary .skill files by copying each blob's compressed bytes into the
+archives, so nothing is recompressed.
+
+Usage:
+    python utils/skill_bundle.py build <skills-directory> <bundle-file> [--jobs N]
+    python utils/skill_bundle.py export <bundle-file> <output-directory> [--skill NAME ...]
+
+Example:
+    python utils/skill_bundle.py build skills/public dist/skills.bundle --reproducible
+    python utils/skill_bundle.py export dist/skills.bundle ./dist
+    python utils/skill_bundle.py export dist/skills.bundle ./dist --skill my-skill
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Tuple
+
+from compression_policy import METHOD_NAMES, CompressionPolicy
+from package_manifest import policy_key
+from package_skill import (
+    READ_CHUNK_SIZE,
+    STREAM_THRESHOLD,
+    SkillFile,
+    add_compression_arguments,
+    collect_files,
+    default_jobs,
+    discover_skills,
+    format_size,
+    policy_from_args,
+    read_chunks,
+    reproducible_date_time,
+    reproducible_mode,
+)
+from quick_validate import validate_skill
+from skill_archive import (
+    DEFAULT_DATE_TIME,
+    ArchiveSource,
+    CompressedMember,
+    MemberInfo,
+    SkillArchiveWriter,
+    compress_member,
+    compressor_for,
+    zip_date_time,
+)
+
+BUNDLE_FORMAT = 2
+INDEX_NAME = "bundle.json"
+MANIFEST_DIR = "manifests/"
+BLOB_DIR = "blobs/"
+
+
+@dataclass
+class BundleStats:
+    skills: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    files: int = 0
+    blobs: int = 0
+    input_size: int = 0
+    blob_size: int = 0
+    bundle_size: int = 0
+
+
+def _manifest_name(skill_name: str) -> str:
+    return f"{MANIFEST_DIR}{skill_name}.json"
+
+
+def _json_member(arcname: str, payload) -> CompressedMember:
+    data = json.dumps(payload, indent=2, sort_keys=True).encode("utf-8")
+    return compress_member(MemberInfo(arcname), data)
+
+
+@dataclass
+class _Blob:
+    name: str
+    info: MemberInfo
+    level: Optional[int]
+    # Contents still to compress, or for a file too large to buffer, its
+    # compressed bytes spilled to a temporary file while it was hashed.
+    data: Optional[bytes] = None
+    spill: Optional[IO[bytes]] = None
+    member: Optional[CompressedMember] = None
+
+
+def _blob_name(digest: str, method: int) -> str:
+    return f"{digest}.{METHOD_NAMES[method]}"
+
+
+def _read_blob(skill_file: SkillFile, policy: CompressionPolicy) -> _Blob:
+    """
+    Read a file once, hash it and pick its method as package_skill would.
+
+    Files too large to buffer are compressed in the same pass; smaller ones
+    keep their contents so only the first copy of each blob is compressed.
+    """
+    file_path, arcname, stat = skill_file
+    info = MemberInfo(arcname)
+    if stat.st_size <= STREAM_THRESHOLD:
+        data = file_path.read_bytes()
+        info.method, level = policy.choose(arcname, data)
+        name = _blob_name(hashlib.sha256(data).hexdigest(), info.method)
+        return _Blob(name, info, level, data=data)
+
+    digest = hashlib.sha256()
+    compressor = None
+    crc = size = 0
+    spill = tempfile.TemporaryFile()
+    try:
+        for chunk in read_chunks(file_path):
+            if not size:
+                # The first chunk holds the policy's sample, as package_skill reads it.
+                info.method, level = policy.choose(arcname, chunk)
+                compressor = compressor_for(info.method, level)
+            digest.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            spill.write(compressor.compress(chunk) if compressor is not None else chunk)
+        if compressor is not None:
+            spill.write(compressor.flush())
+    except BaseException:
+        spill.close()
+        raise
+    info.crc, info.file_size, info.compress_size = crc, size, spill.tell()
+    return _Blob(_blob_name(digest.hexdigest(), info.method), info, level, spill=spill)
+
+
+def _compress_blob(blob: _Blob) -> _Blob:
+    if blob.data is not None:
+        blob.member = compress_member(blob.info, blob.data, blob.level)
+        blob.data = None
+    return blob
+
+
+def _write_blob(writer: SkillArchiveWriter, blob: _Blob) -> None:
+    blob.info.arcname = BLOB_DIR + blob.name
+    if blob.member is not None:
+        writer.add(blob.member)
+        return
+    with blob.spill:
+        blob.spill.seek(0)
+        writer.add_raw(blob.info, iter(lambda: blob.spill.read(READ_CHUNK_SIZE), b""))
+
+
+def _write_blobs(
+    writer: SkillArchiveWriter, files: List[SkillFile], jobs: int, policy: CompressionPolicy
+) -> Tuple[List[str], int]:
+    """
+    Write one blob per distinct (content, method) among `files`, in input order.
+
+    Files are read and hashed up to `jobs` at a time, and the first copy of
+    each blob is compressed on the same pool; windows of in-flight futures cap
+    how many file contents sit in memory. Returns each file's blob name and
+    the total size of the distinct contents.
+    """
+    names: List[str] = []
+    written = set()
+    content_size = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        reads, compressions = deque(), deque()
+
+        def claim(blob: _Blob) -> None:
+            nonlocal content_size
+            names.append(blob.name)
+            if blob.name in written:
+                if blob.spill is not None:
+                    blob.spill.close()
+                return
+            written.add(blob.name)
+            content_size += blob.info.file_size or len(blob.data)
+            compressions.append(pool.submit(_compress_blob, blob))
+            if len(compressions) >= jobs * 2:
+                _write_blob(writer, compressions.popleft().result())
+
+        for skill_file in files:
+            reads.append(pool.submit(_read_blob, skill_file, policy))
+            if len(reads) >= jobs * 2:
+                claim(reads.popleft().result())
+        while reads:
+            claim(reads.popleft().result())
+        while compressions:
+            _write_blob(writer, compressions.popleft().result())
+    return names, content_size
+
+
+def build_bundle(
+    skills_root,
+    bundle_path,
+    jobs=None,
+    policy=None,
+    reproducible=False,
+    validate=True,
+    log=print,
+) -> Optional[BundleStats]:
+    """
+    Bundle every skill under `skills_root` into one content-addressed archive.
+
+    Skills that fail validation or collection are logged and left out (see
+    `BundleStats.failed`). With `reproducible`, manifests list files sorted and
+    carry normalized timestamps and permissions, so exported archives match
+    `package_skill(..., reproducible=True)` byte for byte.
+
+    Returns:
+        BundleStats for the written bundle, or None if it could not be written
+    """
+    jobs = jobs or default_jobs()
+    policy = policy or CompressionPolicy()
+    bundle_path = Path(bundle_path).resolve()
+    stats = BundleStats()
+
+    skills = discover_skills(skills_root)
+    if validate:
+
+        def check(skill: Path):
+            # One unreadable skill must not abort the bundle.
+            try:
+                return validate_skill(skill)
+            except Exception as e:
+                return False, f"Validation failed: {e}"
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            verdicts = list(pool.map(check, skills))
+        for skill, (valid, message) in zip(skills, verdicts):
+            if not valid:
+                log(f"[ERROR] {skill.name}: {message}")
+                stats.failed.append(skill.name)
+        skills = [skill for skill in skills if skill.name not in stats.failed]
+
+    skill_files: Dict[str, List[SkillFile]] = {}
+    for skill in skills:
+        files = collect_files(skill, bundle_path, log)
+        if files is None:
+            stats.failed.append(skill.name)
+            continue
+        if reproducible:
+            files.sort(key=lambda item: item.arcname)
+        skill_files[skill.name] = files
+
+    everything = [item for files in skill_files.values() for item in files]
+    date_time = reproducible_date_time() if reproducible else None
+    manifests = {}
+    temp_path = bundle_path.with_name(f".{bundle_path.name}.{os.getpid()}.tmp")
+    try:
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "wb") as handle, SkillArchiveWriter(handle) as writer:
+            blob_names, content_size = _write_blobs(writer, everything, jobs, policy)
+            remaining = iter(blob_names)
+            for name, files in skill_files.items():
+                entries = []
+                for skill_file, blob in zip(files, remaining):
+                    mode = skill_file.stat.st_mode
+                    entries.append(
+                        {
+                            "path": skill_file.arcname,
+                            "blob": blob,
+                            "mode": reproducible_mode(mode) if reproducible else mode,
+                            "dateTime": list(date_time or zip_date_time(skill_file.stat.st_mtime)),
+                        }
+                    )
+                manifests[name] = {"name": name, "files": entries}
+            for name, manifest in manifests.items():
+                writer.add(_json_member(_manifest_name(name), manifest))
+                log(f"  Bundled: {name} ({len(manifest['files'])} files)")
+            index = {
+                "version": BUNDLE_FORMAT,
+                "skills": sorted(manifests),
+                "policy": policy_key(policy),
+            }
+            writer.add(_json_member(INDEX_NAME, index))
+        os.replace(temp_path, bundle_path)
+    except Exception as e:
+        log(f"[ERROR] Error creating bundle: {e}")
+        return None
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    stats.skills = sorted(manifests)
+    stats.files = len(everything)
+    stats.blobs = len(set(blob_names))
+    stats.input_size = sum(item.stat.st_size for item in everything)
+    stats.blob_size = content_size
+    stats.bundle_size = bundle_path.stat().st_size
+    return stats
+
+
+def _is_plain_name(name) -> bool:
+    return isinstance(name, str) and name not in ("", ".", "..") and Path(name).name == name
+
+
+def export_bundle(bundle_path, output_dir, names=None, log=print) -> Optional[List[Path]]:
+    """
+    Write `<name>.skill` archives from a bundle, for every skill or only `names`.
+
+    Returns:
+        Paths of the exported archives, or None if the bundle could not be read
+    """
+    bundle_path = Path(bundle_path)
+    output_path = Path(output_dir).resolve()
+    exported = []
+    try:
+        with zipfile.ZipFile(bundle_path) as archive:
+            index = json.loads(archive.read(INDEX_NAME))
+            if index.get("version") != BUNDLE_FORMAT:
+                log(f"[ERROR] Unsupported bundle format: {index.get('version')}")
+                return None
+            available = index["skills"]
+            if not all(_is_plain_name(name) for name in available):
+                log("[ERROR] Bundle index lists an invalid skill name")
+                return None
+            names = list(names or available)
+            missing = [name for name in names if name not in available]
+            if missing:
+                log(f"[ERROR] Not in bundle: {', '.join(missing)}")
+                return None
+            manifests = {name: json.loads(archive.read(_manifest_name(name))) for name in names}
+
+        output_path.mkdir(parents=True, exist_ok=True)
+        with ArchiveSource(bundle_path) as source:
+            for name in names:
+                skill_filename = output_path / f"{name}.skill"
+                temp_filename = skill_filename.with_name(
+                    f".{skill_filename.name}.{os.getpid()}.tmp"
+                )
+                try:
+                    with open(temp_filename, "wb") as handle, SkillArchiveWriter(handle) as writer:
+                        for entry in manifests[name]["files"]:
+                            blob = BLOB_DIR + entry["blob"]
+                            info = source.member_info(blob)
+                            info.arcname = entry["path"]
+                            info.mode = entry["mode"]
+                            info.date_time = tuple(entry["dateTime"])
+                            writer.add_raw(info, source.iter_raw(blob))
+                    os.replace(temp_filename, skill_filename)
+                finally:
+                    temp_filename.unlink(missing_ok=True)
+                log(f"  Exported: {skill_filename}")
+                exported.append(skill_filename)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        log(f"[ERROR] Error exporting bundle: {e}")
+        return None
+    return exported
+
+
+def format_stats(stats: BundleStats, bundle_path) -> str:
+    saved = stats.input_size - stats.blob_size
+    return "\n".join(
+        [
+            f"[OK] Bundled {len(stats.skills)} skills into: {Path(bundle_path).resolve()}",
+            f"   {stats.files} files, {stats.blobs} unique blobs "
+            f"({format_size(saved)} of duplicate content stored once)",
+            f"   Content {format_size(stats.input_size)}, bundle {format_size(stats.bundle_size)}",
+        ]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a deduplicated bundle of skills, or export .skill files from one.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Bundle every skill folder under SKILLS_DIR")
+    build.add_argument("skills_dir", help="Directory whose subfolders are skills")
+    build.add_argument("bundle", help="Bundle file to write")
+    build.add_argument(
+        "--jobs",
+        type=int,
+        default=default_jobs(),
+        help="Files to hash and compress in parallel (default: CPU count)",
+    )
+    add_compression_arguments(build)
+    build.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Sort files and normalize timestamps and permissions, as package_skill does",
+    )
+
+    export = commands.add_parser("export", help="Write .skill files from a bundle")
+    export.add_argument("bundle", help="Bundle file to read")
+    export.add_argument("output_dir", help="Directory for the .skill files")
+    export.add_argument(
+        "--skill",
+        action="append",
+        metavar="NAME",
+        help="Export only this skill (repeatable; default: every skill)",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if args.jobs < 1:
+            parser.error("--jobs must be at least 1")
+        policy = policy_from_args(parser, args)
+        print(f"Bundling skills in: {args.skills_dir}")
+        stats = build_bundle(
+            args.skills_dir,
+            args.bundle,
+            jobs=args.jobs,
+            policy=policy,
+            reproducible=args.reproducible,
+        )
+        if stats is None:
+            sys.exit(1)
+        print()
+        print(format_stats(stats, args.bundle))
+        if stats.failed:
+            print(f"[ERROR] Left out: {', '.join(stats.failed)}")
+            sys.exit(1)
+        return
+
+    print(f"Exporting from bundle: {args.bundle}")
+    exported = export_bundle(args.bundle, args.output_dir, args.skill)
+    if exported is None:
+        sys.exit(1)
+    print(f"\n[OK] Exported {len(exported)} skills to: {Path(args.output_dir).resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Skill Index - Finds skills by name or description without opening every SKILL.md
+
+`build` scans a skills directory once and records each skill's name,
+description, allowed-tools, metadata, path and mtime in a compact JSON index.
+Later builds re-read only the SKILL.md files whose size or mtime changed.
+`query` runs the same check first (skip it with --no-check), then answers
+from the sorted name list and description-word postings stored in the index,
+by binary search.
+
+Usage:
+    python utils/skill_index.py build <skills-directory> [--index FILE] [--full]
+    python utils/skill_index.py query <skills-directory> [--name PREFIX] [--keyword WORD ...]
+
+Example:
+    python utils/skill_index.py build skills/public
+    python utils/skill_index.py query skills/public --name git
+    python utils/skill_index.py query skills/public --keyword pdf --keyword form --format json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from quick_validate import (
+    default_cache_dir,
+    find_nested_skills,
+    parse_frontmatter_text,
+    read_frontmatter,
+)
+
+INDEX_VERSION = 2
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class IndexEntry:
+    name: str
+    description: str
+    path: str  # skill folder, relative to the indexed root
+    mtime_ns: int
+    size: int
+    allowed_tools: Any = None
+    metadata: Any = None
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "path": self.path,
+            "mtimeNs": self.mtime_ns,
+            "size": self.size,
+            "allowed-tools": self.allowed_tools,
+            "metadata": self.metadata,
+        }
+
+    @classmethod
+    def from_json(cls, item: Dict[str, Any]) -> "IndexEntry":
+        return cls(
+            name=item["name"],
+            description=item["description"],
+            path=item["path"],
+            mtime_ns=item["mtimeNs"],
+            size=item["size"],
+            allowed_tools=item.get("allowed-tools"),
+            metadata=item.get("metadata"),
+        )
+
+
+@dataclass
+class IndexStats:
+    skills: int = 0
+    parsed: int = 0
+    reused: int = 0
+    removed: int = 0
+    failed: List[str] = field(default_factory=list)
+
+
+def default_index_path(skills_root) -> Path:
+    """Index file for `skills_root` in the user cache directory."""
+    root = str(Path(skills_root).resolve())
+    digest = hashlib.sha256(root.encode("utf-8")).hexdigest()[:16]
+    return default_cache_dir() / f"skill-index-{digest}.json"
+
+
+def _words(text: str) -> List[str]:
+    return WORD_PATTERN.findall(text.lower())
+
+
+def _read_entry(skill_md: Path, relative: str, stat: os.stat_result):
+    try:
+        text, error = read_frontmatter(skill_md)
+    except (OSError, ValueError) as e:
+        # ValueError covers UnicodeDecodeError from a SKILL.md that is not UTF-8.
+        return None, f"Could not read SKILL.md: {e}"
+    if text is None:
+        return None, error
+    frontmatter, error = parse_frontmatter_text(text)
+    if frontmatter is None:
+        return None, error
+    name = frontmatter.get("name")
+    description = frontmatter.get("description")
+    entry = IndexEntry(
+        name=name.strip() if isinstance(name, str) and name.strip() else skill_md.parent.name,
+        description=description.strip() if isinstance(description, str) else "",
+        path=relative,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        allowed_tools=frontmatter.get("allowed-tools"),
+        metadata=frontmatter.get("metadata"),
+    )
+    return entry, None
+
+
+class SkillIndex:
+    """
+    Skill metadata for one skills directory, with sorted lookup tables.
+
+    Entries are stored sorted by name, next to the sorted name list and a
+    sorted vocabulary of description words, each with the positions of the
+    entries using it. The tables are saved in the index file and used as
+    loaded, so a query costs a binary search plus the matches found, and only
+    matching entries are decoded.
+    """
+
+    def __init__(
+        self,
+        root,
+        items: List[Dict[str, Any]],
+        names: List[str],
+        vocabulary: List[str],
+        postings: List[List[int]],
+        failed: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.root = Path(root).resolve()
+        self._items = items  # IndexEntry.to_json() objects, sorted by (name, path)
+        self._names = names
+        self._vocabulary = vocabulary
+        self._postings = postings
+        # Skills left out, by relative path, with the size and mtime they failed at.
+        self.failed = failed or {}
+
+    @classmethod
+    def from_entries(cls, root, entries: List[IndexEntry], failed=None) -> "SkillIndex":
+        entries = sorted(entries, key=lambda entry: (entry.name, entry.path))
+        postings: Dict[str, List[int]] = {}
+        for position, entry in enumerate(entries):
+            for word in set(_words(entry.description)):
+                postings.setdefault(word, []).append(position)
+        vocabulary = sorted(postings)
+        return cls(
+            root,
+            [entry.to_json() for entry in entries],
+            [entry.name for entry in entries],
+            vocabulary,
+            [postings[word] for word in vocabulary],
+            failed,
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def entries(self) -> List[IndexEntry]:
+        return [IndexEntry.from_json(item) for item in self._items]
+
+    def _entries_at(self, positions) -> List[IndexEntry]:
+        return [IndexEntry.from_json(self._items[position]) for position in positions]
+
+    def by_name_prefix(self, prefix: str) -> List[IndexEntry]:
+        start = bisect_left(self._names, prefix)
+        end = start
+        while end < len(self._names) and self._names[end].startswith(prefix):
+            end += 1
+        return self._entries_at(range(start, end))
+
+    def _word_matches(self, keyword: str) -> Set[int]:
+        """Positions of entries whose description has a word starting with `keyword`."""
+        found: Set[int] = set()
+        start = bisect_left(self._vocabulary, keyword)
+        for position in range(start, len(self._vocabulary)):
+            if not self._vocabulary[position].startswith(keyword):
+                break
+            found.update(self._postings[position])
+        return found
+
+    def by_keywords(self, keywords: List[str]) -> List[IndexEntry]:
+        """Entries whose description matches every keyword, as a word or word prefix."""
+        words = [word for keyword in keywords for word in _words(keyword)]
+        if not words:
+            return []
+        found = self._word_matches(words[0])
+        for word in words[1:]:
+            found &= self._word_matches(word)
+        return self._entries_at(sorted(found))
+
+    def query(self, name_prefix: Optional[str] = None, keywords=None) -> List[IndexEntry]:
+        """Entries matching the name prefix and every keyword; all entries if neither is given."""
+        if keywords:
+            results = self.by_keywords(keywords)
+            if name_prefix:
+                results = [entry for entry in results if entry.name.startswith(name_prefix)]
+            return results
+        if name_prefix:
+            return self.by_name_prefix(name_prefix)
+        return self.entries
+
+    @classmethod
+    def load(cls, index_path) -> Optional["SkillIndex"]:
+        """Read an index file, or return None if it is missing, unreadable or outdated."""
+        try:
+            payload = json.loads(Path(index_path).read_text(encoding="utf-8"))
+            if payload.get("version") != INDEX_VERSION:
+                return None
+            index = cls(
+                payload["root"],
+                payload["skills"],
+                payload["names"],
+                payload["vocabulary"],
+                payload["postings"],
+                payload["failed"],
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        if len(index._names) != len(index._items) or len(index._vocabulary) != len(index._postings):
+            return None
+        return index
+
+    def save(self, index_path) -> None:
+        index_path = Path(index_path)
+        payload = {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "skills": self._items,
+            "names": self._names,
+            "vocabulary": self._vocabulary,
+            "postings": self._postings,
+            "failed": self.failed,
+        }
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=index_path.parent, prefix=".skill-index-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, separators=(",", ":"), default=str)
+            os.replace(temp_path, index_path)
+        finally:
+            Path(temp_path).unlink(missing_ok=True)
+
+
+def _iter_skill_files(root: Path) -> Iterator[tuple]:
+    for skill_dir in find_nested_skills(root):
+        skill_md = skill_dir / "SKILL.md"
+        try:
+            stat = skill_md.stat()
+        except OSError:
+            continue
+        yield skill_md, skill_dir.relative_to(root).as_posix(), stat
+
+
+def _unchanged(recorded: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+    return (
+        recorded is not None
+        and recorded["mtimeNs"] == stat.st_mtime_ns
+        and recorded["size"] == stat.st_size
+    )
+
+
+def update_index(skills_root, previous: Optional[SkillIndex] = None, log=print):
+    """
+    Index every skill under `skills_root`, reusing entries from `previous`.
+
+    An entry is reused when its SKILL.md has the same size and mtime as when it
+    was indexed; other skills are read again. Skills whose frontmatter cannot
+    be read or parsed are logged and left out, and are not read again until
+    they change. When nothing changed, `previous` itself is returned.
+
+    Returns:
+        (SkillIndex, IndexStats)
+    """
+    root = Path(skills_root).resolve()
+    stats = IndexStats()
+    reusable = previous is not None and previous.root == root
+    known: Dict[str, Dict[str, Any]] = {}
+    known_failed: Dict[str, Dict[str, Any]] = {}
+    if reusable:
+        known = {item["path"]: item for item in previous._items}
+        known_failed = dict(previous.failed)
+
+    reused: List[Dict[str, Any]] = []
+    fresh: List[IndexEntry] = []
+    failed: Dict[str, Dict[str, Any]] = {}
+    for skill_md, relative, stat in _iter_skill_files(root):
+        item = known.pop(relative, None)
+        if _unchanged(item, stat):
+            reused.append(item)
+            continue
+        failure = known_failed.pop(relative, None)
+        if _unchanged(failure, stat):
+            failed[relative] = failure
+            stats.failed.append(relative)
+            continue
+        entry, error = _read_entry(skill_md, relative, stat)
+        if entry is None:
+            log(f"[WARN] {relative}: {error}")
+            failed[relative] = {"mtimeNs": stat.st_mtime_ns, "size": stat.st_size, "error": error}
+            stats.failed.append(relative)
+            continue
+        fresh.append(entry)
+
+    stats.reused = len(reused)
+    stats.parsed = len(fresh)
+    stats.removed = len(known)
+    stats.skills = len(reused) + len(fresh)
+    if reusable and not fresh and not known and not known_failed and failed == previous.failed:
+        return previous, stats
+    entries = [IndexEntry.from_json(item) for item in reused] + fresh
+    return SkillIndex.from_entries(root, entries, failed), stats
+
+
+def load_or_build(skills_root, index_path=None, check=True, log=print) -> SkillIndex:
+    """
+    The saved index for `skills_root`, built if missing. With `check`, SKILL.md
+    files are first compared with the index by size and mtime, and the index
+    is updated and saved when any changed.
+    """
+    index_path = Path(index_path) if index_path else default_index_path(skills_root)
+    index = SkillIndex.load(index_path)
+    if index is not None and index.root == Path(skills_root).resolve() and not check:
+        return index
+    updated, _stats = update_index(skills_root, index, log)
+    if updated is not index:
+        try:
+            updated.save(index_path)
+        except OSError as e:
+            log(f"[WARN] Could not write index: {e}")
+    return updated
+
+
+def format_results(entries: List[IndexEntry], output_format: str) -> str:
+    if output_format == "json":
+        return json.dumps([entry.to_json() for entry in entries], indent=2, default=str)
+    if not entries:
+        return "No matching skills"
+    lines = []
+    for entry in entries:
+        description = entry.description.splitlines()[0] if entry.description else ""
+        lines.append(f"{entry.name}  ({entry.path})")
+        if description:
+            lines.append(f"   {description}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Index skill metadata and look skills up by name or description.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Create or update the index for SKILLS_DIR")
+    query = commands.add_parser("query", help="Look up skills in the index for SKILLS_DIR")
+    for command in (build, query):
+        command.add_argument("skills_dir", help="Directory containing skills")
+        command.add_argument(
+            "--index",
+            help="Index file (default: one per skills directory in the user cache directory)",
+        )
+    build.add_argument(
+        "--full", action="store_true", help="Re-read every SKILL.md instead of only changed ones"
+    )
+    query.add_argument("--name", metavar="PREFIX", help="Skills whose name starts with PREFIX")
+    query.add_argument(
+        "--keyword",
+        action="append",
+        metavar="WORD",
+        help="Skills whose description contains WORD or a word starting with it (repeatable)",
+    )
+    query.add_argument(
+        "--no-check",
+        action="store_true",
+        help="Answer from the saved index without checking SKILL.md files for changes",
+    )
+    query.add_argument("--format", choices=("text", "json"), default="text")
+    args = parser.parse_args()
+
+    if not Path(args.skills_dir).is_dir():
+        print(f"[ERROR] Skills directory not found: {args.skills_dir}")
+        sys.exit(1)
+    index_path = Path(args.index) if args.index else default_index_path(args.skills_dir)
+
+    if args.command == "build":
+        previous = None if args.full else SkillIndex.load(index_path)
+        index, stats = update_index(args.skills_dir, previous)
+        try:
+            index.save(index_path)
+        except OSError as e:
+            print(f"[ERROR] Could not write index: {e}")
+            sys.exit(1)
+        print(
+            f"[OK] Indexed {stats.skills} skills into: {index_path} "
+            f"({stats.parsed} read, {stats.reused} unchanged, {stats.removed} removed)"
+        )
+        if stats.failed:
+            print(f"[WARN] Left out: {', '.join(stats.failed)}")
+        return
+
+    log = lambda message: print(message, file=sys.stderr)  # noqa: E731
+    index = load_or_build(args.skills_dir, index_path, not args.no_check, log)
+    print(format_results(index.query(args.name, args.keyword), args.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Skill Reader - Inspect, verify and extract .skill archives without unzipping them
+
+The archive is memory-mapped and its central directory parsed once into a
+member index. SKILL.md frontmatter and the member list come from that index
+without decompressing any assets; single members are decompressed only when
+read or extracted, and CRC verification runs members in parallel.
+
+Usage:
+    python skill_reader.py <file.skill> [--list] [--verify] [--jobs N]
+                           [--extract MEMBER --dest DIR]
+
+Example:
+    python skill_reader.py dist/my-skill.skill --list
+    python skill_reader.py dist/my-skill.skill --verify --jobs 8
+"""
+
+import argparse
+import io
+import mmap
+import os
+import struct
+import sys
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from quick_validate import frontmatter_from_stream, parse_frontmatter_text
+from skill_archive import UINT32_MAX, decompressor_for
+
+_EOCD = struct.Struct("<4s4H2LH")
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_EOCD = struct.Struct("<4sQ2H2L4Q")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_LOCAL_HEADER_SIZE = 30
+_MAX_COMMENT = 0xFFFF
+_FLAG_ENCRYPTED = 0x01
+_FLAG_UTF8 = 0x800
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Small reads for SKILL.md, so decompression stops soon after the frontmatter ends.
+FRONTMATTER_CHUNK_SIZE = 16 * 1024
+
+
+@dataclass(frozen=True)
+class MemberEntry:
+    name: str
+    method: int
+    flags: int
+    crc: int
+    compress_size: int
+    file_size: int
+    header_offset: int
+    date_time: Tuple[int, int, int, int, int, int]
+    mode: int
+
+    @property
+    def is_dir(self) -> bool:
+        return self.name.endswith("/")
+
+
+class _ChunkStream(io.RawIOBase):
+    """Readable raw stream over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, b"")
+            if not self._pending:
+                return 0
+        count = min(len(buffer), len(self._pending))
+        buffer[:count] = self._pending[:count]
+        self._pending = self._pending[count:]
+        return count
+
+
+def _dos_to_date_time(dos_date: int, dos_time: int) -> Tuple[int, int, int, int, int, int]:
+    return (
+        (dos_date >> 9) + 1980,
+        (dos_date >> 5) & 0xF,
+        dos_date & 0x1F,
+        dos_time >> 11,
+        (dos_time >> 5) & 0x3F,
+        (dos_time & 0x1F) * 2,
+    )
+
+
+def _zip64_values(extra: bytes, wanted: List[bool]) -> List[Optional[int]]:
+    """Pull the 8-byte values flagged in `wanted` from a ZIP64 extra field."""
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, size = struct.unpack_from("<HH", extra, offset)
+        if header_id == 1:
+            data = extra[offset + 4 : offset + 4 + size]
+            values: List[Optional[int]] = []
+            position = 0
+            for needed in wanted:
+                if needed:
+                    if position + 8 > len(data):
+                        raise zipfile.BadZipFile("Truncated ZIP64 extra field")
+                    values.append(struct.unpack_from("<Q", data, position)[0])
+                    position += 8
+                else:
+                    values.append(None)
+            return values
+        offset += 4 + size
+    raise zipfile.BadZipFile("Missing ZIP64 extra field")
+
+
+def _decompress_capped(decompressor, data: bytes, max_length: int) -> Iterator[bytes]:
+    """Decompress `data` in pieces of at most `max_length` bytes, so a member that
+    inflates far past its size never lands in memory whole."""
+    if hasattr(decompressor, "unconsumed_tail"):  # zlib
+        while data:
+            out = decompressor.decompress(data, max_length)
+            data = decompressor.unconsumed_tail
+            if out:
+                yield out
+        return
+    out = decompressor.decompress(data, max_length)  # bz2 and lzma
+    while True:
+        if out:
+            yield out
+        if decompressor.eof or decompressor.needs_input:
+            return
+        out = decompressor.decompress(b"", max_length)
+
+
+class SkillArchiveReader:
+    """Random-access reader for one .skill archive."""
+
+    def __init__(self, path) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            try:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise zipfile.BadZipFile(f"{self.path} is empty") from None
+            self._members = self._read_central_directory()
+        except Exception:
+            self.close()
+            raise
+        self._frontmatter: Optional[dict] = None
+
+    def __enter__(self) -> "SkillArchiveReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _read_central_directory(self) -> Dict[str, MemberEntry]:
+        data = self._map
+        search_start = max(0, len(data) - _EOCD.size - _MAX_COMMENT)
+        eocd_offset = data.rfind(b"PK\x05\x06", search_start)
+        if eocd_offset < 0 or eocd_offset + _EOCD.size > len(data):
+            raise zipfile.BadZipFile(f"{self.path} is not a zip archive")
+        _, _, _, _, count, directory_size, directory_offset, _ = _EOCD.unpack_from(
+            data, eocd_offset
+        )
+        if count == 0xFFFF or directory_size == UINT32_MAX or directory_offset == UINT32_MAX:
+            locator_offset = eocd_offset - _ZIP64_LOCATOR.size
+            signature, _, zip64_offset, _ = _ZIP64_LOCATOR.unpack_from(data, locator_offset)
+            if signature != b"PK\x06\x07":
+                raise zipfile.BadZipFile("Missing ZIP64 end of central directory locator")
+            fields = _ZIP64_EOCD.unpack_from(data, zip64_offset)
+            if fields[0] != b"PK\x06\x06":
+                raise zipfile.BadZipFile("Bad ZIP64 end of central directory record")
+            count, directory_size, directory_offset = fields[7], fields[8], fields[9]
+
+        members: Dict[str, MemberEntry] = {}
+        offset = directory_offset
+        for _ in range(count):
+            if offset + _CENTRAL_HEADER.size > len(data):
+                raise zipfile.BadZipFile("Truncated central directory")
+            (
+                signature,
+                _,
+                _,
+                _,
+                _,
+                flags,
+                method,
+                dos_time,
+                dos_date,
+                crc,
+                compress_size,
+                file_size,
+                name_length,
+                extra_length,
+                comment_length,
+                _,
+                _,
+                external_attr,
+                header_offset,
+            ) = _CENTRAL_HEADER.unpack_from(data, offset)
+            if signature != b"PK\x01\x02":
+                raise zipfile.BadZipFile("Bad central directory header")
+            offset += _CENTRAL_HEADER.size
+            raw_name = data[offset : offset + name_length]
+            extra = data[offset + name_length : offset + name_length + extra_length]
+            offset += name_length + extra_length + comment_length
+            name = raw_name.decode("utf-8" if flags & _FLAG_UTF8 else "cp437")
+
+            wanted = [
+                file_size == UINT32_MAX,
+                compress_size == UINT32_MAX,
+                header_offset == UINT32_MAX,
+            ]
+            if any(wanted):
+                large_size, large_compress, large_offset = _zip64_values(extra, wanted)
+                file_size = large_size if large_size is not None else file_size
+                compress_size = large_compress if large_compress is not None else compress_size
+                header_offset = large_offset if large_offset is not None else header_offset
+
+            members[name] = MemberEntry(
+                name=name,
+                method=method,
+                flags=flags,
+                crc=crc,
+                compress_size=compress_size,
+                file_size=file_size,
+                header_offset=header_offset,
+                date_time=_dos_to_date_time(dos_date, dos_time),
+                mode=external_attr >> 16,
+            )
+        return members
+
+    @property
+    def members(self) -> Dict[str, MemberEntry]:
+        """Member index keyed by archive name, in central directory order."""
+        return self._members
+
+    def names(self) -> List[str]:
+        return list(self._members)
+
+    @property
+    def skill_md_name(self) -> Optional[str]:
+        """Name of the top-level `<skill>/SKILL.md` member, if present."""
+        for name in self._members:
+            parts = PurePosixPath(name).parts
+            if len(parts) == 2 and parts[1] == "SKILL.md":
+                return name
+        return None
+
+    @property
+    def skill_name(self) -> Optional[str]:
+        name = self.skill_md_name
+        return PurePosixPath(name).parts[0] if name else None
+
+    def frontmatter(self) -> dict:
+        """Parsed SKILL.md frontmatter; decompresses only the start of SKILL.md, once."""
+        if self._frontmatter is None:
+            name = self.skill_md_name
+            if name is None:
+                raise KeyError("SKILL.md not found in archive")
+            chunks = self.iter_member(name, FRONTMATTER_CHUNK_SIZE)
+            try:
+                stream = io.TextIOWrapper(io.BufferedReader(_ChunkStream(chunks)), "utf-8")
+                frontmatter_text, error = frontmatter_from_stream(stream)
+            finally:
+                chunks.close()
+            if frontmatter_text is None:
+                raise ValueError(error)
+            frontmatter, error = parse_frontmatter_text(frontmatter_text)
+            if frontmatter is None:
+                raise ValueError(error)
+            self._frontmatter = frontmatter
+        return self._frontmatter
+
+    def _data_range(self, entry: MemberEntry) -> Tuple[int, int]:
+        data = self._map
+        offset = entry.header_offset
+        if data[offset : offset + 4] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"{entry.name}: bad local file header")
+        name_length, extra_length = struct.unpack_from("<2H", data, offset + 26)
+        start = offset + _LOCAL_HEADER_SIZE + name_length + extra_length
+        if start + entry.compress_size > len(data):
+            raise zipfile.BadZipFile(f"{entry.name}: truncated member data")
+        return start, start + entry.compress_size
+
+    def iter_member(self, name: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield a member's decompressed bytes in chunks, checking size and CRC at the end.
+
+        No chunk is larger than `chunk_size`, and decompression stops as soon as
+        the output passes the member's recorded size.
+
+        Raises:
+            KeyError: if there is no such member
+            zipfile.BadZipFile: if the data is corrupt
+        """
+        entry = self._members[name]
+        if entry.flags & _FLAG_ENCRYPTED:
+            raise NotImplementedError(f"{name} is encrypted")
+        start, end = self._data_range(entry)
+        decompressor = decompressor_for(entry.method)
+        crc = 0
+        size = 0
+        for position in range(start, end, chunk_size):
+            # Slicing the map copies one chunk; no buffer stays exported past close().
+            chunk = self._map[position : min(position + chunk_size, end)]
+            if decompressor is None:
+                pieces: Iterable[bytes] = (chunk,)
+            else:
+                pieces = _decompress_capped(decompressor, chunk, chunk_size)
+            for out in pieces:
+                crc = zlib.crc32(out, crc)
+                size += len(out)
+                if size > entry.file_size:
+                    raise zipfile.BadZipFile(f"{name} inflates past its recorded size")
+                yield out
+        if decompressor is not None and hasattr(decompressor, "flush"):
+            tail = decompressor.flush()
+            if tail:
+                crc = zlib.crc32(tail, crc)
+                size += len(tail)
+                yield tail
+        if size != entry.file_size or crc != entry.crc:
+            raise zipfile.BadZipFile(f"Bad CRC-32 or size for {name}")
+
+    def read(self, name: str) -> bytes:
+        """Decompress a single member into memory."""
+        return b"".join(self.iter_member(name))
+
+    def extract(self, name: str, dest_dir) -> Path:
+        """
+        Extract one member below `dest_dir` and return its path.
+
+        Raises:
+            KeyError: if there is no such member
+            ValueError: if the member name would escape `dest_dir`
+        """
+        entry = self._members[name]
+        dest_root = Path(dest_dir).resolve()
+        target = (dest_root / name).resolve()
+        if PurePosixPath(name).is_absolute() or dest_root not in target.parents:
+            raise ValueError(f"Refusing to extract {name!r} outside {dest_root}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if entry.is_dir:
+            target.mkdir(exist_ok=True)
+            return target
+        temp_target = target.with_name(f".{target.name}.{os.getpid()}.part")
+        try:
+            with open(temp_target, "wb") as handle:
+                for chunk in self.iter_member(name):
+                    handle.write(chunk)
+            os.replace(temp_target, target)
+        finally:
+            temp_target.unlink(missing_ok=True)
+        if entry.mode & 0o111:
+            target.chmod(0o755)
+        return target
+
+    def _verify_member(self, name: str) -> Optional[str]:
+        try:
+            for _ in self.iter_member(name):
+                pass
+        except Exception as e:  # zlib, bz2 and lzma each raise their own error types
+            return f"{name}: {e}"
+        return None
+
+    def verify(self, jobs: Optional[int] = None) -> List[str]:
+        """Check every member's CRC in parallel; returns a list of problems (empty if ok)."""
+        names = [name for name, entry in self._members.items() if not entry.is_dir]
+        jobs = jobs or os.cpu_count() or 1
+        if jobs <= 1:
+            results = map(self._verify_member, names)
+            return [problem for problem in results if problem]
+        # zlib, bz2 and lzma release the GIL while decompressing.
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            return [problem for problem in pool.map(self._verify_member, names) if problem]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect, verify or extract a .skill archive.")
+    parser.add_argument("archive", help="Path to the .skill file")
+    parser.add_argument("--list", action="store_true", help="List members with their sizes")
+    parser.add_argument("--verify", action="store_true", help="Check every member's CRC")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--extract", metavar="MEMBER", help="Extract a single member")
+    parser.add_argument("--dest", default=".", help="Directory for --extract (default: cwd)")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    try:
+        reader = SkillArchiveReader(args.archive)
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"[ERROR] Could not open {args.archive}: {e}")
+        sys.exit(1)
+
+    with reader:
+        try:
+            frontmatter = reader.frontmatter()
+        except (
+            KeyError,
+            ValueError,
+            UnicodeDecodeError,
+            NotImplementedError,
+            zipfile.BadZipFile,
+        ) as e:
+            print(f"[ERROR] Could not read SKILL.md: {e}")
+            sys.exit(1)
+        print(f"Skill: {frontmatter.get('name', reader.skill_name)}")
+        print(f"Description: {frontmatter.get('description', '')}")
+        print(f"Members: {len(reader.members)}")
+
+        if args.list:
+            for entry in reader.members.values():
+                print(f"  {entry.file_size:>12,} {entry.compress_size:>12,}  {entry.name}")
+
+        exit_code = 0
+        if args.verify:
+            problems = reader.verify(args.jobs)
+            for problem in problems:
+                print(f"[ERROR] {problem}")
+            if problems:
+                exit_code = 1
+            else:
+                print("[OK] All member CRCs match")
+
+        if args.extract:
+            try:
+                target = reader.extract(args.extract, args.dest)
+            except KeyError:
+                print(f"[ERROR] No such member: {args.extract}")
+                sys.exit(1)
+            except (ValueError, NotImplementedError, zipfile.BadZipFile) as e:
+                print(f"[ERROR] {e}")
+                sys.exit(1)
+            print(f"[OK] Extracted {args.extract} to {target}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Single-pass skill directory walker built on os.scandir.
+
+Excluded and ignored directories are pruned before they are opened, symlinks
+are never followed, and each file's stat result comes from its DirEntry so
+the archiver does not stat it again. Patterns from a `.skillignore` file at
+the skill root are applied during the walk.
+"""
+
+import fnmatch
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+IGNORE_FILENAME = ".skillignore"
+
+
+class IgnoreRules:
+    """
+    Glob patterns in the spirit of .gitignore, without negation.
+
+    A pattern without a slash matches the entry name at any depth
+    (`*.log`, `node_modules`); a pattern with a slash matches the path
+    relative to the skill root (`assets/raw/*`, `/build`). A trailing
+    slash restricts the pattern to directories.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()) -> None:
+        self._name_patterns: List[Tuple[str, bool]] = []
+        self._path_patterns: List[Tuple[str, bool]] = []
+        for raw in patterns:
+            pattern = raw.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            if "/" in pattern:
+                self._path_patterns.append((pattern.lstrip("/"), dir_only))
+            elif pattern:
+                self._name_patterns.append((pattern, dir_only))
+
+    @classmethod
+    def from_file(cls, path: Path) -> "IgnoreRules":
+        try:
+            return cls(path.read_text(encoding="utf-8").splitlines())
+        except FileNotFoundError:
+            return cls()
+
+    def __bool__(self) -> bool:
+        return bool(self._name_patterns or self._path_patterns)
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        """True if `rel_path` (POSIX, relative to the skill root) is ignored."""
+        name = rel_path.rsplit("/", 1)[-1]
+        for pattern, dir_only in self._name_patterns:
+            if (is_dir or not dir_only) and fnmatch.fnmatchcase(name, pattern):
+                return True
+        for pattern, dir_only in self._path_patterns:
+            if (is_dir or not dir_only) and fnmatch.fnmatchcase(rel_path, pattern):
+                return True
+        return False
+
+
+def walk_skill(
+    root: Path,
+    excluded_names: Iterable[str] = (),
+    ignore: Optional[IgnoreRules] = None,
+    on_symlink: Optional[Callable[[Path], None]] = None,
+) -> Iterator[Tuple[Path, str, os.stat_result]]:
+    """
+    Yield (path, relative POSIX path, stat) for every regular file under `root`.
+
+    Entries are visited in sorted order. `root` should already be resolved;
+    each directory is resolved once on entry so the yielded paths are real
+    paths and callers can check they stay inside the root without a
+    per-file resolve(). Entries named in `excluded_names` or matched by
+    `ignore` are skipped, and directories among them are never opened.
+    """
+    excluded = frozenset(excluded_names)
+    ignore = ignore or IgnoreRules()
+    stack: List[Tuple[str, str]] = [(os.path.realpath(root), "")]
+    while stack:
+        directory, rel_dir = stack.pop()
+        with os.scandir(directory) as entries:
+            ordered = sorted(entries, key=lambda entry: entry.name)
+        subdirs = []
+        for entry in ordered:
+            if entry.name in excluded:
+                continue
+            rel_path = f"{rel_dir}{entry.name}"
+            # Security: never follow or package symlinks.
+            if entry.is_symlink():
+                if on_symlink is not None:
+                    on_symlink(Path(entry.path))
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if not ignore.matches(rel_path, True):
+                    subdirs.append((os.path.realpath(entry.path), f"{rel_path}/"))
+            elif entry.is_file(follow_symlinks=False):
+                if not ignore.matches(rel_path, False):
+                    yield Path(entry.path), rel_path, entry.stat(follow_symlinks=False)
+        # Depth-first, in name order: push in reverse so the smallest pops first.
+        stack.extend(reversed(subdirs))
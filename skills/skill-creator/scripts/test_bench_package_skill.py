@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the package_skill benchmark.
+"""
+
+import sys
+from pathlib import Path
+from unittest import TestCase, main
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+import bench_package_skill  # noqa: E402
+
+
+class TestBenchPackageSkill(TestCase):
+    def test_reports_every_job_count(self):
+        report = bench_package_skill.run_benchmark(
+            size_mib=1, files=4, jobs_values=[1, 2], repeat=1
+        )
+
+        self.assertEqual([item["jobs"] for item in report["results"]], [1, 2])
+        self.assertEqual(report["results"][0]["speedup"], 1.0)
+        for item in report["results"]:
+            self.assertGreater(item["archiveBytes"], 0)
+        self.assertIn("speedup", bench_package_skill.render_report(report))
+
+
+if __name__ == "__main__":
+    main()
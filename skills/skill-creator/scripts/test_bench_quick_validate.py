@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the frontmatter parser benchmark.
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase, main
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+import bench_quick_validate  # noqa: E402
+
+
+class TestBenchQuickValidate(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_bench_validate_"))
+        for name in ("alpha", "beta"):
+            (self.temp_dir / name).mkdir()
+            (self.temp_dir / name / "SKILL.md").write_text(
+                f"---\nname: {name}\ndescription: The {name} skill.\n"
+                "allowed-tools: [Bash]\nmetadata:\n  tier: 2\n---\n# Body\n"
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_times_every_available_parser(self):
+        report = bench_quick_validate.run_benchmark(self.temp_dir, repeat=1)
+
+        parsers = [item["parser"] for item in report["results"]]
+        self.assertEqual(report["documents"], 2)
+        self.assertEqual(parsers[-1], "subset")
+        self.assertEqual(report["results"][0]["speedup"], 1.0)
+        for item in report["results"]:
+            self.assertEqual(item.get("matchesSafeLoader", 2), 2)
+        self.assertIn("us/doc", bench_quick_validate.render_report(report))
+
+
+if __name__ == "__main__":
+    main()
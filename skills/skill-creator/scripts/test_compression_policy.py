@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-member compression policy.
+"""
+
+import os
+import zipfile
+from unittest import TestCase, main
+
+from compression_policy import CompressionPolicy, byte_entropy
+
+
+class TestCompressionPolicy(TestCase):
+    def test_entropy_separates_text_from_random_bytes(self):
+        self.assertEqual(byte_entropy(b""), 0.0)
+        self.assertEqual(byte_entropy(b"aaaa"), 0.0)
+        self.assertLess(byte_entropy(b"def run():\n    return 1\n" * 100), 5.0)
+        self.assertGreater(byte_entropy(os.urandom(65536)), 7.9)
+
+    def test_stores_known_media_extensions_without_sampling(self):
+        policy = CompressionPolicy()
+
+        self.assertEqual(policy.choose("skill/assets/Photo.PNG", b"a" * 100), (0, None))
+        self.assertEqual(policy.choose("skill/voice.onnx", b""), (zipfile.ZIP_STORED, None))
+
+    def test_high_entropy_unknown_files_are_stored(self):
+        policy = CompressionPolicy(method=zipfile.ZIP_LZMA)
+
+        self.assertEqual(policy.choose("skill/blob.bin", os.urandom(4096)), (0, None))
+        self.assertEqual(
+            policy.choose("skill/notes.md", b"# Notes\n" * 200), (zipfile.ZIP_LZMA, None)
+        )
+
+    def test_level_applies_to_compressible_members(self):
+        policy = CompressionPolicy(level=9)
+
+        self.assertEqual(policy.choose("skill/SKILL.md", b"---\n"), (zipfile.ZIP_DEFLATED, 9))
+        self.assertEqual(
+            CompressionPolicy(method=zipfile.ZIP_STORED).choose("a.md", b"x"), (0, None)
+        )
+
+
+if __name__ == "__main__":
+    main()
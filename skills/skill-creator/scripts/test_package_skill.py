@@ -3,8 +3,12 @@
 Regression tests for skill packaging security behavior.
 """
 
+import hashlib
+import io
+import os
 import sys
 import tempfile
+import threading
 import types
 import zipfile
 from pathlib import Path
@@ -17,11 +21,14 @@ if str(SCRIPT_DIR) not in sys.path:
 
 
 fake_quick_validate = types.ModuleType("quick_validate")
-fake_quick_validate.validate_skill = lambda _path: (True, "Skill is valid!")
+fake_quick_validate.validate_skill = lambda _path, _cache=None: (True, "Skill is valid!")
+fake_quick_validate.ValidationCache = object
 original_quick_validate = sys.modules.get("quick_validate")
 sys.modules["quick_validate"] = fake_quick_validate
 
 import package_skill as package_skill_module
+from compression_policy import CompressionPolicy
+from package_manifest import manifest_path_for
 from package_skill import package_skill
 
 if original_quick_validate is not None:
@@ -155,6 +162,302 @@ class TestPackageSkillSecurity(TestCase):
         self.assertIn("self-output-skill/script.py", names)
         self.assertNotIn("self-output-skill/self-output-skill.skill", names)
 
+    def test_parallel_and_serial_archives_match(self):
+        skill_dir = self.create_skill("parallel-skill")
+        assets = skill_dir / "assets"
+        assets.mkdir()
+        for index in range(12):
+            (assets / f"data-{index}.txt").write_text(f"row {index}\n" * (index * 400 + 1))
+
+        serial = package_skill(str(skill_dir), str(self.temp_dir / "serial"), jobs=1)
+        with patch.object(package_skill_module, "STREAM_THRESHOLD", 2048):
+            parallel = package_skill(str(skill_dir), str(self.temp_dir / "parallel"), jobs=4)
+
+        with zipfile.ZipFile(serial) as left, zipfile.ZipFile(parallel) as right:
+            self.assertIsNone(right.testzip())
+            self.assertEqual(left.namelist(), right.namelist())
+            for name in left.namelist():
+                self.assertEqual(left.read(name), right.read(name))
+
+    def test_media_is_stored_and_text_uses_selected_method(self):
+        skill_dir = self.create_skill("media-skill")
+        (skill_dir / "photo.png").write_bytes(b"\x89PNG" + b"\x00" * 4096)
+        (skill_dir / "weights.bin").write_bytes(os.urandom(8192))
+        (skill_dir / "notes.md").write_text("# Notes\n" * 500)
+        policy = CompressionPolicy(method=zipfile.ZIP_BZIP2, level=9)
+
+        output = io.StringIO()
+        with patch("sys.stdout", output):
+            result = package_skill(str(skill_dir), str(self.temp_dir), policy=policy, report=True)
+
+        with zipfile.ZipFile(result) as archive:
+            self.assertIsNone(archive.testzip())
+            methods = {info.filename: info.compress_type for info in archive.infolist()}
+        self.assertEqual(methods["media-skill/photo.png"], zipfile.ZIP_STORED)
+        self.assertEqual(methods["media-skill/weights.bin"], zipfile.ZIP_STORED)
+        self.assertEqual(methods["media-skill/notes.md"], zipfile.ZIP_BZIP2)
+        report = output.getvalue()
+        self.assertIn("Ratio", report)
+        self.assertRegex(report, r"media-skill/notes\.md\s+bzip2")
+        self.assertRegex(report, r"media-skill/photo\.png\s+store")
+
+    def test_incremental_reuses_unchanged_members(self):
+        skill_dir = self.create_skill("incremental-skill")
+        (skill_dir / "notes.md").write_text("# Notes\n" * 200)
+        out_dir = self.temp_dir / "out"
+
+        first = package_skill(str(skill_dir), str(out_dir), incremental=True)
+        self.assertTrue(manifest_path_for(first).exists())
+        (skill_dir / "script.py").write_text("print('changed')\n")
+        os.utime(skill_dir / "notes.md", ns=(1, 1))  # new mtime, same content: reused by hash
+
+        compressed = []
+        original_compress = package_skill_module.compress_member
+
+        def tracking_compress(info, data, level=None):
+            compressed.append(info.arcname)
+            return original_compress(info, data, level)
+
+        output = io.StringIO()
+        with patch.object(package_skill_module, "compress_member", tracking_compress):
+            with patch("sys.stdout", output):
+                second = package_skill(str(skill_dir), str(out_dir), incremental=True)
+
+        self.assertEqual(compressed, ["incremental-skill/script.py"])
+        self.assertIn("Reused 2 of 3 members", output.getvalue())
+        with zipfile.ZipFile(second) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.read("incremental-skill/script.py"), b"print('changed')\n")
+            self.assertEqual(archive.read("incremental-skill/notes.md"), b"# Notes\n" * 200)
+
+    def test_sidecars_get_the_same_mode_as_the_archive(self):
+        skill_dir = self.create_skill("mode-skill")
+        out_dir = self.temp_dir / "out"
+
+        archive = package_skill(str(skill_dir), str(out_dir), incremental=True)
+
+        mode = archive.stat().st_mode & 0o777
+        self.assertEqual(manifest_path_for(archive).stat().st_mode & 0o777, mode)
+        self.assertNotEqual(mode, 0o600)
+
+    def test_incremental_rebuilds_when_archive_changed(self):
+        skill_dir = self.create_skill("stale-skill")
+        out_dir = self.temp_dir / "out"
+        first = package_skill(str(skill_dir), str(out_dir), incremental=True)
+        first.write_bytes(b"not a zip")
+
+        output = io.StringIO()
+        with patch("sys.stdout", output):
+            second = package_skill(str(skill_dir), str(out_dir), incremental=True)
+
+        self.assertIn("Reused 0 of 2 members", output.getvalue())
+        with zipfile.ZipFile(second) as archive:
+            self.assertIsNone(archive.testzip())
+
+    def test_package_all_reports_each_skill(self):
+        skills_root = self.temp_dir / "skills"
+        skills_root.mkdir()
+        for name in ("alpha-skill", "beta-skill", "broken-skill"):
+            skill_dir = skills_root / name
+            skill_dir.mkdir()
+            (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\ndescription: test\n---\n")
+        (skills_root / "not-a-skill").mkdir()
+        out_dir = self.temp_dir / "dist"
+
+        def fake_validate(path, cache=None):
+            if Path(path).name == "broken-skill":
+                return False, "Missing 'description' in frontmatter"
+            return True, "Skill is valid!"
+
+        with patch.object(package_skill_module, "validate_skill", fake_validate):
+            results = package_skill_module.package_all(skills_root, out_dir, jobs=2)
+
+        self.assertEqual(
+            [(result.name, result.status) for result in results],
+            [("alpha-skill", "ok"), ("beta-skill", "ok"), ("broken-skill", "invalid")],
+        )
+        self.assertTrue((out_dir / "alpha-skill.skill").exists())
+        self.assertFalse((out_dir / "broken-skill.skill").exists())
+        self.assertGreater(results[0].size, 0)
+        summary = package_skill_module.format_summary(results, 0.5)
+        self.assertIn("Missing 'description'", summary)
+        self.assertIn("2 packaged, 1 invalid, 0 failed", summary)
+
+    def test_package_all_isolates_exceptions_to_their_skill(self):
+        skills_root = self.temp_dir / "skills"
+        for name in ("alpha-skill", "crashy-skill", "latin1-skill"):
+            (skills_root / name).mkdir(parents=True)
+            (skills_root / name / "SKILL.md").write_text(f"---\nname: {name}\n---\n")
+        out_dir = self.temp_dir / "dist"
+        real_package_skill = package_skill_module.package_skill
+
+        def fake_validate(path, cache=None):
+            if Path(path).name == "latin1-skill":
+                raise UnicodeDecodeError("utf-8", b"\xe9", 0, 1, "invalid continuation byte")
+            return True, "Skill is valid!"
+
+        def flaky_package_skill(skill_path, *args, **kwargs):
+            if Path(skill_path).name == "crashy-skill":
+                raise RuntimeError("disk on fire")
+            return real_package_skill(skill_path, *args, **kwargs)
+
+        with (
+            patch.object(package_skill_module, "validate_skill", fake_validate),
+            patch.object(package_skill_module, "package_skill", flaky_package_skill),
+        ):
+            results = package_skill_module.package_all(skills_root, out_dir, jobs=2)
+
+        self.assertEqual(
+            [(result.name, result.status) for result in results],
+            [("alpha-skill", "ok"), ("crashy-skill", "failed"), ("latin1-skill", "invalid")],
+        )
+        self.assertEqual(results[1].message, "disk on fire")
+        self.assertIn("invalid continuation byte", results[2].message)
+        self.assertTrue((out_dir / "alpha-skill.skill").exists())
+
+    def test_reproducible_archives_are_byte_identical_and_skip_unchanged_inputs(self):
+        skill_dir = self.create_skill("repro-skill")
+        (skill_dir / "lib").mkdir()
+        (skill_dir / "lib" / "util.py").write_text("VALUE = 1\n" * 50)
+
+        first = package_skill(str(skill_dir), str(self.temp_dir / "a"), jobs=1, reproducible=True)
+        os.utime(skill_dir / "script.py", ns=(10**18, 10**18))
+        (skill_dir / "lib" / "util.py").chmod(0o600)
+        second = package_skill(str(skill_dir), str(self.temp_dir / "b"), jobs=4, reproducible=True)
+
+        self.assertEqual(first.read_bytes(), second.read_bytes())
+        with zipfile.ZipFile(first) as archive:
+            infos = archive.infolist()
+        self.assertEqual([info.filename for info in infos], sorted(info.filename for info in infos))
+        self.assertEqual({info.date_time for info in infos}, {(1980, 1, 1, 0, 0, 0)})
+        self.assertEqual({info.external_attr >> 16 for info in infos}, {0o100644})
+
+        output = io.StringIO()
+        with patch.object(package_skill_module, "compress_member", side_effect=AssertionError):
+            with patch("sys.stdout", output):
+                third = package_skill(str(skill_dir), str(self.temp_dir / "b"), reproducible=True)
+        self.assertEqual(third, second)
+        self.assertIn("Inputs unchanged", output.getvalue())
+        self.assertIn(hashlib.sha256(second.read_bytes()).hexdigest(), output.getvalue())
+
+        (skill_dir / "script.py").write_text("print('changed')\n")
+        fourth = package_skill(str(skill_dir), str(self.temp_dir / "b"), reproducible=True)
+        self.assertNotEqual(fourth.read_bytes(), first.read_bytes())
+
+    def test_skillignore_patterns_are_not_packaged(self):
+        skill_dir = self.create_skill("ignore-skill")
+        (skill_dir / ".skillignore").write_text("*.tmp\nfixtures/\n")
+        (skill_dir / "scratch.tmp").write_text("tmp\n")
+        (skill_dir / "fixtures").mkdir()
+        (skill_dir / "fixtures" / "big.json").write_text("{}\n")
+        (skill_dir / "node_modules" / "dep").mkdir(parents=True)
+        (skill_dir / "node_modules" / "dep" / "index.js").write_text("module.exports = 1\n")
+
+        result = package_skill(str(skill_dir), str(self.temp_dir / "out"))
+
+        with zipfile.ZipFile(result) as archive:
+            names = set(archive.namelist())
+        self.assertEqual(
+            names,
+            {"ignore-skill/.skillignore", "ignore-skill/SKILL.md", "ignore-skill/script.py"},
+        )
+
+    def test_iter_skill_archive_yields_bounded_chunks_of_a_valid_zip(self):
+        skill_dir = self.create_skill("stream-skill")
+        (skill_dir / "data.bin").write_bytes(os.urandom(300_000))
+
+        with patch("sys.stdout", io.StringIO()):
+            chunks = list(
+                package_skill_module.iter_skill_archive(skill_dir, jobs=2, chunk_size=64 * 1024)
+            )
+
+        self.assertGreater(len(chunks), 4)
+        self.assertTrue(all(len(chunk) <= 64 * 1024 for chunk in chunks))
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertIn("stream-skill/data.bin", archive.namelist())
+
+    def test_iter_skill_archive_stops_early_and_reports_errors(self):
+        skill_dir = self.create_skill("early-skill")
+        (skill_dir / "data.bin").write_bytes(os.urandom(300_000))
+
+        chunks = package_skill_module.iter_skill_archive(skill_dir, chunk_size=1024)
+        self.assertTrue(next(chunks).startswith(b"PK\x03\x04"))
+        chunks.close()
+
+        with self.assertRaisesRegex(RuntimeError, "SKILL.md not found"):
+            list(package_skill_module.iter_skill_archive(self.temp_dir))
+
+    def test_stream_skill_writes_to_a_non_seekable_stream(self):
+        skill_dir = self.create_skill("pipe-skill")
+        read_fd, write_fd = os.pipe()
+        received = []
+
+        def drain():
+            with os.fdopen(read_fd, "rb") as reader:
+                received.append(reader.read())
+
+        reader_thread = threading.Thread(target=drain)
+        reader_thread.start()
+        with os.fdopen(write_fd, "wb") as writer:
+            with patch("sys.stdout", io.StringIO()):
+                ok = package_skill_module.stream_skill(skill_dir, writer)
+        reader_thread.join()
+
+        self.assertTrue(ok)
+        with zipfile.ZipFile(io.BytesIO(received[0])) as archive:
+            self.assertEqual(
+                sorted(archive.namelist()), ["pipe-skill/SKILL.md", "pipe-skill/script.py"]
+            )
+
+    def test_size_budgets_fail_before_anything_is_compressed(self):
+        skill_dir = self.create_skill("budget-skill")
+        (skill_dir / "model.bin").write_bytes(b"\0" * 4096)
+        out_dir = self.temp_dir / "out"
+
+        output = io.StringIO()
+        with patch.object(package_skill_module, "compress_member", side_effect=AssertionError):
+            with patch("sys.stdout", output):
+                per_file = package_skill(str(skill_dir), str(out_dir), max_file_size=1024)
+                total = package_skill(str(skill_dir), str(out_dir), max_total_size=2048)
+
+        self.assertIsNone(per_file)
+        self.assertIsNone(total)
+        self.assertIn("budget-skill/model.bin (4.0 KiB)", output.getvalue())
+        self.assertIn("over the limit of 2.0 KiB", output.getvalue())
+        self.assertFalse((out_dir / "budget-skill.skill").exists())
+
+    def test_progress_counts_bytes_through_streamed_members(self):
+        skill_dir = self.create_skill("progress-skill")
+        payload = os.urandom(50_000)
+        (skill_dir / "large.bin").write_bytes(payload)
+        total = sum(path.stat().st_size for path in skill_dir.iterdir())
+        updates = []
+
+        with patch.object(package_skill_module, "STREAM_THRESHOLD", 10_000):
+            with patch("sys.stdout", io.StringIO()):
+                result = package_skill(
+                    str(skill_dir),
+                    str(self.temp_dir / "out"),
+                    buffer_size=4096,
+                    progress=lambda done, expected: updates.append((done, expected)),
+                )
+
+        self.assertEqual({expected for _, expected in updates}, {total})
+        self.assertEqual([done for done, _ in updates], sorted(done for done, _ in updates))
+        self.assertEqual(updates[-1][0], total)
+        self.assertGreater(len(updates), 50_000 // 4096)
+        with zipfile.ZipFile(result) as archive:
+            self.assertEqual(archive.read("progress-skill/large.bin"), payload)
+
+    def test_parse_size_accepts_binary_suffixes(self):
+        self.assertEqual(package_skill_module.parse_size("512"), 512)
+        self.assertEqual(package_skill_module.parse_size("64k"), 64 * 1024)
+        self.assertEqual(package_skill_module.parse_size("1.5MiB"), 3 * 512 * 1024)
+        self.assertEqual(package_skill_module.parse_size("2G"), 2 << 30)
+        with self.assertRaises(ValueError):
+            package_skill_module.parse_size("ten megs")
+
 
 if __name__ == "__main__":
     main()
@@ -3,9 +3,12 @@
 Regression tests for quick skill validation.
 """
 
+import json
+import os
 import tempfile
 from pathlib import Path
 from unittest import TestCase, main
+from unittest.mock import patch
 
 import quick_validate
 
@@ -62,10 +65,122 @@ metadata: |
         quick_validate.yaml = None
         try:
             valid, message = quick_validate.validate_skill(skill_dir)
+            frontmatter, error = quick_validate.parse_frontmatter(content)
         finally:
             quick_validate.yaml = previous_yaml
 
         self.assertTrue(valid, message)
+        self.assertIsNone(error)
+        self.assertEqual(frontmatter["allowed-tools"], ["gh"])
+        self.assertEqual(frontmatter["metadata"], '{\n  "owners": ["team-openclaw"]\n}')
+
+    def test_skill_errors_collects_every_problem(self):
+        skill_dir = self.temp_dir / "messy-skill"
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        content = "---\nname: Bad--Name\ndescription: Uses <tags>\nhomepage: x\n---\n"
+        (skill_dir / "SKILL.md").write_text(content, encoding="utf-8")
+
+        errors = quick_validate.skill_errors(skill_dir)
+        valid, message = quick_validate.validate_skill(skill_dir)
+
+        self.assertEqual(len(errors), 4)
+        self.assertTrue(errors[0].startswith("Unexpected key(s)"))
+        self.assertIn("angle brackets", errors[-1])
+        self.assertFalse(valid)
+        self.assertEqual(message, errors[0])
+
+    def test_validate_all_finds_nested_skills_and_reports_json(self):
+        for rel, description in [
+            ("public/good-skill", "Fine"),
+            ("private/team/bad-skill", "Has <angle> brackets"),
+        ]:
+            skill_dir = self.temp_dir / rel
+            (skill_dir / "nested").mkdir(parents=True)
+            name = skill_dir.name
+            (skill_dir / "SKILL.md").write_text(
+                f"---\nname: {name}\ndescription: {description}\n---\n", encoding="utf-8"
+            )
+            # A SKILL.md inside a skill is content, not another skill.
+            (skill_dir / "nested" / "SKILL.md").write_text("not frontmatter\n")
+        (self.temp_dir / "node_modules" / "dep").mkdir(parents=True)
+        (self.temp_dir / "node_modules" / "dep" / "SKILL.md").write_text("x\n")
+
+        reports = quick_validate.validate_all(self.temp_dir, jobs=2)
+        payload = json.loads(quick_validate.format_reports(reports, self.temp_dir, 0.5, "json"))
+
+        self.assertEqual(
+            [skill["name"] for skill in payload["skills"]],
+            ["private/team/bad-skill", "public/good-skill"],
+        )
+        self.assertEqual((payload["valid"], payload["invalid"]), (1, 1))
+        self.assertEqual(
+            payload["skills"][0]["errors"], ["Description cannot contain angle brackets (< or >)"]
+        )
+        self.assertTrue(all(skill["seconds"] >= 0 for skill in payload["skills"]))
+
+    def test_undecodable_skill_md_is_reported_without_stopping_the_run(self):
+        for name in ("good-skill", "latin1-skill"):
+            (self.temp_dir / name).mkdir()
+            (self.temp_dir / name / "SKILL.md").write_text(
+                f"---\nname: {name}\ndescription: Caf\u00e9\n---\n", encoding="utf-8"
+            )
+        (self.temp_dir / "latin1-skill" / "SKILL.md").write_bytes(
+            b"---\nname: latin1-skill\ndescription: Caf\xe9\n---\n"
+        )
+        cache = quick_validate.ValidationCache(self.temp_dir / "cache.json")
+
+        for jobs, skill_cache in ((1, None), (2, None), (1, cache), (2, cache)):
+            with self.subTest(jobs=jobs, cached=skill_cache is not None):
+                reports = quick_validate.validate_all(self.temp_dir, jobs=jobs, cache=skill_cache)
+
+                self.assertEqual([report.valid for report in reports], [True, False])
+                self.assertTrue(reports[1].errors[0].startswith("Could not read SKILL.md:"))
+
+    def test_cache_skips_parsing_until_content_or_rules_change(self):
+        skill_dir = self.temp_dir / "cached-skill"
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        skill_md = skill_dir / "SKILL.md"
+        skill_md.write_text("---\nname: cached-skill\ndescription: ok\n---\n", encoding="utf-8")
+        cache_file = self.temp_dir / "cache.json"
+
+        cache = quick_validate.ValidationCache(cache_file)
+        self.assertEqual(quick_validate.skill_errors(skill_dir, cache), [])
+        cache.save()
+
+        cache = quick_validate.ValidationCache(cache_file)
+        self.assertEqual(len(cache), 1)
+        with patch.object(quick_validate, "frontmatter_errors", side_effect=AssertionError):
+            self.assertEqual(quick_validate.skill_errors(skill_dir, cache), [])
+            os.utime(skill_md, ns=(1, 1))  # touched but unchanged: matched by hash
+            self.assertEqual(quick_validate.skill_errors(skill_dir, cache), [])
+            with open(skill_md, "a", encoding="utf-8") as handle:
+                handle.write("# Body edits do not change the result\n")
+            self.assertEqual(quick_validate.skill_errors(skill_dir, cache), [])
+
+        skill_md.write_text("---\nname: cached-skill\n---\n", encoding="utf-8")
+        self.assertEqual(
+            quick_validate.skill_errors(skill_dir, cache), ["Missing 'description' in frontmatter"]
+        )
+        cache.save()
+
+        with patch.object(quick_validate, "ALLOWED_PROPERTIES", frozenset({"name"})):
+            self.assertEqual(len(quick_validate.ValidationCache(cache_file)), 0)
+
+    def test_frontmatter_reader_ignores_the_body_and_bounds_its_size(self):
+        skill_md = self.temp_dir / "SKILL.md"
+        frontmatter = "---\r\nname: long-skill\r\ndescription: ok\r\n---\r\n"
+        # Undecodable bytes deep in the body would fail any read of the whole file.
+        skill_md.write_bytes(frontmatter.encode() + b"body\n" * 100_000 + b"\xff\xfe")
+
+        text, error = quick_validate.read_frontmatter(skill_md)
+        self.assertEqual(text, "name: long-skill\ndescription: ok")
+        self.assertIsNone(error)
+        self.assertEqual(quick_validate.skill_errors(self.temp_dir), [])
+
+        skill_md.write_text("---\nname: x\n" + "a: b\n" * 100, encoding="utf-8")
+        text, error = quick_validate.read_frontmatter(skill_md, max_chars=200)
+        self.assertIsNone(text)
+        self.assertEqual(error, "Frontmatter is longer than 200 characters")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the sequential .skill archive writer.
+"""
+
+import io
+import os
+import tempfile
+import zipfile
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import skill_archive
+from skill_archive import MemberInfo, SkillArchiveWriter, compress_member
+from skill_reader import SkillArchiveReader
+
+
+class NonSeekableBuffer(io.RawIOBase):
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer.extend(data)
+        return len(data)
+
+
+class TestSkillArchiveWriter(TestCase):
+    def test_members_round_trip_through_zipfile(self):
+        output = NonSeekableBuffer()
+        payload = b"print('hello')\n" * 500
+        with SkillArchiveWriter(output) as writer:
+            writer.add(compress_member(MemberInfo("demo/SKILL.md"), b"---\nname: demo\n---\n"))
+            writer.add(
+                compress_member(MemberInfo("demo/stored.bin", method=zipfile.ZIP_STORED), payload)
+            )
+            writer.add_stream(
+                MemberInfo("demo/big.py", mode=0o100755),
+                [payload[:1000], payload[1000:]],
+                len(payload),
+            )
+
+        with zipfile.ZipFile(io.BytesIO(bytes(output.buffer))) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(
+                archive.namelist(), ["demo/SKILL.md", "demo/stored.bin", "demo/big.py"]
+            )
+            self.assertEqual(archive.read("demo/stored.bin"), payload)
+            self.assertEqual(archive.read("demo/big.py"), payload)
+            info = archive.getinfo("demo/big.py")
+            self.assertEqual(info.external_attr >> 16, 0o100755)
+            self.assertLess(info.compress_size, info.file_size)
+
+    def test_each_method_round_trips_through_zipfile(self):
+        output = io.BytesIO()
+        payload = b"print('hello')\n" * 500
+        methods = {
+            "deflate.py": (zipfile.ZIP_DEFLATED, 1),
+            "bzip2.py": (zipfile.ZIP_BZIP2, 9),
+            "lzma.py": (zipfile.ZIP_LZMA, None),
+        }
+        with SkillArchiveWriter(output) as writer:
+            for name, (method, level) in methods.items():
+                writer.add(compress_member(MemberInfo(name, method=method), payload, level))
+
+        with zipfile.ZipFile(output) as archive:
+            self.assertIsNone(archive.testzip())
+            for name, (method, _level) in methods.items():
+                self.assertEqual(archive.getinfo(name).compress_type, method)
+                self.assertEqual(archive.read(name), payload)
+        with self.assertRaises(NotImplementedError):
+            skill_archive.compressor_for(93)
+
+    def test_non_ascii_names_are_flagged_utf8(self):
+        output = io.BytesIO()
+        with SkillArchiveWriter(output) as writer:
+            writer.add(compress_member(MemberInfo("demo/résumé.md"), b"text"))
+
+        with zipfile.ZipFile(output) as archive:
+            self.assertEqual(archive.namelist(), ["demo/résumé.md"])
+            self.assertEqual(archive.read("demo/résumé.md"), b"text")
+
+    def test_zip64_records_are_written_past_the_limits(self):
+        output = io.BytesIO()
+        payload = bytes(range(256)) * 40
+        with patch.object(skill_archive, "ZIP64_LIMIT", 1000):
+            with patch.object(skill_archive, "ZIP_FILECOUNT_LIMIT", 2):
+                with SkillArchiveWriter(output) as writer:
+                    writer.add(compress_member(MemberInfo("demo/SKILL.md"), b"---\n---\n"))
+                    writer.add(
+                        compress_member(
+                            MemberInfo("demo/raw.bin", method=zipfile.ZIP_STORED), payload
+                        )
+                    )
+                    writer.add_stream(
+                        MemberInfo("demo/big.bin"), [payload, payload], 2 * len(payload)
+                    )
+
+        data = output.getvalue()
+        self.assertIn(b"PK\x06\x06", data)
+        self.assertIn(b"PK\x06\x07", data)
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.read("demo/big.bin"), payload * 2)
+
+        handle, path = tempfile.mkstemp(suffix=".skill")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "wb") as archive_file:
+            archive_file.write(data)
+        with SkillArchiveReader(path) as reader:
+            self.assertEqual(reader.verify(), [])
+            self.assertEqual(reader.read("demo/raw.bin"), payload)
+
+
+if __name__ == "__main__":
+    main()
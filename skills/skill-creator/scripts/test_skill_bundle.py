@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for content-addressed skill bundles.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from collections import Counter
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import skill_bundle
+from package_skill import package_skill
+
+
+class TestSkillBundle(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_bundle_"))
+        self.skills_dir = self.temp_dir / "skills"
+        self.shared = os.urandom(20_000)
+        for name in ("alpha", "beta"):
+            skill_dir = self.skills_dir / name
+            (skill_dir / "scripts").mkdir(parents=True)
+            (skill_dir / "SKILL.md").write_text(
+                f"---\nname: {name}\ndescription: The {name} skill.\n---\n\n# {name}\n"
+            )
+            (skill_dir / "scripts" / "common.bin").write_bytes(self.shared)
+            (skill_dir / "notes.md").write_text("# Shared notes\n" * 100)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_shared_content_is_stored_once_and_exports_match_packaging(self):
+        bundle = self.temp_dir / "skills.bundle"
+
+        with patch("sys.stdout", io.StringIO()):
+            stats = skill_bundle.build_bundle(self.skills_dir, bundle, jobs=2, reproducible=True)
+            exported = skill_bundle.export_bundle(bundle, self.temp_dir / "exported")
+            packaged = package_skill(
+                self.skills_dir / "alpha", self.temp_dir / "packaged", reproducible=True
+            )
+
+        self.assertEqual(stats.skills, ["alpha", "beta"])
+        self.assertEqual(stats.files, 6)
+        self.assertEqual(stats.blobs, 4)  # two SKILL.md files, one notes.md, one common.bin
+        with zipfile.ZipFile(bundle) as archive:
+            blobs = [name for name in archive.namelist() if name.startswith("blobs/")]
+        self.assertEqual(len(blobs), 4)
+
+        self.assertEqual([path.name for path in exported], ["alpha.skill", "beta.skill"])
+        self.assertEqual(exported[0].read_bytes(), packaged.read_bytes())
+        with zipfile.ZipFile(exported[1]) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.read("beta/scripts/common.bin"), self.shared)
+
+    def test_each_path_keeps_the_method_packaging_would_pick(self):
+        text = b"compressible text\n" * 500
+        (self.skills_dir / "alpha" / "data.png").write_bytes(text)
+        (self.skills_dir / "beta" / "data.txt").write_bytes(text)
+        bundle = self.temp_dir / "skills.bundle"
+        reads = Counter()
+        read_bytes = Path.read_bytes
+
+        def counting_read(path):
+            reads[path] += 1
+            return read_bytes(path)
+
+        with patch("sys.stdout", io.StringIO()):
+            with patch.object(Path, "read_bytes", counting_read):
+                stats = skill_bundle.build_bundle(self.skills_dir, bundle, reproducible=True)
+            exported = skill_bundle.export_bundle(bundle, self.temp_dir / "exported")
+            packaged = [
+                package_skill(self.skills_dir / name, self.temp_dir / "packaged", reproducible=True)
+                for name in ("alpha", "beta")
+            ]
+
+        self.assertEqual(stats.blobs, 6)  # data.* is stored for .png, deflated for .txt
+        self.assertEqual(len(reads), stats.files)
+        self.assertEqual(set(reads.values()), {1})
+        for exported_path, packaged_path in zip(exported, packaged):
+            self.assertEqual(exported_path.read_bytes(), packaged_path.read_bytes())
+
+    def test_large_files_are_compressed_while_hashed(self):
+        bundle = self.temp_dir / "skills.bundle"
+
+        with patch("sys.stdout", io.StringIO()), patch("skill_bundle.STREAM_THRESHOLD", 1000):
+            stats = skill_bundle.build_bundle(self.skills_dir, bundle, reproducible=True)
+            exported = skill_bundle.export_bundle(bundle, self.temp_dir / "exported")
+            packaged = package_skill(
+                self.skills_dir / "alpha", self.temp_dir / "packaged", reproducible=True
+            )
+
+        self.assertEqual(stats.blobs, 4)
+        self.assertEqual(exported[0].read_bytes(), packaged.read_bytes())
+
+    def test_validator_exceptions_only_leave_out_their_skill(self):
+        original = skill_bundle.validate_skill
+
+        def flaky_validate(skill):
+            if skill.name == "alpha":
+                raise RuntimeError("disk on fire")
+            return original(skill)
+
+        output = io.StringIO()
+        with (
+            patch("sys.stdout", output),
+            patch.object(skill_bundle, "validate_skill", flaky_validate),
+        ):
+            stats = skill_bundle.build_bundle(self.skills_dir, self.temp_dir / "skills.bundle")
+
+        self.assertEqual((stats.skills, stats.failed), (["beta"], ["alpha"]))
+        self.assertIn("[ERROR] alpha: Validation failed: disk on fire", output.getvalue())
+
+    def test_invalid_skills_are_left_out_and_unknown_names_rejected(self):
+        (self.skills_dir / "broken").mkdir()
+        (self.skills_dir / "broken" / "SKILL.md").write_text("no frontmatter\n")
+        bundle = self.temp_dir / "skills.bundle"
+        output = io.StringIO()
+
+        with patch("sys.stdout", output):
+            stats = skill_bundle.build_bundle(self.skills_dir, bundle)
+            only_beta = skill_bundle.export_bundle(bundle, self.temp_dir / "out", ["beta"])
+            missing = skill_bundle.export_bundle(bundle, self.temp_dir / "out", ["broken"])
+
+        self.assertEqual(stats.failed, ["broken"])
+        self.assertEqual(stats.skills, ["alpha", "beta"])
+        self.assertEqual([path.name for path in only_beta], ["beta.skill"])
+        self.assertIsNone(missing)
+        self.assertIn("[ERROR] Not in bundle: broken", output.getvalue())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the skill metadata index.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import skill_index
+
+
+class TestSkillIndex(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_skill_index_"))
+        self.skills_dir = self.temp_dir / "skills"
+        self.index_path = self.temp_dir / "index.json"
+        self.write_skill("git-helper", "Review GitHub pull requests.", "allowed-tools: [Bash]\n")
+        self.write_skill("git-lfs", "Track large files.")
+        self.write_skill("pdf-forms", "Fill PDF forms.", "metadata:\n  tier: 2\n")
+        self.write_skill("team/weather", "Forecasts for reviews outdoors.")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_skill(self, path, description, extra=""):
+        skill_dir = self.skills_dir / path
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        name = Path(path).name
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: {description}\n{extra}---\n# {name}\n"
+        )
+        return skill_dir / "SKILL.md"
+
+    def build(self):
+        previous = skill_index.SkillIndex.load(self.index_path)
+        index, stats = skill_index.update_index(self.skills_dir, previous, log=lambda _: None)
+        index.save(self.index_path)
+        return index, stats
+
+    def test_queries_by_name_prefix_and_keywords(self):
+        self.build()
+        index = skill_index.SkillIndex.load(self.index_path)
+
+        self.assertEqual(len(index), 4)
+        self.assertEqual([e.name for e in index.query("git")], ["git-helper", "git-lfs"])
+        self.assertEqual([e.name for e in index.query("gitx")], [])
+        self.assertEqual(
+            [e.name for e in index.query(keywords=["review"])], ["git-helper", "weather"]
+        )
+        self.assertEqual([e.name for e in index.query(keywords=["pdf", "FORM"])], ["pdf-forms"])
+        self.assertEqual([e.name for e in index.query("w", ["review"])], ["weather"])
+        helper = index.query("git-helper")[0]
+        self.assertEqual(helper.allowed_tools, ["Bash"])
+        self.assertEqual(index.query("pdf")[0].metadata, {"tier": 2})
+        self.assertEqual(index.query("weather")[0].path, "team/weather")
+
+    def test_rebuild_reads_only_changed_skills(self):
+        _index, stats = self.build()
+        self.assertEqual((stats.parsed, stats.reused), (4, 0))
+
+        changed = self.write_skill("git-lfs", "Track huge binaries.")
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        shutil.rmtree(self.skills_dir / "pdf-forms")
+        (self.skills_dir / "broken").mkdir()
+        (self.skills_dir / "broken" / "SKILL.md").write_text("no frontmatter\n")
+        (self.skills_dir / "latin1").mkdir()
+        (self.skills_dir / "latin1" / "SKILL.md").write_bytes(b"---\nname: caf\xe9\n---\n")
+
+        index, stats = self.build()
+
+        self.assertEqual((stats.parsed, stats.reused, stats.removed), (1, 2, 1))
+        self.assertEqual(stats.failed, ["broken", "latin1"])
+        self.assertEqual([e.name for e in index.query(keywords=["huge"])], ["git-lfs"])
+        self.assertEqual(index.query("pdf"), [])
+
+    def test_loaded_tables_are_used_without_rebuilding(self):
+        self.build()
+        decode = skill_index.IndexEntry.from_json
+
+        with (
+            patch.object(skill_index.SkillIndex, "from_entries", side_effect=AssertionError),
+            patch.object(skill_index.IndexEntry, "from_json", side_effect=decode) as decoded,
+        ):
+            index = skill_index.SkillIndex.load(self.index_path)
+            by_name = index.query("git")
+            by_keyword = index.query(keywords=["forecast"])
+
+        self.assertEqual([e.name for e in by_name], ["git-helper", "git-lfs"])
+        self.assertEqual([e.name for e in by_keyword], ["weather"])
+        self.assertEqual(decoded.call_count, 3)  # only the matches are decoded
+
+    def test_load_or_build_checks_for_changed_skills(self):
+        log = lambda _: None  # noqa: E731
+        (self.skills_dir / "broken").mkdir()
+        (self.skills_dir / "broken" / "SKILL.md").write_text("no frontmatter\n")
+        skill_index.load_or_build(self.skills_dir, self.index_path, log=log)
+
+        changed = self.write_skill("git-lfs", "Track huge binaries.")
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        index = skill_index.load_or_build(self.skills_dir, self.index_path, log=log)
+        self.assertEqual([e.name for e in index.query(keywords=["huge"])], ["git-lfs"])
+        stale = skill_index.load_or_build(self.skills_dir, self.index_path, check=False)
+        self.assertEqual([e.name for e in stale.query(keywords=["huge"])], ["git-lfs"])
+
+        # Nothing changed: no SKILL.md is read, not even the broken one, and nothing is saved.
+        with (
+            patch.object(skill_index, "_read_entry", side_effect=AssertionError),
+            patch.object(skill_index.SkillIndex, "save", side_effect=AssertionError),
+        ):
+            index = skill_index.load_or_build(self.skills_dir, self.index_path, log=log)
+        self.assertEqual(len(index), 4)
+        self.assertEqual(list(index.failed), ["broken"])
+
+
+if __name__ == "__main__":
+    main()
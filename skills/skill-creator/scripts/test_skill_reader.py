@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped .skill archive reader.
+"""
+
+import io
+import shutil
+import tempfile
+import zipfile
+import zlib
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import skill_reader
+from skill_archive import MemberInfo, SkillArchiveWriter
+from skill_reader import SkillArchiveReader
+
+SKILL_MD = "---\nname: reader-skill\ndescription: Reads archives\n---\n# Reader\n"
+
+
+class TestSkillArchiveReader(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_skill_reader_"))
+        self.archive = self.temp_dir / "reader-skill.skill"
+        self.payload = b"line of text\n" * 5000
+        with zipfile.ZipFile(self.archive, "w") as archive:
+            archive.writestr("reader-skill/SKILL.md", SKILL_MD, zipfile.ZIP_DEFLATED)
+            archive.writestr("reader-skill/a.txt", self.payload, zipfile.ZIP_DEFLATED)
+            archive.writestr("reader-skill/b.txt", self.payload, zipfile.ZIP_BZIP2)
+            archive.writestr("reader-skill/c.txt", self.payload, zipfile.ZIP_LZMA)
+            archive.writestr("reader-skill/d.bin", self.payload, zipfile.ZIP_STORED)
+            archive.writestr("../evil.txt", b"nope")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_index_and_frontmatter_without_reading_assets(self):
+        with SkillArchiveReader(self.archive) as reader:
+            self.assertEqual(reader.skill_name, "reader-skill")
+            self.assertEqual(reader.frontmatter()["description"], "Reads archives")
+            self.assertEqual(len(reader.names()), 6)
+            entry = reader.members["reader-skill/b.txt"]
+            self.assertEqual(entry.method, zipfile.ZIP_BZIP2)
+            self.assertEqual(entry.file_size, len(self.payload))
+
+    def test_frontmatter_stops_before_the_body(self):
+        archive_path = self.temp_dir / "long-skill.skill"
+        # Undecodable bytes deep in the body would fail any read of the whole member.
+        body = SKILL_MD.encode() + b"text\n" * 100_000 + b"\xff\xfe"
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("long-skill/SKILL.md", body, zipfile.ZIP_DEFLATED)
+
+        with SkillArchiveReader(archive_path) as reader:
+            self.assertEqual(reader.frontmatter()["name"], "reader-skill")
+
+    def test_reads_each_compression_method(self):
+        with SkillArchiveReader(self.archive) as reader:
+            for name in ("a.txt", "b.txt", "c.txt", "d.bin"):
+                self.assertEqual(reader.read(f"reader-skill/{name}"), self.payload)
+            chunks = list(reader.iter_member("reader-skill/d.bin", chunk_size=4096))
+            self.assertGreater(len(chunks), 1)
+            # Chunks smaller than the LZMA header still decode.
+            chunks = list(reader.iter_member("reader-skill/c.txt", chunk_size=3))
+            self.assertEqual(b"".join(chunks), self.payload)
+            self.assertEqual(max(map(len, chunks)), 3)
+
+    def test_extract_single_member_and_refuse_traversal(self):
+        dest = self.temp_dir / "dest"
+        with SkillArchiveReader(self.archive) as reader:
+            target = reader.extract("reader-skill/c.txt", dest)
+            with self.assertRaises(ValueError):
+                reader.extract("../evil.txt", dest)
+
+        self.assertEqual(target.read_bytes(), self.payload)
+        self.assertEqual([path.name for path in dest.rglob("*") if path.is_file()], ["c.txt"])
+        self.assertFalse((self.temp_dir / "evil.txt").exists())
+
+    def test_extract_checks_the_member_before_creating_directories(self):
+        dest = self.temp_dir / "dest"
+        with SkillArchiveReader(self.archive) as reader, self.assertRaises(KeyError):
+            reader.extract("reader-skill/missing/x.txt", dest)
+        self.assertFalse(dest.exists())
+
+    def test_decompression_is_capped_at_the_recorded_size(self):
+        bomb = self.temp_dir / "bomb.skill"
+        data = b"\0" * (32 * 1024 * 1024)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        packed = compressor.compress(data) + compressor.flush()
+        info = MemberInfo("bomb/SKILL.md", crc=zlib.crc32(data[:100]), file_size=100)
+        info.compress_size = len(packed)
+        with open(bomb, "wb") as handle, SkillArchiveWriter(handle) as writer:
+            writer.add_raw(info, [packed])
+
+        sizes = []
+        with SkillArchiveReader(bomb) as reader, self.assertRaises(zipfile.BadZipFile):
+            for chunk in reader.iter_member("bomb/SKILL.md", chunk_size=4096):
+                sizes.append(len(chunk))
+        self.assertLessEqual(sum(sizes), 4096)
+
+    def test_cli_reports_encrypted_members(self):
+        data = bytearray(self.archive.read_bytes())
+        # The last copy of the name is in the central directory, 46 bytes past
+        # the start of its header; the general purpose flags sit at offset 8.
+        header = data.rfind(b"reader-skill/a.txt") - 46
+        data[header + 8] |= 0x01
+        self.archive.write_bytes(bytes(data))
+        argv = ["skill_reader.py", str(self.archive), "--extract", "reader-skill/a.txt"]
+        output = io.StringIO()
+
+        with patch("sys.argv", argv), patch("sys.stdout", output):
+            with self.assertRaises(SystemExit) as exit_info:
+                skill_reader.main()
+
+        self.assertEqual(exit_info.exception.code, 1)
+        self.assertIn("[ERROR] reader-skill/a.txt is encrypted", output.getvalue())
+
+    def test_verify_reports_corrupt_members(self):
+        with SkillArchiveReader(self.archive) as reader:
+            self.assertEqual(reader.verify(jobs=4), [])
+            entry = reader.members["reader-skill/d.bin"]
+
+        data = bytearray(self.archive.read_bytes())
+        data[entry.header_offset + 30 + len(entry.name) + 10] ^= 0xFF
+        self.archive.write_bytes(bytes(data))
+
+        with SkillArchiveReader(self.archive) as reader:
+            problems = reader.verify(jobs=2)
+        self.assertEqual(len(problems), 1)
+        self.assertIn("reader-skill/d.bin", problems[0])
+
+    def test_rejects_non_zip_files(self):
+        bogus = self.temp_dir / "bogus.skill"
+        bogus.write_bytes(b"not a zip at all")
+        with self.assertRaises(zipfile.BadZipFile):
+            SkillArchiveReader(bogus)
+        bogus.write_bytes(b"")
+        with self.assertRaises(zipfile.BadZipFile):
+            SkillArchiveReader(bogus)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the scandir-based skill walker and .skillignore rules.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import skill_walk
+from skill_walk import IgnoreRules, walk_skill
+
+
+class TestIgnoreRules(TestCase):
+    def test_name_path_and_directory_patterns(self):
+        rules = IgnoreRules(["# comment", "", "*.log", "/build", "assets/raw/*", "cache/"])
+
+        self.assertTrue(rules.matches("debug.log", False))
+        self.assertTrue(rules.matches("deep/nested/debug.log", False))
+        self.assertTrue(rules.matches("build", True))
+        self.assertFalse(rules.matches("src/build", True))
+        self.assertTrue(rules.matches("assets/raw/take1.wav", False))
+        self.assertFalse(rules.matches("assets/final.wav", False))
+        self.assertTrue(rules.matches("lib/cache", True))
+        self.assertFalse(rules.matches("lib/cache", False))
+        self.assertFalse(IgnoreRules(["# only comments"]))
+
+
+class TestWalkSkill(TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp(prefix="test_walk_")).resolve()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, rel_path, text="x"):
+        path = self.root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return path
+
+    def test_yields_sorted_files_with_stat_and_prunes_excluded_dirs(self):
+        self.write("SKILL.md", "---\n")
+        self.write("scripts/run.py", "print(1)\n")
+        self.write("node_modules/pkg/index.js")
+        self.write("assets/raw/take1.wav")
+        self.write("assets/logo.svg")
+        self.write("notes.log")
+        ignore = IgnoreRules(["*.log", "assets/raw/"])
+
+        opened = []
+        real_scandir = skill_walk.os.scandir
+
+        def tracking_scandir(path):
+            opened.append(Path(path).relative_to(self.root).as_posix())
+            return real_scandir(path)
+
+        with patch.object(skill_walk.os, "scandir", tracking_scandir):
+            results = list(walk_skill(self.root, {"node_modules"}, ignore))
+
+        self.assertEqual(
+            [rel for _path, rel, _stat in results],
+            ["SKILL.md", "assets/logo.svg", "scripts/run.py"],
+        )
+        self.assertEqual(results[2][2].st_size, len("print(1)\n"))
+        self.assertEqual(results[2][0], self.root / "scripts" / "run.py")
+        self.assertNotIn("node_modules", opened)
+        self.assertNotIn("assets/raw", opened)
+
+    def test_reports_and_skips_symlinks(self):
+        self.write("SKILL.md")
+        outside = Path(tempfile.mkdtemp(prefix="test_walk_outside_"))
+        self.addCleanup(shutil.rmtree, outside)
+        (outside / "secret.txt").write_text("secret")
+        try:
+            (self.root / "docs").symlink_to(outside, target_is_directory=True)
+            (self.root / "loot.txt").symlink_to(outside / "secret.txt")
+        except (OSError, NotImplementedError):
+            self.skipTest("symlink unsupported on this platform")
+
+        skipped = []
+        results = list(walk_skill(self.root, on_symlink=skipped.append))
+
+        self.assertEqual([rel for _path, rel, _stat in results], ["SKILL.md"])
+        self.assertEqual(sorted(path.name for path in skipped), ["docs", "loot.txt"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the YAML subset used when PyYAML is not installed.
+"""
+
+from unittest import TestCase, main, skipIf
+
+import yaml_subset
+
+try:
+    import yaml
+except ModuleNotFoundError:
+    yaml = None
+
+
+FRONTMATTER = """\
+name: deploy-helper  # trailing comment
+description: >-
+  Deploys things
+  safely.
+allowed-tools:
+  - Bash
+  - "Read"
+  - 'Write'
+version: 1.5
+private: false
+license: null
+metadata:
+  openclaw:
+    emoji: "\\U0001F680"
+    requires: { bins: [git, gh], env: [] }
+    install:
+      - id: brew
+        kind: brew
+        bins: [gh]
+  notes: |
+    line one
+    line two
+"""
+
+
+class TestYamlSubset(TestCase):
+    def test_nested_metadata_and_tool_lists(self):
+        data = yaml_subset.load(FRONTMATTER)
+
+        self.assertEqual(data["name"], "deploy-helper")
+        self.assertEqual(data["description"], "Deploys things safely.")
+        self.assertEqual(data["allowed-tools"], ["Bash", "Read", "Write"])
+        self.assertEqual((data["version"], data["private"], data["license"]), (1.5, False, None))
+        openclaw = data["metadata"]["openclaw"]
+        self.assertEqual(openclaw["emoji"], "\U0001f680")
+        self.assertEqual(openclaw["requires"], {"bins": ["git", "gh"], "env": []})
+        self.assertEqual(openclaw["install"], [{"id": "brew", "kind": "brew", "bins": ["gh"]}])
+        self.assertEqual(data["metadata"]["notes"], "line one\nline two\n")
+        if yaml is not None:
+            self.assertEqual(data, yaml.safe_load(FRONTMATTER))
+
+    def test_flow_collections_span_lines(self):
+        text = 'metadata: {\n  "a": [1, 2,\n    3],  # comment\n  b: on,\n}\nnext: 1\n'
+
+        self.assertEqual(
+            yaml_subset.load(text), {"metadata": {"a": [1, 2, 3], "b": True}, "next": 1}
+        )
+
+    def test_rejects_what_it_does_not_support(self):
+        for text in (
+            "base: &anchor value\ncopy: *anchor\n",
+            "when: !!timestamp 2024-01-01\n",
+            "? complex\n: key\n",
+            "name: a\n\tdescription: tabbed\n",
+            "name: one: two\n",
+            "a: -\n",
+            "a: =\n",
+            "a: <<\n",
+            "name: - a\n",
+            "a: x # c\n  y\n",
+            "a: ]\n",
+            "a: |+# c\n  x\n",
+            "--- a\n",
+        ):
+            with self.subTest(text=text), self.assertRaises(yaml_subset.SubsetError):
+                yaml_subset.load(text)
+
+
+@skipIf(yaml is None, "PyYAML is not installed")
+class TestMatchesSafeLoad(TestCase):
+    def assertSameAsSafeLoad(self, text):
+        expected = yaml.safe_load(text)
+        loaded = yaml_subset.load(text)
+        self.assertEqual(loaded, expected)
+        self.assertEqual(repr(loaded), repr(expected))  # also tells 1 from True and 1.0
+
+    def test_block_scalar_chomping(self):
+        for text in (
+            "a: |+\n  x\n",
+            "a: |+\n  x\n\n\n",
+            "a: |+\n  x",
+            "a: |\n  x\n\n",
+            "a: >-\n  x\n  y\n\n",
+            "a: |2\n   x\n",
+            "a: |\n\n  x\n# c\n",
+            "a: |+\n  x\n\nb: 1\n",
+        ):
+            with self.subTest(text=text):
+                self.assertSameAsSafeLoad(text)
+
+    def test_plain_scalar_types(self):
+        for text in (
+            "when: 2024-01-05\n",
+            "when: 2024-01-05 10:20:30.5 +02:00\n",
+            "when: 2024-1-5T10:20:30Z\n",
+            "mode: 012\n",
+            "mask: 0b101\n",
+            "hex: -0x1F\n",
+            "elapsed: 190:20:30\n",
+            "elapsed: 190:20:30.15\n",
+            "big: 1_000\n",
+            "exp: 1.0e5\n",
+            "exp: 1.0e+5\n",
+            "inf: -.inf\n",
+            "yes: 1\n1: yes\n~: off\n",
+            "flow: [012, 2024-01-05, 1:30, .inf]\n",
+        ):
+            with self.subTest(text=text):
+                self.assertSameAsSafeLoad(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,650 @@
+#!/usr/bin/env python3
+"""
+Parser for the subset of YAML that SKILL.md frontmatter uses.
+
+quick_validate falls back to this when PyYAML is not installed. It covers
+block mappings and sequences (including `- key: value` items), flow
+collections spanning several lines with trailing commas, plain, single- and
+double-quoted scalars, `|` and `>` block scalars with chomping indicators,
+and comments. Whatever it accepts loads exactly as yaml.safe_load would,
+with plain scalars resolved by SafeLoader's rules (timestamps, octal and
+sexagesimal numbers included). Anchors, aliases, tags, complex keys, merge
+keys, nested inline sequences (`- - a`) and document markers are outside the
+subset, and like malformed input raise SubsetError rather than being misread.
+"""
+
+import datetime
+import re
+from typing import Any, List, Optional, Tuple, Union
+
+# Implicit resolvers of PyYAML's SafeLoader (yaml/resolver.py), so plain
+# scalars get the same types as they do under yaml.safe_load.
+_BOOL = re.compile(
+    r"^(?:yes|Yes|YES|no|No|NO|true|True|TRUE|false|False|FALSE|on|On|ON|off|Off|OFF)$"
+)
+_FLOAT = re.compile(
+    r"""^(?:[-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+][0-9]+)?
+    |\.[0-9][0-9_]*(?:[eE][-+][0-9]+)?
+    |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*
+    |[-+]?\.(?:inf|Inf|INF)
+    |\.(?:nan|NaN|NAN))$""",
+    re.X,
+)
+_INT = re.compile(
+    r"""^(?:[-+]?0b[0-1_]+
+    |[-+]?0[0-7_]+
+    |[-+]?(?:0|[1-9][0-9_]*)
+    |[-+]?0x[0-9a-fA-F_]+
+    |[-+]?[1-9][0-9_]*(?::[0-5]?[0-9])+)$""",
+    re.X,
+)
+_NULL = re.compile(r"^(?:~|null|Null|NULL|)$")
+_TIMESTAMP = re.compile(
+    r"""^(?P<year>[0-9][0-9][0-9][0-9])
+    -(?P<month>[0-9][0-9]?)
+    -(?P<day>[0-9][0-9]?)
+    (?:(?:[Tt]|[ \t]+)
+    (?P<hour>[0-9][0-9]?)
+    :(?P<minute>[0-9][0-9])
+    :(?P<second>[0-9][0-9])
+    (?:\.(?P<fraction>[0-9]*))?
+    (?:[ \t]*(?P<tz>Z|(?P<tz_sign>[-+])(?P<tz_hour>[0-9][0-9]?)
+    (?::(?P<tz_minute>[0-9][0-9]))?))?)?$""",
+    re.X,
+)
+_IMPLICIT_TIMESTAMP = re.compile(
+    r"""^(?:[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]
+    |[0-9][0-9][0-9][0-9] -[0-9][0-9]? -[0-9][0-9]?
+    (?:[Tt]|[ \t]+)[0-9][0-9]?
+    :[0-9][0-9] :[0-9][0-9] (?:\.[0-9]*)?
+    (?:[ \t]*(?:Z|[-+][0-9][0-9]?(?::[0-9][0-9])?))?)$""",
+    re.X,
+)
+# `<<` and `=` resolve to the merge and value tags, which SafeLoader cannot
+# construct as values, so yaml.safe_load rejects them; so does this parser.
+_UNCONSTRUCTABLE = {"<<": "merge keys (<<)", "=": "value indicators (=)"}
+_ESCAPES = {
+    "0": "\0",
+    "a": "\a",
+    "b": "\b",
+    "t": "\t",
+    "\t": "\t",
+    "n": "\n",
+    "v": "\v",
+    "f": "\f",
+    "r": "\r",
+    "e": "\x1b",
+    " ": " ",
+    '"': '"',
+    "/": "/",
+    "\\": "\\",
+    "N": "\x85",
+    "_": "\xa0",
+    "L": "\u2028",
+    "P": "\u2029",
+}
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+_SPACES = ("", " ", "\t", "\n")
+_RESERVED_STARTS = ("&", "*", "!", "%", "@", "`")
+_BLOCK_HEADER = re.compile(r"([|>])([-+]?)([1-9]?)([-+]?)(?:[ \t]+(?:#.*)?)?$")
+_DOCUMENT_MARKER = re.compile(r"(?:---|\.\.\.)(?:[ \t]|$)")
+
+
+class SubsetError(ValueError):
+    """Raised for malformed input or YAML features outside the supported subset."""
+
+
+def _check_plain_start(text: str, flow: bool = False, where: str = "") -> None:
+    """Raise unless `text` may begin a plain scalar (or, in a value, a flow or quoted one)."""
+    first, second = text[:1], text[1:2]
+    if first in _RESERVED_STARTS:
+        raise SubsetError(f"{where}unsupported YAML syntax {first!r}")
+    if first in (",", "]", "}", "|", ">", "#"):
+        raise SubsetError(f"{where}unexpected {first!r}")
+    # As in PyYAML's scanner: `-`, `?` and `:` start a plain scalar only when
+    # followed by a non-space, and inside flow collections `?` and `:` never do.
+    spaced = second in _SPACES
+    if first == "-" and spaced:
+        raise SubsetError(f"{where}sequence entries are not allowed here")
+    if first == "?" and (spaced or flow):
+        raise SubsetError(f"{where}complex mapping keys are not supported")
+    if first == ":" and (spaced or flow):
+        raise SubsetError(f"{where}empty mapping keys are not supported")
+
+
+def _sexagesimal(parts: List[Any]) -> Any:
+    value = 0
+    for part in parts:
+        value = value * 60 + part
+    return value
+
+
+def _construct_int(text: str) -> int:
+    value = text.replace("_", "")
+    sign = -1 if value[0] == "-" else 1
+    if value[0] in "+-":
+        value = value[1:]
+    if value == "0":
+        return 0
+    if value.startswith("0b"):
+        return sign * int(value[2:], 2)
+    if value.startswith("0x"):
+        return sign * int(value[2:], 16)
+    if value[0] == "0":
+        return sign * int(value, 8)
+    if ":" in value:
+        return sign * _sexagesimal([int(part) for part in value.split(":")])
+    return sign * int(value)
+
+
+def _construct_float(text: str) -> float:
+    value = text.replace("_", "").lower()
+    sign = -1 if value[0] == "-" else 1
+    if value[0] in "+-":
+        value = value[1:]
+    if value == ".inf":
+        return sign * float("inf")
+    if value == ".nan":
+        return float("nan")
+    if ":" in value:
+        return sign * _sexagesimal([float(part) for part in value.split(":")])
+    return sign * float(value)
+
+
+def _construct_timestamp(text: str) -> Union[datetime.date, datetime.datetime]:
+    values = _TIMESTAMP.match(text).groupdict()
+    year, month, day = int(values["year"]), int(values["month"]), int(values["day"])
+    if not values["hour"]:
+        return datetime.date(year, month, day)
+    fraction = int((values["fraction"] or "")[:6].ljust(6, "0"))
+    tzinfo = None
+    if values["tz_sign"]:
+        delta = datetime.timedelta(
+            hours=int(values["tz_hour"]), minutes=int(values["tz_minute"] or 0)
+        )
+        tzinfo = datetime.timezone(-delta if values["tz_sign"] == "-" else delta)
+    elif values["tz"]:
+        tzinfo = datetime.timezone.utc
+    return datetime.datetime(
+        year,
+        month,
+        day,
+        int(values["hour"]),
+        int(values["minute"]),
+        int(values["second"]),
+        fraction,
+        tzinfo=tzinfo,
+    )
+
+
+def resolve_plain(text: str) -> Any:
+    """
+    Type a plain (unquoted) scalar as PyYAML's SafeLoader does: nulls, YAML 1.1
+    booleans, integers (including octal, binary and base 60), floats and
+    timestamps. Raises SubsetError where SafeLoader would fail to construct it.
+    """
+    if text in _UNCONSTRUCTABLE:
+        raise SubsetError(f"{_UNCONSTRUCTABLE[text]} are not supported")
+    if _NULL.match(text):
+        return None
+    try:
+        if _BOOL.match(text):
+            return text.lower() in ("yes", "true", "on")
+        if _INT.match(text):
+            return _construct_int(text)
+        if _FLOAT.match(text):
+            return _construct_float(text)
+        if _IMPLICIT_TIMESTAMP.match(text):
+            return _construct_timestamp(text)
+    except ValueError as e:
+        raise SubsetError(f"invalid scalar {text!r}: {e}") from None
+    return text
+
+
+def _fold_lines(lines: List[str]) -> str:
+    """Join scalar lines: single breaks become spaces, each blank line one newline."""
+    parts: List[str] = []
+    blank = 0
+    for line in lines:
+        if not line:
+            blank += 1
+            continue
+        if parts:
+            parts.append("\n" * blank if blank else " ")
+        parts.append(line)
+        blank = 0
+    return "".join(parts)
+
+
+def _strip_comment(text: str) -> str:
+    """Drop a trailing `# comment` from a plain scalar."""
+    match = re.search(r"(?:^|\s)#", text)
+    return text[: match.start()] if match else text
+
+
+def _unescape(text: str) -> str:
+    out = []
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char != "\\":
+            out.append(char)
+            index += 1
+            continue
+        code = text[index + 1 : index + 2]
+        if code in _ESCAPES:
+            out.append(_ESCAPES[code])
+            index += 2
+        elif code in _HEX_ESCAPES:
+            width = _HEX_ESCAPES[code]
+            digits = text[index + 2 : index + 2 + width]
+            if len(digits) != width or not all(c in "0123456789abcdefABCDEF" for c in digits):
+                raise SubsetError(f"invalid escape \\{code}{digits}")
+            out.append(chr(int(digits, 16)))
+            index += 2 + width
+        else:
+            raise SubsetError(f"invalid escape \\{code}")
+    return "".join(out)
+
+
+def scan_quoted(text: str, start: int) -> Tuple[str, int]:
+    """Parse the quoted scalar opening at `text[start]`; return (value, index after it)."""
+    quote = text[start]
+    index = start + 1
+    raw = []
+    while True:
+        if index >= len(text):
+            raise SubsetError("unterminated quoted scalar")
+        char = text[index]
+        if quote == "'" and char == "'":
+            if text[index + 1 : index + 2] == "'":
+                raw.append("'")
+                index += 2
+                continue
+            break
+        if quote == '"' and char == "\\":
+            raw.append(text[index : index + 2])
+            index += 2
+            continue
+        if quote == '"' and char == '"':
+            break
+        raw.append(char)
+        index += 1
+    lines = "".join(raw).split("\n")
+    if len(lines) > 1:
+        lines = [lines[0].rstrip()] + [line.strip() for line in lines[1:-1]] + [lines[-1].lstrip()]
+    value = _fold_lines(lines) if len(lines) > 1 else lines[0]
+    return (_unescape(value) if quote == '"' else value), index + 1
+
+
+class _FlowParser:
+    """Recursive-descent parser for `{...}` / `[...]` collections, across lines."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+
+    def _skip(self) -> None:
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char in " \t\n":
+                self.pos += 1
+            elif char == "#" and (self.pos == 0 or text[self.pos - 1] in " \t\n"):
+                end = text.find("\n", self.pos)
+                self.pos = len(text) if end < 0 else end
+            else:
+                return
+
+    def _peek(self) -> str:
+        self._skip()
+        return self.text[self.pos : self.pos + 1]
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            found = self.text[self.pos : self.pos + 1] or "end of frontmatter"
+            raise SubsetError(f"expected {char!r} in flow collection, found {found!r}")
+        self.pos += 1
+
+    def parse_line_value(self) -> Tuple[Any, int]:
+        """Parse one collection and the rest of its closing line; returns the value
+        and the number of newlines consumed."""
+        value = self.node()
+        end = self.text.find("\n", self.pos)
+        end = len(self.text) if end < 0 else end
+        trailing = self.text[self.pos : end]
+        if not _is_blank(trailing) or trailing[:1] not in _SPACES:
+            raise SubsetError(f"unexpected text after flow collection: {trailing.strip()!r}")
+        return value, self.text.count("\n", 0, end)
+
+    def node(self) -> Any:
+        char = self._peek()
+        if char == "{":
+            return self._mapping()
+        if char == "[":
+            return self._sequence()
+        if char in ("'", '"'):
+            value, self.pos = scan_quoted(self.text, self.pos)
+            return value
+        if not char or char in ",]}":
+            return None
+        _check_plain_start(self.text[self.pos :], flow=True)
+        return resolve_plain(self._plain())
+
+    def _plain(self) -> str:
+        text = self.text
+        start = self.pos
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char in ",?[]{}":
+                break
+            if char == ":" and text[self.pos + 1 : self.pos + 2] in (
+                "",
+                " ",
+                "\t",
+                "\n",
+                ",",
+                "]",
+                "}",
+            ):
+                break
+            if char == "#" and text[self.pos - 1] in " \t\n":
+                break
+            self.pos += 1
+        return _fold_lines([line.strip() for line in text[start : self.pos].split("\n")])
+
+    def _key(self) -> Any:
+        char = self._peek()
+        if char in ("'", '"'):
+            key, self.pos = scan_quoted(self.text, self.pos)
+            return key
+        if char in "{[":
+            raise SubsetError("complex mapping keys are not supported")
+        _check_plain_start(self.text[self.pos :], flow=True)
+        return resolve_plain(self._plain())
+
+    def _mapping(self) -> dict:
+        self._expect("{")
+        result = {}
+        while self._peek() != "}":
+            key = self._key()
+            if self._peek() == ":":
+                self.pos += 1
+                result[key] = self.node()
+            else:
+                result[key] = None
+            if self._peek() != ",":
+                break
+            self.pos += 1
+        self._expect("}")
+        return result
+
+    def _sequence(self) -> list:
+        self._expect("[")
+        items = []
+        while self._peek() != "]":
+            if self._peek() == ",":
+                raise SubsetError("unexpected ',' in flow sequence")
+            items.append(self.node())
+            if self._peek() != ",":
+                break
+            self.pos += 1
+        self._expect("]")
+        return items
+
+
+def _indent_of(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def _is_blank(line: str) -> bool:
+    stripped = line.strip()
+    return not stripped or stripped.startswith("#")
+
+
+def _is_item(content: str) -> bool:
+    return content == "-" or content.startswith("- ")
+
+
+def _split_key(content: str) -> Tuple[Any, str]:
+    """Split `key: rest` into the resolved key and the text after the colon."""
+    if content[:1] in ("'", '"'):
+        key, end = scan_quoted(content, 0)
+        rest = content[end:].lstrip(" \t")
+        if not rest.startswith(":"):
+            raise SubsetError(f"expected ':' after key {key!r}")
+        return key, rest[1:]
+    if content[:1] in "{[":
+        raise SubsetError(f"unsupported mapping key: {content!r}")
+    _check_plain_start(content)
+    match = re.search(r":(?:[ \t]|$)", content)
+    if not match:
+        raise SubsetError(f"expected 'key: value', found {content!r}")
+    return resolve_plain(content[: match.start()].rstrip()), content[match.end() :]
+
+
+def _looks_like_mapping(content: str) -> bool:
+    if content[:1] in ("'", '"', "[", "{", "|", ">", "#") or _is_item(content):
+        return False
+    return re.search(r":(?:[ \t]|$)", _strip_comment(content)) is not None
+
+
+class _BlockParser:
+    def __init__(self, text: str) -> None:
+        # A final line break ends the last line rather than starting an empty one.
+        self.final_newline = text.endswith("\n")
+        self.lines = text.split("\n")
+        if self.final_newline:
+            self.lines.pop()
+        for number, line in enumerate(self.lines, 1):
+            if line.lstrip(" ").startswith("\t") and line.strip():
+                raise SubsetError(f"line {number}: tabs cannot be used for indentation")
+            if _DOCUMENT_MARKER.match(line):
+                raise SubsetError(f"line {number}: document markers are not supported")
+
+    def _skip_blank(self, pos: int) -> int:
+        while pos < len(self.lines) and _is_blank(self.lines[pos]):
+            pos += 1
+        return pos
+
+    def _children_end(self, pos: int, indent: int) -> int:
+        """Index of the first line from `pos` that is not blank or indented past `indent`."""
+        while pos < len(self.lines):
+            line = self.lines[pos]
+            if line.strip() and _indent_of(line) <= indent:
+                break
+            pos += 1
+        return pos
+
+    def parse(self) -> Any:
+        pos = self._skip_blank(0)
+        if pos == len(self.lines):
+            return None
+        value, pos = self._block(pos, _indent_of(self.lines[pos]), -1)
+        pos = self._skip_blank(pos)
+        if pos < len(self.lines):
+            raise SubsetError(f"line {pos + 1}: unexpected indentation")
+        return value
+
+    def _block(self, pos: int, indent: int, parent: int) -> Tuple[Any, int]:
+        """Parse the node starting at column `indent` of line `pos`, nested in a
+        collection at column `parent` (-1 at the top level)."""
+        content = self.lines[pos][indent:]
+        if _is_item(content):
+            return self._sequence(pos, indent)
+        if not _looks_like_mapping(content):
+            return self._value(content, pos, parent)
+        return self._mapping(pos, indent)
+
+    def _mapping(self, pos: int, indent: int) -> Tuple[dict, int]:
+        result = {}
+        while True:
+            pos = self._skip_blank(pos)
+            if pos == len(self.lines) or _indent_of(self.lines[pos]) < indent:
+                return result, pos
+            if _indent_of(self.lines[pos]) > indent:
+                raise SubsetError(f"line {pos + 1}: unexpected indentation")
+            content = self.lines[pos][indent:]
+            if _is_item(content):
+                raise SubsetError(f"line {pos + 1}: sequence item inside a mapping")
+            key, rest = _split_key(content)
+            result[key], pos = self._value(rest, pos, indent, compact_sequence=True)
+
+    def _sequence(self, pos: int, indent: int) -> Tuple[list, int]:
+        items = []
+        while True:
+            pos = self._skip_blank(pos)
+            if pos == len(self.lines) or _indent_of(self.lines[pos]) < indent:
+                return items, pos
+            line = self.lines[pos]
+            if _indent_of(line) > indent or not _is_item(line[indent:]):
+                raise SubsetError(f"line {pos + 1}: expected a sequence item")
+            after_dash = line[indent + 1 :]
+            content = after_dash.lstrip(" ")
+            if content and _looks_like_mapping(content):
+                # `- key: value` opens a mapping whose first key sits on the dash line.
+                item_indent = indent + 1 + len(after_dash) - len(content)
+                self.lines[pos] = " " * item_indent + content
+                value, pos = self._mapping(pos, item_indent)
+            elif _is_item(content):
+                raise SubsetError(f"line {pos + 1}: nested inline sequences are not supported")
+            else:
+                value, pos = self._value(content, pos, indent)
+            items.append(value)
+
+    def _value(
+        self, rest: str, pos: int, indent: int, compact_sequence: bool = False
+    ) -> Tuple[Any, int]:
+        """Parse the value starting with `rest` on line `pos`; continuation lines are
+        those indented past `indent`. Returns (value, index of the next line)."""
+        rest = rest.strip(" \t")
+        end = self._children_end(pos + 1, indent)
+        if not rest or rest.startswith("#"):
+            child = self._skip_blank(pos + 1)
+            if child < end:
+                value, child_end = self._block(child, _indent_of(self.lines[child]), indent)
+                if self._skip_blank(child_end) < end:
+                    raise SubsetError(f"line {child_end + 1}: unexpected indentation")
+                return value, end
+            if (
+                compact_sequence
+                and child < len(self.lines)
+                and _indent_of(self.lines[child]) == indent
+                and _is_item(self.lines[child][indent:])
+            ):
+                return self._sequence(child, indent)
+            return None, end
+        if rest[0] in "|>":
+            return self._block_scalar(rest, pos, end, indent), end
+        _check_plain_start(rest, where=f"line {pos + 1}: ")
+        if rest[0] in "[{":
+            # Like PyYAML, flow collections may dedent their continuation lines.
+            text = "\n".join([rest] + self.lines[pos + 1 :])
+            value, consumed = _FlowParser(text).parse_line_value()
+            after = pos + 1 + consumed
+            if self._skip_blank(after) < end:
+                raise SubsetError(f"line {after + 1}: unexpected indentation")
+            return value, max(after, end)
+        continuation = self.lines[pos + 1 : end]
+        if rest[0] in ("'", '"'):
+            text = "\n".join([rest] + continuation)
+            value, after = scan_quoted(text, 0)
+            trailing = text[after:]
+            if trailing[:1] not in _SPACES or not all(map(_is_blank, trailing.split("\n"))):
+                raise SubsetError(f"line {pos + 1}: unexpected text after quoted scalar")
+            return value, end
+        lines = [_strip_comment(rest).rstrip()]
+        ended = lines[0] != rest  # a comment ends the scalar
+        for offset, line in enumerate(continuation, pos + 2):
+            if _is_blank(line):
+                ended = ended or bool(line.strip())
+                lines.append("")
+                continue
+            if ended:
+                raise SubsetError(f"line {offset}: unexpected text after a comment")
+            text = _strip_comment(line).strip()
+            ended = text != line.strip()
+            lines.append(text)
+        if any(re.search(r":(?:[ \t]|$)", line) for line in lines):
+            raise SubsetError(f"line {pos + 1}: mapping values are not allowed in a plain scalar")
+        return resolve_plain(_fold_lines(lines).strip()), end
+
+    def _block_scalar(self, header: str, pos: int, end: int, indent: int) -> str:
+        match = _BLOCK_HEADER.match(header)
+        if not match or (match.group(2) and match.group(4)):
+            raise SubsetError(f"line {pos + 1}: invalid block scalar header {header!r}")
+        style, chomp = match.group(1), match.group(2) or match.group(4)
+        body = self.lines[pos + 1 : end]
+        # As in PyYAML: content sits past the parent's indentation (at least one
+        # column), and without an indicator as deep as the first content line or
+        # any all-space line before it.
+        content_indent = max(indent + 1, 1)
+        if match.group(3):
+            content_indent = max(indent, 0) + int(match.group(3))
+        else:
+            for line in body:
+                content_indent = max(content_indent, _indent_of(line))
+                if line.strip():
+                    break
+        # A less indented line ends the scalar; only comments may follow it.
+        stop = next(
+            (
+                i
+                for i, line in enumerate(body)
+                if line.strip() and _indent_of(line) < content_indent
+            ),
+            len(body),
+        )
+        for offset, line in enumerate(body[stop:], pos + 2 + stop):
+            if not _is_blank(line):
+                raise SubsetError(f"line {offset}: block scalar is not indented enough")
+        # Spaces past the content indentation are content, even on an otherwise blank line.
+        lines = [line[content_indent:] for line in body[:stop]]
+        content_end = len(lines)
+        while content_end and not lines[content_end - 1]:
+            content_end -= 1
+        # Line breaks after the last content line: its own, plus one per trailing
+        # blank line, less the missing one when the document ends without a break.
+        breaks = len(lines) - content_end + (1 if content_end else 0)
+        if stop == len(body) and end == len(self.lines) and not self.final_newline:
+            breaks = max(breaks - 1, 0)
+        lines = lines[:content_end]
+        text = "\n".join(lines) if style == "|" else _fold_block(lines)
+        if chomp == "-":
+            return text
+        if chomp == "+":
+            return text + "\n" * breaks
+        return text + "\n" if text and breaks else text
+
+
+def _fold_block(lines: List[str]) -> str:
+    """Folded (`>`) scalar: join plain lines with spaces; keep breaks around indented lines."""
+    parts: List[str] = []
+    blank = 0
+    previous_indented = False
+    for line in lines:
+        if not line:
+            blank += 1
+            continue
+        indented = line[:1] in (" ", "\t")
+        if parts:
+            if indented or previous_indented:
+                parts.append("\n" * (blank + 1))
+            else:
+                parts.append("\n" * blank if blank else " ")
+        elif blank:
+            parts.append("\n" * blank)
+        parts.append(line)
+        blank = 0
+        previous_indented = indented
+    return "".join(parts)
+
+
+def load(text: str) -> Optional[Any]:
+    """
+    Parse one YAML document written in the supported subset.
+
+    Raises:
+        SubsetError: if the text is malformed or uses unsupported YAML features
+    """
+    return _BlockParser(text.replace("\r\n", "\n").replace("\r", "\n")).parse()